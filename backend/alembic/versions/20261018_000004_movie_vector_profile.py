@@ -0,0 +1,26 @@
+"""Store the full A-2 movie profile in movie_vectors."""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "20261018_000004"
+down_revision = "20260210_000003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "movie_vectors",
+        sa.Column("direction_mood", postgresql.JSONB(astext_type=sa.Text()), nullable=False, server_default=sa.text("'{}'::jsonb")),
+    )
+    op.add_column(
+        "movie_vectors",
+        sa.Column("character_relationship", postgresql.JSONB(astext_type=sa.Text()), nullable=False, server_default=sa.text("'{}'::jsonb")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("movie_vectors", "character_relationship")
+    op.drop_column("movie_vectors", "direction_mood")
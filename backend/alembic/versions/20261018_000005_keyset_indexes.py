@@ -0,0 +1,22 @@
+"""Composite indexes backing keyset (cursor) pagination."""
+from alembic import op
+
+
+revision = "20261018_000005"
+down_revision = "20261018_000004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_movies_release_id", "movies", ["release", "id"])
+    op.create_index("ix_reviews_movie_created_id", "reviews", ["movie_id", "created_at", "id"])
+    op.create_index("ix_reviews_user_created_id", "reviews", ["user_id", "created_at", "id"])
+    op.create_index("ix_comments_review_created_id", "comments", ["review_id", "created_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_comments_review_created_id", table_name="comments")
+    op.drop_index("ix_reviews_user_created_id", table_name="reviews")
+    op.drop_index("ix_reviews_movie_created_id", table_name="reviews")
+    op.drop_index("ix_movies_release_id", table_name="movies")
@@ -0,0 +1,31 @@
+"""pg_trgm GIN indexes for movie title/synopsis search."""
+from alembic import op
+
+
+revision = "20261018_000006"
+down_revision = "20261018_000005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_movies_title_trgm",
+        "movies",
+        ["title"],
+        postgresql_using="gin",
+        postgresql_ops={"title": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_movies_synopsis_trgm",
+        "movies",
+        ["synopsis"],
+        postgresql_using="gin",
+        postgresql_ops={"synopsis": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_movies_synopsis_trgm", table_name="movies")
+    op.drop_index("ix_movies_title_trgm", table_name="movies")
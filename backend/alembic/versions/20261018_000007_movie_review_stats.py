@@ -0,0 +1,45 @@
+"""Per-movie review aggregates for the popular / rating sorts."""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261018_000007"
+down_revision = "20261018_000006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("movies", sa.Column("review_count", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("movies", sa.Column("rating_sum", sa.Numeric(10, 1), nullable=False, server_default="0"))
+    op.add_column(
+        "movies",
+        sa.Column("rating_avg", sa.Float(), nullable=False, server_default="0", comment="리뷰 없으면 0"),
+    )
+    op.execute(
+        """
+        UPDATE movies AS m
+        SET review_count = s.review_count,
+            rating_sum = s.rating_sum,
+            rating_avg = s.rating_avg
+        FROM (
+            SELECT movie_id,
+                   COUNT(*) AS review_count,
+                   SUM(rating) AS rating_sum,
+                   AVG(rating) AS rating_avg
+            FROM reviews
+            GROUP BY movie_id
+        ) AS s
+        WHERE m.id = s.movie_id
+        """
+    )
+    op.create_index("ix_movies_review_count_id", "movies", ["review_count", "id"])
+    op.create_index("ix_movies_rating_avg_id", "movies", ["rating_avg", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_movies_rating_avg_id", table_name="movies")
+    op.drop_index("ix_movies_review_count_id", table_name="movies")
+    op.drop_column("movies", "rating_avg")
+    op.drop_column("movies", "rating_sum")
+    op.drop_column("movies", "review_count")
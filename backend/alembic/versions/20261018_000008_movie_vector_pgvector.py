@@ -0,0 +1,88 @@
+"""pgvector columns + HNSW indexes for movie vector search."""
+import sqlalchemy as sa
+from alembic import op
+from pgvector.sqlalchemy import Vector
+
+
+revision = "20261018_000008"
+down_revision = "20261018_000007"
+branch_labels = None
+depends_on = None
+
+EMOTION_DIM = 20
+PROFILE_DIM = 43
+BATCH_SIZE = 1000
+
+
+def _backfill() -> None:
+    """Encode existing JSONB profiles with the current taxonomy order."""
+    from services.vector_store import encode_profile
+
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.text(
+            "SELECT movie_id, emotion_scores, narrative_traits, ending_preference FROM movie_vectors"
+        )
+    ).mappings().all()
+    update = sa.text(
+        "UPDATE movie_vectors "
+        "SET emotion_vector = CAST(:emotion_vector AS vector), "
+        "profile_vector = CAST(:profile_vector AS vector) "
+        "WHERE movie_id = :movie_id"
+    )
+
+    def literal(values):
+        return None if values is None else "[" + ",".join(repr(float(v)) for v in values) + "]"
+
+    params = []
+    for row in rows:
+        encoded = encode_profile(dict(row))
+        params.append({
+            "movie_id": row["movie_id"],
+            "emotion_vector": literal(encoded["emotion_vector"]),
+            "profile_vector": literal(encoded["profile_vector"]),
+        })
+    for start in range(0, len(params), BATCH_SIZE):
+        bind.execute(update, params[start:start + BATCH_SIZE])
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+    op.add_column(
+        "movie_vectors",
+        sa.Column("emotion_vector", Vector(EMOTION_DIM), nullable=True, comment="감정 점수 (taxonomy 순서, A-5 kNN)"),
+    )
+    op.add_column(
+        "movie_vectors",
+        sa.Column(
+            "profile_vector",
+            Vector(PROFILE_DIM),
+            nullable=True,
+            comment="블록 정규화 emotion‖narrative‖ending (추천 내적 검색)",
+        ),
+    )
+    # Build the HNSW indexes after the backfill (faster than per-row inserts)
+    _backfill()
+    op.create_index(
+        "ix_movie_vectors_emotion_hnsw",
+        "movie_vectors",
+        ["emotion_vector"],
+        postgresql_using="hnsw",
+        postgresql_with={"m": 16, "ef_construction": 64},
+        postgresql_ops={"emotion_vector": "vector_cosine_ops"},
+    )
+    op.create_index(
+        "ix_movie_vectors_profile_hnsw",
+        "movie_vectors",
+        ["profile_vector"],
+        postgresql_using="hnsw",
+        postgresql_with={"m": 16, "ef_construction": 64},
+        postgresql_ops={"profile_vector": "vector_ip_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_movie_vectors_profile_hnsw", table_name="movie_vectors")
+    op.drop_index("ix_movie_vectors_emotion_hnsw", table_name="movie_vectors")
+    op.drop_column("movie_vectors", "profile_vector")
+    op.drop_column("movie_vectors", "emotion_vector")
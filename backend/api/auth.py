@@ -1,30 +1,59 @@
 """
 Authentication API endpoints (Kakao OAuth)
 """
+import asyncio
 import os
-import requests
 from typing import Optional
+import httpx
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import RedirectResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from db import get_db
+from db import get_async_db
 from schemas import UserResponse, MessageResponse
-from repositories.user import UserRepository
+from repositories.user import AsyncUserRepository
 from models import User
+from services.http_client import http_client
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 
 # Kakao OAuth settings
 KAKAO_CLIENT_ID = os.getenv("KAKAO_CLIENT_ID", "")
 KAKAO_REDIRECT_URI = os.getenv("KAKAO_REDIRECT_URI", "http://localhost:5174/auth/kakao/callback")
-KAKAO_AUTH_URL = "https://kauth.kakao.com/oauth/authorize"
-KAKAO_TOKEN_URL = "https://kauth.kakao.com/oauth/token"
-KAKAO_USER_INFO_URL = "https://kapi.kakao.com/v2/user/me"
+# Base URLs are overridable so the callback can run against a local stub
+KAKAO_AUTH_BASE_URL = os.getenv("KAKAO_AUTH_BASE_URL", "https://kauth.kakao.com").rstrip("/")
+KAKAO_API_BASE_URL = os.getenv("KAKAO_API_BASE_URL", "https://kapi.kakao.com").rstrip("/")
+KAKAO_AUTH_URL = f"{KAKAO_AUTH_BASE_URL}/oauth/authorize"
+KAKAO_TOKEN_URL = f"{KAKAO_AUTH_BASE_URL}/oauth/token"
+KAKAO_USER_INFO_URL = f"{KAKAO_API_BASE_URL}/v2/user/me"
+
+# Per-stage budgets (seconds): connect / per-read timeout, plus a hard total per stage
+KAKAO_CONNECT_TIMEOUT = float(os.getenv("KAKAO_CONNECT_TIMEOUT", "1.0"))
+KAKAO_TOKEN_TIMEOUT = float(os.getenv("KAKAO_TOKEN_TIMEOUT", "3.0"))
+KAKAO_USER_INFO_TIMEOUT = float(os.getenv("KAKAO_USER_INFO_TIMEOUT", "2.0"))
+
+
+async def _call_kakao(stage: str, method: str, url: str, budget: float, **kwargs) -> httpx.Response:
+    """
+    Call Kakao on the shared pooled client within the stage's time budget
+    
+    Timeouts map to 504 and transport errors to 502, so a slow Kakao fails
+    fast instead of holding the request open.
+    """
+    timeout = httpx.Timeout(budget, connect=min(KAKAO_CONNECT_TIMEOUT, budget))
+    try:
+        return await asyncio.wait_for(
+            http_client.client.request(method, url, timeout=timeout, **kwargs),
+            timeout=budget
+        )
+    except (asyncio.TimeoutError, httpx.TimeoutException):
+        raise HTTPException(status_code=504, detail=f"Kakao {stage} timed out")
+    except httpx.HTTPError:
+        raise HTTPException(status_code=502, detail=f"Kakao {stage} failed")
 
 
 @router.get("/kakao/login")
-def kakao_login():
+async def kakao_login():
     """Redirect to Kakao OAuth login page"""
     if not KAKAO_CLIENT_ID:
         raise HTTPException(status_code=500, detail="KAKAO_CLIENT_ID is not configured")
@@ -38,23 +67,25 @@ def kakao_login():
 
 
 @router.get("/kakao/callback")
-def kakao_callback(
+async def kakao_callback(
     code: str = Query(..., description="Authorization code from Kakao"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Handle Kakao OAuth callback"""
     
     # Exchange code for access token
-    token_response = requests.post(
+    token_response = await _call_kakao(
+        "token exchange",
+        "POST",
         KAKAO_TOKEN_URL,
+        KAKAO_TOKEN_TIMEOUT,
         data={
             "grant_type": "authorization_code",
             "client_id": KAKAO_CLIENT_ID,
             "redirect_uri": KAKAO_REDIRECT_URI,
             "code": code
         },
-        headers={"Content-Type": "application/x-www-form-urlencoded"},
-        timeout=10
+        headers={"Content-Type": "application/x-www-form-urlencoded"}
     )
     
     if token_response.status_code != 200:
@@ -66,10 +97,12 @@ def kakao_callback(
         raise HTTPException(status_code=400, detail="Failed to get access token from Kakao")
     
     # Get user info from Kakao
-    user_response = requests.get(
+    user_response = await _call_kakao(
+        "user info",
+        "GET",
         KAKAO_USER_INFO_URL,
-        headers={"Authorization": f"Bearer {access_token}"},
-        timeout=10
+        KAKAO_USER_INFO_TIMEOUT,
+        headers={"Authorization": f"Bearer {access_token}"}
     )
     
     if user_response.status_code != 200:
@@ -85,11 +118,11 @@ def kakao_callback(
     nickname = profile.get("nickname", f"User{kakao_id[:6]}")
     
     # Check if user exists, create if not
-    user_repo = UserRepository(db)
-    user = user_repo.get(user_id)
+    user_repo = AsyncUserRepository(db)
+    user = await user_repo.get(user_id)
     
     if not user:
-        user = user_repo.create({
+        user = await user_repo.create({
             "id": user_id,
             "name": nickname,
             "avatar_text": "카카오 로그인 사용자"
@@ -105,6 +138,6 @@ def kakao_callback(
 
 
 @router.post("/logout")
-def logout():
+async def logout():
     """Logout user"""
     return MessageResponse(message="Logged out successfully")
@@ -3,28 +3,39 @@ Movie API endpoints
 """
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from db import get_db
+from db import get_async_db
 from schemas import (
     MovieResponse, MovieListResponse, MovieCreate, MovieUpdate, MessageResponse,
     ReviewResponse, ReviewListResponse, ReviewCreate
 )
-from repositories.movie import MovieRepository
-from repositories.review import ReviewRepository
+from repositories.movie import AsyncMovieRepository
+from repositories.movie_vector import MovieVectorRepository
+from repositories.review import AsyncReviewRepository
+from services.cache import ainvalidate_review_lists, movie_cache, review_list_cache, review_list_key
+from services.movie_index import movie_index
+from services.profile_store import profile_store
+from services.vector_store import index_profile, remove_movie
+from utils.cursor import decode_cursor, encode_cursor
+from utils.errors import ValidationError
 
 router = APIRouter(prefix="/api/movies", tags=["movies"])
 
 
 @router.get("", response_model=MovieListResponse)
-def get_movies(
+async def get_movies(
     query: Optional[str] = Query(None, description="Search query"),
     genres: Optional[str] = Query(None, description="Filter by genres (comma-separated)"),
     category: Optional[str] = Query(None, description="Category filter"),
-    sort: Optional[str] = Query("latest", description="Sort by: latest, popular, rating"),
+    sort: Optional[str] = Query("latest", description="Sort by: latest, popular, rating, relevance"),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (not for sort=relevance)"),
+    include_total: bool = Query(True, description="Run the total count query"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get movies with optional search and filters
@@ -32,25 +43,57 @@ def get_movies(
     - **query**: Search in title and synopsis
     - **genres**: Filter by genres (comma-separated, e.g., "액션,드라마")
     - **category**: Category filter (optional)
-    - **sort**: Sort order (latest, popular, rating)
-    - **page**: Page number (starts from 1)
+    - **sort**: Sort order (latest, popular, rating, relevance)
+      - relevance: rank by title/synopsis similarity to the query (pg_trgm on PostgreSQL)
+    - **page**: Page number (starts from 1, ignored when cursor is given)
     - **page_size**: Number of items per page
+    - **cursor**: Keyset cursor for constant-cost deep scrolling (latest, popular, rating)
+    - **include_total**: Set to false to skip the total count
     """
-    repo = MovieRepository(db)
+    repo = AsyncMovieRepository(db)
     skip = (page - 1) * page_size
     
+    try:
+        after = decode_cursor(cursor, 2)
+    except ValidationError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if after is not None:
+        if sort == "relevance":
+            raise HTTPException(status_code=400, detail="cursor is not supported for sort=relevance")
+        skip = 0
+    
     # Parse genres from comma-separated string
     genre_list = [g.strip() for g in genres.split(",")] if genres else None
     
-    movies = repo.search(
-        query=query,
-        genres=genre_list,
-        category=category,
-        sort=sort,
-        skip=skip,
-        limit=page_size
-    )
-    total = repo.count_search(query=query, genres=genre_list, category=category)
+    total = None
+    if include_total and after is None:
+        # Page rows and the total in one round trip (COUNT(*) OVER ())
+        movies, total = await repo.search_with_total(
+            query=query,
+            genres=genre_list,
+            category=category,
+            sort=sort,
+            skip=skip,
+            limit=page_size + 1
+        )
+    else:
+        movies = await repo.search(
+            query=query,
+            genres=genre_list,
+            category=category,
+            sort=sort,
+            skip=skip,
+            limit=page_size + 1,
+            after=tuple(after) if after is not None else None
+        )
+        if include_total:
+            # The window total would only count rows past the cursor
+            total = await repo.count_search(query=query, genres=genre_list, category=category)
+    has_more = len(movies) > page_size
+    movies = movies[:page_size]
+    next_cursor = None
+    if has_more and sort != "relevance":
+        next_cursor = encode_cursor(repo.cursor_values(movies[-1], sort))
     
     # Convert to response format
     movie_responses = []
@@ -72,87 +115,118 @@ def get_movies(
         movies=movie_responses,
         total=total,
         page=page,
-        page_size=page_size
+        page_size=page_size,
+        next_cursor=next_cursor
     )
 
 
 @router.get("/{movie_id}", response_model=MovieResponse)
-def get_movie(movie_id: int, db: Session = Depends(get_db)):
-    """Get movie by ID with genres and tags"""
-    repo = MovieRepository(db)
-    movie = repo.get_with_details(movie_id)
+async def get_movie(movie_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Get movie by ID with genres and tags (cached, see services.cache)"""
+    repo = AsyncMovieRepository(db)
     
-    if not movie:
+    async def load():
+        movie = await repo.get_with_details(movie_id)
+        if not movie:
+            return None
+        return jsonable_encoder(
+            MovieResponse(
+                id=movie.id,
+                title=movie.title,
+                release=movie.release,
+                runtime=movie.runtime,
+                synopsis=movie.synopsis,
+                poster_url=movie.poster_url,
+                created_at=movie.created_at,
+                genres=[g.genre for g in movie.genres],
+                tags=[t.tag for t in movie.tags]
+            )
+        )
+    
+    movie = await movie_cache.aget_or_set(str(movie_id), load)
+    if movie is None:
         raise HTTPException(status_code=404, detail="Movie not found")
     
-    return MovieResponse(
-        id=movie.id,
-        title=movie.title,
-        release=movie.release,
-        runtime=movie.runtime,
-        synopsis=movie.synopsis,
-        poster_url=movie.poster_url,
-        created_at=movie.created_at,
-        genres=[g.genre for g in movie.genres],
-        tags=[t.tag for t in movie.tags]
-    )
+    return movie
 
 
 @router.get("/{movie_id}/reviews", response_model=ReviewListResponse)
-def get_movie_reviews(
+async def get_movie_reviews(
     movie_id: int,
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    include_total: bool = Query(True, description="Run the total count query"),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get reviews for a specific movie"""
-    # Check if movie exists
-    movie_repo = MovieRepository(db)
-    if not movie_repo.get(movie_id):
-        raise HTTPException(status_code=404, detail="Movie not found")
-    
-    review_repo = ReviewRepository(db)
+    """Get reviews for a specific movie (newest first, cached per page)"""
     skip = (page - 1) * page_size
     
-    reviews = review_repo.get_by_movie(movie_id, skip=skip, limit=page_size)
-    total = review_repo.count(filters={"movie_id": movie_id})
+    try:
+        after = decode_cursor(cursor, 2)
+    except ValidationError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if after is not None:
+        skip = 0
     
-    review_responses = []
-    for review in reviews:
-        result = review_repo.get_with_counts(review.id)
-        review_responses.append(
-            ReviewResponse(
-                id=review.id,
-                user_id=review.user_id,
-                movie_id=review.movie_id,
-                rating=review.rating,
-                content=review.content,
-                created_at=review.created_at,
-                likes_count=result["likes_count"],
-                comments_count=result["comments_count"]
+    async def load():
+        # Check if movie exists
+        movie_repo = AsyncMovieRepository(db)
+        if not await movie_repo.get(movie_id):
+            raise HTTPException(status_code=404, detail="Movie not found")
+        
+        review_repo = AsyncReviewRepository(db)
+        results = await review_repo.get_by_movie_with_counts(
+            movie_id, skip=skip, limit=page_size + 1, after=tuple(after) if after is not None else None
+        )
+        next_cursor = None
+        if len(results) > page_size:
+            results = results[:page_size]
+            last = results[-1]["review"]
+            next_cursor = encode_cursor([last.created_at, last.id])
+        total = await review_repo.count(filters={"movie_id": movie_id}) if include_total else None
+        
+        review_responses = []
+        for result in results:
+            review = result["review"]
+            review_responses.append(
+                ReviewResponse(
+                    id=review.id,
+                    user_id=review.user_id,
+                    movie_id=review.movie_id,
+                    rating=review.rating,
+                    content=review.content,
+                    created_at=review.created_at,
+                    likes_count=result["likes_count"],
+                    comments_count=result["comments_count"]
+                )
             )
+        
+        return jsonable_encoder(
+            ReviewListResponse(reviews=review_responses, total=total, next_cursor=next_cursor)
         )
     
-    return ReviewListResponse(reviews=review_responses, total=total)
+    key = await review_list_key(f"movie:{movie_id}", page, page_size, cursor or "", int(include_total))
+    return await review_list_cache.aget_or_set(key, load)
 
 
 @router.post("/{movie_id}/reviews", response_model=ReviewResponse, status_code=201)
-def create_movie_review(
+async def create_movie_review(
     movie_id: int,
     review: ReviewCreate,
     user_id: str = Query(..., description="User ID"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a review for a specific movie"""
     # Check if movie exists
-    movie_repo = MovieRepository(db)
-    if not movie_repo.get(movie_id):
+    movie_repo = AsyncMovieRepository(db)
+    if not await movie_repo.get(movie_id):
         raise HTTPException(status_code=404, detail="Movie not found")
     
-    review_repo = ReviewRepository(db)
+    review_repo = AsyncReviewRepository(db)
     
     # Check if user already reviewed this movie
-    existing = review_repo.get_user_review_for_movie(user_id, movie_id)
+    existing = await review_repo.get_user_review_for_movie(user_id, movie_id)
     if existing:
         raise HTTPException(
             status_code=400,
@@ -163,7 +237,8 @@ def create_movie_review(
     review_data["user_id"] = user_id
     review_data["movie_id"] = movie_id
     
-    db_review = review_repo.create(review_data)
+    db_review = await review_repo.create(review_data)
+    await ainvalidate_review_lists(movie_id=movie_id, user_id=user_id)
     
     return ReviewResponse(
         id=db_review.id,
@@ -178,12 +253,13 @@ def create_movie_review(
 
 
 @router.post("", response_model=MovieResponse, status_code=201)
-def create_movie(movie: MovieCreate, db: Session = Depends(get_db)):
+async def create_movie(movie: MovieCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new movie"""
-    repo = MovieRepository(db)
+    repo = AsyncMovieRepository(db)
     
     movie_data = movie.model_dump()
-    db_movie = repo.create(movie_data)
+    db_movie = await repo.create(movie_data)
+    movie_cache.delete(str(db_movie.id))
     
     return MovieResponse(
         id=db_movie.id,
@@ -198,17 +274,31 @@ def create_movie(movie: MovieCreate, db: Session = Depends(get_db)):
     )
 
 
+def _rebuild_profile(db: Session, movie_id: int) -> None:
+    """Drop the stored A-2 profile and derive it again from the updated movie"""
+    MovieVectorRepository(db).delete_by_movie_id(movie_id)
+    profile = profile_store.get(db, movie_id)
+    if profile is not None:
+        movie_index.upsert(profile)
+        index_profile(profile)
+
+
 @router.put("/{movie_id}", response_model=MovieResponse)
-def update_movie(movie_id: int, movie: MovieUpdate, db: Session = Depends(get_db)):
+async def update_movie(movie_id: int, movie: MovieUpdate, db: AsyncSession = Depends(get_async_db)):
     """Update a movie"""
-    repo = MovieRepository(db)
+    repo = AsyncMovieRepository(db)
     
     movie_data = movie.model_dump(exclude_unset=True)
-    db_movie = repo.update(movie_id, movie_data)
-    
-    if not db_movie:
+    if not await repo.update(movie_id, movie_data):
         raise HTTPException(status_code=404, detail="Movie not found")
     
+    movie_cache.delete(str(movie_id))
+    # 프로필은 제목/시놉시스에서 파생되므로 바뀌면 다시 계산한다
+    profile_store.invalidate(movie_id)
+    if "title" in movie_data or "synopsis" in movie_data:
+        await db.run_sync(_rebuild_profile, movie_id)
+    
+    db_movie = await repo.get_with_details(movie_id)
     return MovieResponse(
         id=db_movie.id,
         title=db_movie.title,
@@ -223,25 +313,30 @@ def update_movie(movie_id: int, movie: MovieUpdate, db: Session = Depends(get_db
 
 
 @router.delete("/{movie_id}", response_model=MessageResponse)
-def delete_movie(movie_id: int, db: Session = Depends(get_db)):
+async def delete_movie(movie_id: int, db: AsyncSession = Depends(get_async_db)):
     """Delete a movie"""
-    repo = MovieRepository(db)
+    repo = AsyncMovieRepository(db)
     
-    if not repo.delete(movie_id):
+    if not await repo.delete(movie_id):
         raise HTTPException(status_code=404, detail="Movie not found")
     
+    movie_cache.delete(str(movie_id))
+    await ainvalidate_review_lists(movie_id=movie_id)
+    profile_store.invalidate(movie_id)
+    movie_index.remove(movie_id)
+    remove_movie(movie_id)
     return MessageResponse(message="Movie deleted successfully")
 
 
 @router.get("/genre/{genre}", response_model=List[MovieResponse])
-def get_movies_by_genre(
+async def get_movies_by_genre(
     genre: str,
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get movies by genre"""
-    repo = MovieRepository(db)
-    movies = repo.get_by_genre(genre, limit=limit)
+    repo = AsyncMovieRepository(db)
+    movies = await repo.get_by_genre(genre, limit=limit)
     
     return [
         MovieResponse(
@@ -260,13 +355,13 @@ def get_movies_by_genre(
 
 
 @router.get("/popular/list", response_model=List[MovieResponse])
-def get_popular_movies(
+async def get_popular_movies(
     limit: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get popular movies (by review count)"""
-    repo = MovieRepository(db)
-    movies = repo.get_popular(limit=limit)
+    repo = AsyncMovieRepository(db)
+    movies = await repo.get_popular(limit=limit)
     
     return [
         MovieResponse(
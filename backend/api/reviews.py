@@ -1,25 +1,28 @@
 """
 Review API endpoints
 """
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from db import get_db
+from db import get_async_db
 from schemas import (
     ReviewResponse, ReviewListResponse, ReviewCreate, ReviewUpdate,
     CommentResponse, CommentCreate, MessageResponse
 )
-from repositories.review import ReviewRepository
+from repositories.review import AsyncReviewRepository
+from services.cache import ainvalidate_review_lists
+from utils.cursor import decode_cursor, encode_cursor
+from utils.errors import ValidationError
 
 router = APIRouter(prefix="/api/reviews", tags=["reviews"])
 
 
 @router.get("/{review_id}", response_model=ReviewResponse)
-def get_review(review_id: int, db: Session = Depends(get_db)):
+async def get_review(review_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get review by ID with counts"""
-    repo = ReviewRepository(db)
-    result = repo.get_with_counts(review_id)
+    repo = AsyncReviewRepository(db)
+    result = await repo.get_with_counts(review_id)
     
     if not result:
         raise HTTPException(status_code=404, detail="Review not found")
@@ -38,16 +41,16 @@ def get_review(review_id: int, db: Session = Depends(get_db)):
 
 
 @router.post("", response_model=ReviewResponse, status_code=201)
-def create_review(
+async def create_review(
     review: ReviewCreate,
     user_id: str = Query(..., description="User ID"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new review"""
-    repo = ReviewRepository(db)
+    repo = AsyncReviewRepository(db)
     
     # Check if user already reviewed this movie
-    existing = repo.get_user_review_for_movie(user_id, review.movie_id)
+    existing = await repo.get_user_review_for_movie(user_id, review.movie_id)
     if existing:
         raise HTTPException(
             status_code=400,
@@ -57,7 +60,8 @@ def create_review(
     review_data = review.model_dump()
     review_data["user_id"] = user_id
     
-    db_review = repo.create(review_data)
+    db_review = await repo.create(review_data)
+    await ainvalidate_review_lists(movie_id=db_review.movie_id, user_id=user_id)
     
     return ReviewResponse(
         id=db_review.id,
@@ -72,21 +76,22 @@ def create_review(
 
 
 @router.put("/{review_id}", response_model=ReviewResponse)
-def update_review(
+async def update_review(
     review_id: int,
     review: ReviewUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a review"""
-    repo = ReviewRepository(db)
+    repo = AsyncReviewRepository(db)
     
     review_data = review.model_dump(exclude_unset=True)
-    db_review = repo.update(review_id, review_data)
+    db_review = await repo.update(review_id, review_data)
     
     if not db_review:
         raise HTTPException(status_code=404, detail="Review not found")
     
-    result = repo.get_with_counts(review_id)
+    await ainvalidate_review_lists(movie_id=db_review.movie_id, user_id=db_review.user_id)
+    result = await repo.get_with_counts(review_id)
     
     return ReviewResponse(
         id=db_review.id,
@@ -101,51 +106,73 @@ def update_review(
 
 
 @router.delete("/{review_id}", response_model=MessageResponse)
-def delete_review(review_id: int, db: Session = Depends(get_db)):
+async def delete_review(review_id: int, db: AsyncSession = Depends(get_async_db)):
     """Delete a review"""
-    repo = ReviewRepository(db)
+    repo = AsyncReviewRepository(db)
     
-    if not repo.delete(review_id):
+    db_review = await repo.get(review_id)
+    if not db_review or not await repo.delete(review_id):
         raise HTTPException(status_code=404, detail="Review not found")
     
+    await ainvalidate_review_lists(movie_id=db_review.movie_id, user_id=db_review.user_id)
     return MessageResponse(message="Review deleted successfully")
 
 
 @router.post("/{review_id}/likes", response_model=MessageResponse)
-def toggle_like(
+async def toggle_like(
     review_id: int,
     user_id: str = Query(..., description="User ID"),
     is_like: bool = Query(True, description="True for like, False for dislike"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Toggle like/dislike on a review"""
-    repo = ReviewRepository(db)
+    repo = AsyncReviewRepository(db)
     
     # Check if review exists
-    if not repo.get(review_id):
+    db_review = await repo.get(review_id)
+    if not db_review:
         raise HTTPException(status_code=404, detail="Review not found")
     
-    repo.toggle_like(review_id, user_id, is_like)
+    await repo.toggle_like(review_id, user_id, is_like)
+    await ainvalidate_review_lists(movie_id=db_review.movie_id, user_id=db_review.user_id)
     
     action = "liked" if is_like else "disliked"
     return MessageResponse(message=f"Review {action} successfully")
 
 
 @router.get("/{review_id}/comments", response_model=List[CommentResponse])
-def get_comments(
+async def get_comments(
     review_id: int,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header from the previous page"),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get comments for a review"""
-    repo = ReviewRepository(db)
+    """
+    Get comments for a review (oldest first)
+    
+    When more comments exist, the next page's cursor is returned in the X-Next-Cursor header.
+    """
+    repo = AsyncReviewRepository(db)
     
     # Check if review exists
-    if not repo.get(review_id):
+    if not await repo.get(review_id):
         raise HTTPException(status_code=404, detail="Review not found")
     
-    comments = repo.get_comments(review_id, skip=skip, limit=limit)
+    try:
+        after = decode_cursor(cursor, 2)
+    except ValidationError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if after is not None:
+        skip = 0
+    
+    comments = await repo.get_comments(
+        review_id, skip=skip, limit=limit + 1, after=tuple(after) if after is not None else None
+    )
+    if len(comments) > limit:
+        comments = comments[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor([comments[-1].created_at, comments[-1].id])
     
     return [
         CommentResponse(
@@ -160,20 +187,22 @@ def get_comments(
 
 
 @router.post("/{review_id}/comments", response_model=CommentResponse, status_code=201)
-def create_comment(
+async def create_comment(
     review_id: int,
     comment: CommentCreate,
     user_id: str = Query(..., description="User ID"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Add a comment to a review"""
-    repo = ReviewRepository(db)
+    repo = AsyncReviewRepository(db)
     
     # Check if review exists
-    if not repo.get(review_id):
+    db_review = await repo.get(review_id)
+    if not db_review:
         raise HTTPException(status_code=404, detail="Review not found")
     
-    db_comment = repo.add_comment(review_id, user_id, comment.content)
+    db_comment = await repo.add_comment(review_id, user_id, comment.content)
+    await ainvalidate_review_lists(movie_id=db_review.movie_id, user_id=db_review.user_id)
     
     return CommentResponse(
         id=db_comment.id,
@@ -1,30 +1,34 @@
 """
 User API endpoints
 """
-from typing import List
+from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from db import get_db
+from db import get_async_db
 from schemas import (
     UserResponse, UserCreate, UserUpdate,
     ReviewResponse, ReviewListResponse,
     TasteAnalysisResponse, MessageResponse
 )
-from repositories.user import UserRepository
-from repositories.review import ReviewRepository
+from repositories.user import AsyncUserRepository
+from repositories.review import AsyncReviewRepository
+from services.cache import review_list_cache, review_list_key
+from utils.cursor import decode_cursor, encode_cursor
+from utils.errors import ValidationError
 
 router = APIRouter(prefix="/api/users", tags=["users"])
 
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user(
+async def get_current_user(
     user_id: str = Query(..., description="User ID"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get current user info"""
-    repo = UserRepository(db)
-    user = repo.get(user_id)
+    repo = AsyncUserRepository(db)
+    user = await repo.get(user_id)
     
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -38,17 +42,17 @@ def get_current_user(
 
 
 @router.post("", response_model=UserResponse, status_code=201)
-def create_user(user: UserCreate, db: Session = Depends(get_db)):
+async def create_user(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new user"""
-    repo = UserRepository(db)
+    repo = AsyncUserRepository(db)
     
     # Check if user already exists
-    existing = repo.get(user.id)
+    existing = await repo.get(user.id)
     if existing:
         raise HTTPException(status_code=400, detail="User already exists")
     
     user_data = user.model_dump()
-    db_user = repo.create(user_data)
+    db_user = await repo.create(user_data)
     
     return UserResponse(
         id=db_user.id,
@@ -59,16 +63,16 @@ def create_user(user: UserCreate, db: Session = Depends(get_db)):
 
 
 @router.put("/me", response_model=UserResponse)
-def update_user(
+async def update_user(
     user: UserUpdate,
     user_id: str = Query(..., description="User ID"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update current user"""
-    repo = UserRepository(db)
+    repo = AsyncUserRepository(db)
     
     user_data = user.model_dump(exclude_unset=True)
-    db_user = repo.update(user_id, user_data)
+    db_user = await repo.update(user_id, user_data)
     
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -82,46 +86,68 @@ def update_user(
 
 
 @router.get("/me/reviews", response_model=ReviewListResponse)
-def get_user_reviews(
+async def get_user_reviews(
     user_id: str = Query(..., description="User ID"),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    include_total: bool = Query(True, description="Run the total count query"),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get current user's reviews"""
-    repo = ReviewRepository(db)
+    """Get current user's reviews (newest first, cached per page)"""
+    repo = AsyncReviewRepository(db)
     skip = (page - 1) * page_size
     
-    reviews = repo.get_by_user(user_id, skip=skip, limit=page_size)
-    total = repo.count(filters={"user_id": user_id})
+    try:
+        after = decode_cursor(cursor, 2)
+    except ValidationError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if after is not None:
+        skip = 0
     
-    review_responses = []
-    for review in reviews:
-        result = repo.get_with_counts(review.id)
-        review_responses.append(
-            ReviewResponse(
-                id=review.id,
-                user_id=review.user_id,
-                movie_id=review.movie_id,
-                rating=review.rating,
-                content=review.content,
-                created_at=review.created_at,
-                likes_count=result["likes_count"],
-                comments_count=result["comments_count"]
+    async def load():
+        results = await repo.get_by_user_with_counts(
+            user_id, skip=skip, limit=page_size + 1, after=tuple(after) if after is not None else None
+        )
+        next_cursor = None
+        if len(results) > page_size:
+            results = results[:page_size]
+            last = results[-1]["review"]
+            next_cursor = encode_cursor([last.created_at, last.id])
+        total = await repo.count(filters={"user_id": user_id}) if include_total else None
+        
+        review_responses = []
+        for result in results:
+            review = result["review"]
+            review_responses.append(
+                ReviewResponse(
+                    id=review.id,
+                    user_id=review.user_id,
+                    movie_id=review.movie_id,
+                    rating=review.rating,
+                    content=review.content,
+                    created_at=review.created_at,
+                    likes_count=result["likes_count"],
+                    comments_count=result["comments_count"]
+                )
             )
+        
+        return jsonable_encoder(
+            ReviewListResponse(reviews=review_responses, total=total, next_cursor=next_cursor)
         )
     
-    return ReviewListResponse(reviews=review_responses, total=total)
+    key = await review_list_key(f"user:{user_id}", page, page_size, cursor or "", int(include_total))
+    return await review_list_cache.aget_or_set(key, load)
 
 
 @router.get("/me/taste-analysis", response_model=TasteAnalysisResponse)
-def get_taste_analysis(
+async def get_taste_analysis(
     user_id: str = Query(..., description="User ID"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get user's taste analysis"""
-    repo = UserRepository(db)
-    taste = repo.get_taste_analysis(user_id)
+    repo = AsyncUserRepository(db)
+    taste = await repo.get_taste_analysis(user_id)
     
     if not taste:
         raise HTTPException(
@@ -137,10 +163,10 @@ def get_taste_analysis(
 
 
 @router.get("/{user_id}", response_model=UserResponse)
-def get_user(user_id: str, db: Session = Depends(get_db)):
+async def get_user(user_id: str, db: AsyncSession = Depends(get_async_db)):
     """Get user by ID"""
-    repo = UserRepository(db)
-    user = repo.get(user_id)
+    repo = AsyncUserRepository(db)
+    user = await repo.get(user_id)
     
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
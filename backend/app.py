@@ -1,25 +1,113 @@
 """
 Main FastAPI application
 """
-from fastapi import FastAPI, HTTPException
+import time
+
+_IMPORT_STARTED = time.perf_counter()
+
+import asyncio
+import hashlib
+import json
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict
+
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from api import movies, reviews, users, auth
+from config import get_rds_password, uses_rds_secret
+from db import SessionLocal, dispose_engines, get_db, init_engines
+from repositories.movie import MovieRepository
+from services.cache import cache, prediction_cache
+from services.http_client import http_client
+from services.movie_index import movie_index
+from services.movie_vector_batch import iter_ndjson, vectorize_stream
+from services.profile_store import as_movie_id, profile_store
+from services.search_executor import execute_hybrid_query
+from services.vector_store import get_vector_store, index_profile, recommendation_query
+from utils.logger import log
 from utils.validator import validate_request
 
 from domain.a1_preference import analyze_preference
 from domain.a2_movie_vector import process_movie_vector
-from domain.a3_prediction import predict_satisfaction
+from domain.a3_prediction import predict_satisfaction, predict_satisfaction_batch
 from domain.a4_explanation import explain_prediction
 from domain.a5_emotional_search import emotional_search
-from domain.a6_group_simulation import simulate_group
+from domain.a6_group_simulation import simulate_group, simulate_group_batch
 from domain.a7_taste_map import build_taste_map
+from domain.taxonomy import reload_taxonomy
+
+IMPORT_SECONDS = time.perf_counter() - _IMPORT_STARTED
+
+# /recommend/top: 벡터 검색 후보 수 = max(k × 배수, 최소값) (요청의 num_candidates 가 우선)
+RECOMMEND_OVERSAMPLING = 10
+RECOMMEND_MIN_CANDIDATES = 200
+
+
+@contextmanager
+def _timed(report: Dict[str, float], stage: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        report[stage] = round(time.perf_counter() - started, 3)
+
+
+def _format_report(report: Dict[str, float]) -> str:
+    return " ".join(f"{stage}={seconds:.3f}s" for stage, seconds in report.items())
+
+
+def _warm_up(report: Dict[str, float]) -> None:
+    """Secret 조회, 첫 DB 연결, 영화 인덱스 빌드 (기동을 막지 않도록 백그라운드에서 실행)"""
+    try:
+        if uses_rds_secret():
+            with _timed(report, "secret"):
+                get_rds_password()
+        with _timed(report, "connect"):
+            with SessionLocal() as db:
+                db.execute(text("SELECT 1"))
+        with _timed(report, "movie_index"):
+            with SessionLocal() as db:
+                movie_index.build(db)
+    except Exception as exc:
+        # DB 가 아직 준비되지 않았으면 첫 요청에서 다시 연결/빌드
+        log(f"warm-up skipped: {exc}")
+    log(f"warm-up: {_format_report(report)}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    report = {"import": round(IMPORT_SECONDS, 3)}
+    # 엔진 생성은 네트워크 없이 끝난다 (비밀번호는 연결 시점에 캐시에서 주입)
+    with _timed(report, "engine"):
+        init_engines()
+    # taxonomy 는 기동 시 한 번 읽고, 이후에는 mtime 변경 시에만 다시 읽는다
+    with _timed(report, "taxonomy"):
+        reload_taxonomy(force=True)
+    with _timed(report, "http_client"):
+        await http_client.start()
+    log(f"startup: {_format_report(report)}")
+    app.state.startup_report = report
+
+    warm_up = asyncio.create_task(run_in_threadpool(_warm_up, report))
+    try:
+        yield
+    finally:
+        warm_up.cancel()
+        await http_client.close()
+        await dispose_engines()
+
 
 # Create FastAPI app
 app = FastAPI(
     title="Movie Recommendation API",
     description="정서·서사 기반 영화 취향 시뮬레이션 & 감성 검색 서비스",
-    version="1.0.1"
+    version="1.0.1",
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -54,6 +142,41 @@ def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/cache/stats")
+def cache_stats():
+    """Response cache hit/miss/eviction counters"""
+    return cache.stats()
+
+
+def _prediction_key(kind: str, body: dict) -> str:
+    """프로필까지 채운 요청 본문의 해시 (같은 입력이면 같은 A-3 결과)"""
+    canonical = json.dumps(body, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return f"{kind}:{hashlib.sha256(canonical.encode()).hexdigest()}"
+
+
+def _resolve_movie_profile(body: dict, db: Session) -> dict:
+    """movie_profile 대신 movie_id 가 온 경우 저장된 프로필로 채운다"""
+    if "movie_profile" in body or "movie_id" not in body:
+        return body
+    movie_id = as_movie_id(body["movie_id"])
+    profile = profile_store.get(db, movie_id) if movie_id is not None else None
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Movie profile not found")
+    return {**body, "movie_profile": profile}
+
+
+def _resolve_movie_profiles(body: dict, db: Session) -> dict:
+    """movie_profiles 대신 movie_ids 가 온 경우 저장된 프로필로 채운다"""
+    if "movie_profiles" in body or "movie_ids" not in body:
+        return body
+    movie_ids = [as_movie_id(m) for m in body["movie_ids"]]
+    profiles = profile_store.get_many(db, [m for m in movie_ids if m is not None])
+    missing = [raw for raw, m in zip(body["movie_ids"], movie_ids) if m not in profiles]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Movie profile not found: {missing}")
+    return {**body, "movie_profiles": [profiles[m] for m in movie_ids]}
+
+
 @app.post("/analyze/preference")
 def analyze_preference_endpoint(body: dict) -> dict:
     try:
@@ -64,19 +187,109 @@ def analyze_preference_endpoint(body: dict) -> dict:
 
 
 @app.post("/movie/vector")
-def movie_vector_endpoint(body: dict) -> dict:
+def movie_vector_endpoint(
+    body: dict,
+    persist: bool = Query(True, description="Store the profile in movie_vectors"),
+    db: Session = Depends(get_db),
+) -> dict:
     try:
         body = validate_request("a2_movie_vector_request.json", body)
-        return process_movie_vector(body)
+        profile = process_movie_vector(body)
     except Exception as exc:
         raise HTTPException(status_code=400, detail=str(exc))
 
+    movie_id = as_movie_id(body.get("movie_id"))
+    if persist and movie_id is not None and MovieRepository(db).get(movie_id):
+        stored = profile_store.put(db, movie_id, profile)
+        movie_index.upsert(stored)
+        index_profile(stored)
+    return profile
+
+
+@app.post("/movie/vector/batch")
+async def movie_vector_batch_endpoint(
+    request: Request,
+    persist: bool = Query(True, description="Bulk upsert the profiles into movie_vectors"),
+) -> StreamingResponse:
+    """
+    A-2 for many movies: JSON array or NDJSON (application/x-ndjson) in,
+    one NDJSON line per input out (the profile, or {"index", "error"})
+    """
+    # StreamingResponse 는 연결 종료 감지에 receive 를 쓰므로 본문은 응답 전에 다 읽는다
+    body = await request.body()
+    if "ndjson" in request.headers.get("content-type", ""):
+        items = iter_ndjson(body)
+    else:
+        try:
+            items = json.loads(body)
+        except json.JSONDecodeError as exc:
+            raise HTTPException(status_code=400, detail=f"Invalid JSON: {exc}")
+        if not isinstance(items, list):
+            raise HTTPException(status_code=400, detail="Request body must be a JSON array or NDJSON")
+    return StreamingResponse(vectorize_stream(items, persist), media_type="application/x-ndjson")
+
 
 @app.post("/predict/satisfaction")
-def predict_satisfaction_endpoint(body: dict) -> dict:
+def predict_satisfaction_endpoint(body: dict, db: Session = Depends(get_db)) -> dict:
     try:
         body = validate_request("a3_predict_request.json", body)
-        return predict_satisfaction(body)
+        body = _resolve_movie_profile(body, db)
+        return prediction_cache.get_or_set(
+            _prediction_key("predict", body), lambda: predict_satisfaction(body)
+        )
+    except HTTPException:
+        raise
+    except Exception as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@app.post("/predict/satisfaction/batch")
+def predict_satisfaction_batch_endpoint(body: dict, db: Session = Depends(get_db)) -> dict:
+    try:
+        body = validate_request("a3_predict_batch_request.json", body)
+        body = _resolve_movie_profiles(body, db)
+        return prediction_cache.get_or_set(
+            _prediction_key("batch", body), lambda: predict_satisfaction_batch(body)
+        )
+    except HTTPException:
+        raise
+    except Exception as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@app.post("/recommend/top")
+def recommend_top_endpoint(body: dict, db: Session = Depends(get_db)) -> dict:
+    try:
+        body = validate_request("a3_recommend_request.json", body)
+        movie_index.maybe_refresh(db)
+        user_profile = body["user_profile"]
+        k = body.get("k", 20)
+        dislikes = body.get("dislike_tags") or user_profile.get("dislike_tags") or []
+        boost_tags = body.get("boost_tags") or user_profile.get("boost_tags") or []
+        # 벡터 인덱스 점수는 태그 보정 전 A-3 raw 점수라, 태그 보정이 없을 때만 후보를 좁혀도 순위가 같다.
+        # pgvector(HNSW) 일 때만 후보를 좁힌다 (메모리 저장소 검색은 그 자체가 전체 스캔이라 이득이 없음).
+        # 태그가 있거나 컬럼 차원이 현재 taxonomy 와 다르면 movie_index 전체를 정확히 계산한다.
+        candidate_ids = None
+        store = get_vector_store("profile")
+        if store.backend == "pgvector" and not dislikes and not boost_tags and store.matches_taxonomy():
+            candidates = store.search(
+                recommendation_query(user_profile),
+                top_k=body.get("num_candidates") or max(k * RECOMMEND_OVERSAMPLING, RECOMMEND_MIN_CANDIDATES),
+                filters={"exclude_movie_ids": body.get("exclude_movie_ids")},
+            )
+            candidate_ids = [c["movie_id"] for c in candidates]
+            if len(candidate_ids) < k:
+                # 벡터 컬럼이 아직 채워지지 않은 영화가 많으면 후보가 모자란다
+                candidate_ids = None
+        recommendations = movie_index.top_k(
+            user_profile,
+            k=k,
+            dislikes=dislikes,
+            boost_tags=boost_tags,
+            exclude_movie_ids=body.get("exclude_movie_ids"),
+            candidate_ids=candidate_ids,
+        )
+        return {"recommendations": recommendations, "total_candidates": movie_index.size}
     except Exception as exc:
         raise HTTPException(status_code=400, detail=str(exc))
 
@@ -91,19 +304,41 @@ def explain_prediction_endpoint(body: dict) -> dict:
 
 
 @app.post("/search/emotional")
-def emotional_search_endpoint(body: dict) -> dict:
+def emotional_search_endpoint(
+    body: dict,
+    execute: bool = Query(True, description="Run the kNN query on the local vector index"),
+    db: Session = Depends(get_db),
+) -> dict:
     try:
         body = validate_request("a5_search_request.json", body)
-        return emotional_search(body)
+        result = emotional_search(body)
+        if execute:
+            result["results"] = execute_hybrid_query(result["hybrid_query"], db)
+        return result
     except Exception as exc:
         raise HTTPException(status_code=400, detail=str(exc))
 
 
 @app.post("/group/simulate")
-def group_simulate_endpoint(body: dict) -> dict:
+def group_simulate_endpoint(body: dict, db: Session = Depends(get_db)) -> dict:
     try:
         body = validate_request("a6_group_request.json", body)
+        body = _resolve_movie_profile(body, db)
         return simulate_group(body)
+    except HTTPException:
+        raise
+    except Exception as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
+@app.post("/group/simulate/batch")
+def group_simulate_batch_endpoint(body: dict, db: Session = Depends(get_db)) -> dict:
+    try:
+        body = validate_request("a6_group_batch_request.json", body)
+        body = _resolve_movie_profiles(body, db)
+        return simulate_group_batch(body)
+    except HTTPException:
+        raise
     except Exception as exc:
         raise HTTPException(status_code=400, detail=str(exc))
 
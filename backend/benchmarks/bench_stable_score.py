@@ -0,0 +1,57 @@
+"""
+태그 점수(_stable_score) 계산 비용: 태그마다 바이트 루프 vs 공유 prefix 일괄 계산
+
+실행: cd backend && python -m benchmarks.bench_stable_score
+"""
+import random
+import timeit
+
+from domain.a1_preference import stable_scores
+from domain.taxonomy import load_taxonomy
+
+LENGTHS = [100, 1000, 10000]
+ENDING_TAGS = ["ending_happy", "ending_open", "ending_bittersweet"]
+
+
+def legacy_score(text: str, tag: str) -> float:
+    """변경 전 구현 (비교 기준)"""
+    seed = (text + "||" + tag).encode("utf-8")
+    h = 0
+    for b in seed:
+        h = (h * 131 + b) % 1000003
+    return round((h % 1000) / 1000.0, 3)
+
+
+def _tags() -> list:
+    taxonomy = load_taxonomy()
+    tags = []
+    for category in ["emotion", "story_flow", "direction_mood", "character_relationship"]:
+        tags.extend(taxonomy.tags(category))
+    return tags + ENDING_TAGS
+
+
+def _text(length: int, rng: random.Random) -> str:
+    alphabet = "가나다라마바사아자차카타파하 영화감동슬픔 abcdefg."
+    return "".join(rng.choice(alphabet) for _ in range(length))
+
+
+def main() -> None:
+    rng = random.Random(0)
+    tags = _tags()
+    print(f"{len(tags)} tags per call (A-2 profile)")
+    for length in LENGTHS:
+        text = _text(length, rng)
+        expected = {tag: legacy_score(text, tag) for tag in tags}
+        assert stable_scores(text, tags) == expected, "batched scores differ from the legacy loop"
+
+        number = max(3, 200000 // (length * len(tags)))
+        legacy = timeit.timeit(lambda: {tag: legacy_score(text, tag) for tag in tags}, number=number) / number
+        batched = timeit.timeit(lambda: stable_scores(text, tags), number=number * 20) / (number * 20)
+        print(
+            f"{length:>6} chars  legacy {legacy * 1e3:9.3f} ms  batched {batched * 1e3:7.3f} ms"
+            f"  x{legacy / batched:,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
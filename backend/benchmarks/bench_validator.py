@@ -0,0 +1,38 @@
+"""
+validate_request 요청당 비용 측정
+
+실행: cd backend && python -m benchmarks.bench_validator
+"""
+import timeit
+
+from domain.a1_preference import analyze_preference
+from domain.a2_movie_vector import process_movie_vector
+from utils.validator import validate_request
+
+
+def _payloads() -> dict:
+    user = analyze_preference({"text": "잔잔하고 따뜻한 성장 영화", "dislikes": "무서워요"})
+    movie = process_movie_vector({"movie_id": 1, "title": "Sample", "overview": "따뜻한 가족 이야기"})
+    member = {
+        "user_id": "u1",
+        "profile": {k: user[k] for k in ["emotion_scores", "narrative_traits", "ending_preference"]},
+        "likes": ["감동적이에요"],
+        "dislikes": ["무서워요"],
+    }
+    return {
+        "a1_preference_request.json": {"text": "잔잔하고 따뜻한 영화", "dislikes": "공포"},
+        "a3_predict_request.json": {"user_profile": user, "movie_profile": movie},
+        "a5_search_request.json": {"text": "우울할 때 보는 밝은 영화", "genres": ["드라마"], "year_from": 2000},
+        "a6_group_request.json": {"members": [member] * 4, "movie_profile": movie},
+    }
+
+
+def main(number: int = 20000) -> None:
+    for schema_name, body in _payloads().items():
+        validate_request(schema_name, body)
+        seconds = timeit.timeit(lambda: validate_request(schema_name, body), number=number)
+        print(f"{schema_name:32s} {seconds / number * 1e6:8.2f} us/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+로컬 Kakao OAuth 스텁 서버 (토큰 교환 / 사용자 정보)
+
+실행:
+  cd backend && python -m benchmarks.kakao_stub --port 9100 --delay 0.2
+  KAKAO_CLIENT_ID=stub KAKAO_AUTH_BASE_URL=http://localhost:9100 \\
+  KAKAO_API_BASE_URL=http://localhost:9100 uvicorn app:app --port 8000
+  curl "http://localhost:8000/api/auth/kakao/callback?code=abc"
+
+--delay 로 Kakao 지연을, --fail-rate 로 5xx 응답을 흉내 내 단계별 timeout 동작을 확인한다.
+"""
+import argparse
+import asyncio
+import random
+import zlib
+from urllib.parse import parse_qs
+
+import uvicorn
+from fastapi import FastAPI, Header, HTTPException, Request
+
+
+def create_app(delay: float = 0.0, fail_rate: float = 0.0) -> FastAPI:
+    app = FastAPI(title="Kakao OAuth stub")
+
+    async def _simulate() -> None:
+        if delay:
+            await asyncio.sleep(delay)
+        if fail_rate and random.random() < fail_rate:
+            raise HTTPException(status_code=503, detail="stub failure")
+
+    @app.post("/oauth/token")
+    async def token(request: Request):
+        # x-www-form-urlencoded 를 직접 파싱 (python-multipart 의존성 없이)
+        form = parse_qs((await request.body()).decode())
+        code = form.get("code", [""])[0]
+        if form.get("grant_type") != ["authorization_code"] or not code:
+            raise HTTPException(status_code=400, detail="invalid_grant")
+        await _simulate()
+        return {"access_token": f"stub-token-{code}", "token_type": "bearer", "expires_in": 21599}
+
+    @app.get("/v2/user/me")
+    async def user_me(authorization: str = Header("")):
+        await _simulate()
+        if not authorization.startswith("Bearer "):
+            raise HTTPException(status_code=401, detail="missing token")
+        # 같은 code 로는 항상 같은 사용자
+        kakao_id = zlib.crc32(authorization.encode()) % 10**9
+        return {
+            "id": kakao_id,
+            "kakao_account": {"profile": {"nickname": f"stub{kakao_id % 10000}"}},
+        }
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="fraction of 503 responses")
+    args = parser.parse_args()
+    uvicorn.run(create_app(args.delay, args.fail_rate), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
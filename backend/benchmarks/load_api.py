@@ -0,0 +1,96 @@
+"""
+/api 라우터 부하 테스트 (동시 클라이언트 수 고정, 처리량/지연 측정)
+
+실행:
+  uvicorn app:app --port 8000 --workers 1
+  cd backend && python -m benchmarks.load_api --base-url http://localhost:8000 --concurrency 200
+
+sync 라우터와 비교하려면 이전 빌드를 같은 조건으로 띄워 두 결과의 req/s 를 비교한다.
+"""
+import argparse
+import asyncio
+import itertools
+import statistics
+import time
+from typing import List
+
+import httpx
+
+DEFAULT_PATHS = [
+    "/api/movies?page_size=20",
+    "/api/movies?sort=popular&page_size=20",
+    "/api/movies/1",
+    "/api/movies/1/reviews?page_size=20",
+]
+
+
+async def _client_loop(
+    client: httpx.AsyncClient,
+    paths: "itertools.cycle[str]",
+    deadline: float,
+    latencies: List[float],
+    errors: List[int],
+) -> None:
+    while time.perf_counter() < deadline:
+        path = next(paths)
+        started = time.perf_counter()
+        try:
+            response = await client.get(path)
+            if response.status_code >= 500:
+                errors.append(response.status_code)
+        except httpx.HTTPError:
+            errors.append(0)
+            continue
+        latencies.append(time.perf_counter() - started)
+
+
+async def run(base_url: str, concurrency: int, duration: float, paths: List[str]) -> dict:
+    latencies: List[float] = []
+    errors: List[int] = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        # 워밍업 (커넥션 풀, 인덱스 로딩)
+        await asyncio.gather(*(client.get(path) for path in paths))
+
+        cycle = itertools.cycle(paths)
+        deadline = time.perf_counter() + duration
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(_client_loop(client, cycle, deadline, latencies, errors) for _ in range(concurrency))
+        )
+        elapsed = time.perf_counter() - started
+
+    if not latencies:
+        return {"requests": 0, "errors": len(errors)}
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": quantiles[49] * 1000,
+        "p95_ms": quantiles[94] * 1000,
+        "p99_ms": quantiles[98] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds")
+    parser.add_argument("--path", action="append", dest="paths", help="repeatable; defaults to list/detail/review reads")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args.base_url, args.concurrency, args.duration, args.paths or DEFAULT_PATHS))
+    if not result["requests"]:
+        print(f"no successful requests ({result['errors']} errors)")
+        return
+    print(
+        f"concurrency={args.concurrency} requests={result['requests']} errors={result['errors']} "
+        f"rps={result['rps']:.1f} p50={result['p50_ms']:.1f}ms "
+        f"p95={result['p95_ms']:.1f}ms p99={result['p99_ms']:.1f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,26 @@
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.engine import make_url
+import threading
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
-from config import get_database_url
+from config import get_database_url, get_rds_password, uses_rds_secret
 
 
 class Base(DeclarativeBase):
     pass
 
 
-def get_engine():
+def _engine_config(url: URL) -> dict:
     """
-    Create SQLAlchemy engine with RDS connection
+    Engine options shared by the sync and async engines
+    
+    Args:
+        url: Parsed database URL
     
     Returns:
-        Engine: SQLAlchemy engine instance
+        dict: Keyword arguments for create_engine / create_async_engine
     """
-    database_url = get_database_url()
-    
-    url = make_url(database_url)
     is_postgres = url.get_backend_name().startswith("postgresql")
 
     # Engine configuration
@@ -53,14 +55,110 @@ def get_engine():
             # Use require mode if cert not found but SSL is desired
             engine_config["connect_args"]["sslmode"] = "require"
     
-    return create_engine(database_url, **engine_config)
+    return engine_config
 
 
-# Create engine instance
-engine = get_engine()
+def _inject_rds_password(engine) -> None:
+    """
+    Supply the Secrets Manager password per connection instead of in the URL
+    
+    The password is read from the cached secret at connect time, so a rotated
+    password is picked up without rebuilding the engine. An authentication
+    failure forces one refresh and retry.
+    """
+    @event.listens_for(engine, "do_connect")
+    def provide_password(dialect, conn_rec, cargs, cparams):
+        cparams["password"] = get_rds_password()
+        try:
+            return dialect.connect(*cargs, **cparams)
+        except Exception as exc:
+            if "password authentication failed" not in str(exc):
+                raise
+            cparams["password"] = get_rds_password(force_refresh=True)
+            return dialect.connect(*cargs, **cparams)
 
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+def get_engine():
+    """
+    Create SQLAlchemy engine with RDS connection
+    
+    Returns:
+        Engine: SQLAlchemy engine instance
+    """
+    database_url = get_database_url(include_password=False)
+    engine = create_engine(database_url, **_engine_config(make_url(database_url)))
+    if uses_rds_secret():
+        _inject_rds_password(engine)
+    return engine
+
+
+def async_database_url(database_url: str) -> URL:
+    """
+    Map a database URL onto its asyncio driver
+    
+    postgresql / postgresql+psycopg2 -> postgresql+psycopg (psycopg 3 async),
+    sqlite -> sqlite+aiosqlite
+    """
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend == "postgresql":
+        return url.set(drivername="postgresql+psycopg")
+    if backend == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite")
+    return url
+
+
+def get_async_engine():
+    """
+    Create asyncio SQLAlchemy engine (same pool/SSL settings as get_engine)
+    
+    Returns:
+        AsyncEngine: SQLAlchemy async engine instance
+    """
+    url = async_database_url(get_database_url(include_password=False))
+    engine = create_async_engine(url, **_engine_config(url))
+    if uses_rds_secret():
+        _inject_rds_password(engine.sync_engine)
+    return engine
+
+
+# Engines are created on first use (init_engines, normally from the app lifespan),
+# not at import time, so importing db never touches Secrets Manager or the network
+engine = None
+async_engine = None
+
+# Session factories; init_engines binds them
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+# expire_on_commit=False: attributes read after commit must not trigger lazy IO
+AsyncSessionLocal = async_sessionmaker(
+    class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+_init_lock = threading.Lock()
+
+
+def init_engines() -> None:
+    """Create the sync/async engines and bind the session factories (idempotent)"""
+    global engine, async_engine
+    if engine is not None:
+        return
+    with _init_lock:
+        if engine is not None:
+            return
+        sync_engine = get_engine()
+        async_engine = get_async_engine()
+        SessionLocal.configure(bind=sync_engine)
+        AsyncSessionLocal.configure(bind=async_engine)
+        engine = sync_engine
+
+
+async def dispose_engines() -> None:
+    """Close pooled connections (app shutdown)"""
+    if async_engine is not None:
+        await async_engine.dispose()
+    if engine is not None:
+        engine.dispose()
 
 
 def get_db():
@@ -70,8 +168,21 @@ def get_db():
     Yields:
         Session: SQLAlchemy session
     """
+    init_engines()
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """
+    Dependency for FastAPI to get an async database session
+    
+    Yields:
+        AsyncSession: SQLAlchemy async session
+    """
+    init_engines()
+    async with AsyncSessionLocal() as db:
+        yield db
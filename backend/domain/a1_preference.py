@@ -1,12 +1,64 @@
+from functools import lru_cache
+from typing import Dict, Iterable
+
+import numpy as np
+
 from domain.taxonomy import load_taxonomy
 
+_HASH_BASE = 131
+_HASH_MOD = 1000003
+# 이보다 짧은 텍스트는 파이썬 루프가 NumPy 호출 비용보다 싸다
+_VECTORIZE_MIN_BYTES = 256
+
+# _HASH_BASE^i % _HASH_MOD (i = 0..), 긴 텍스트가 오면 두 배씩 늘린다
+_powers = np.ones(1, dtype=np.int64)
+
+
+def _base_powers(n: int) -> np.ndarray:
+    global _powers
+    powers = _powers
+    while len(powers) < n:
+        step = pow(_HASH_BASE, len(powers), _HASH_MOD)
+        powers = np.concatenate([powers, powers * step % _HASH_MOD])
+    _powers = powers
+    return powers[:n]
+
+
+def _poly_hash(data: bytes) -> int:
+    """h = (h * 131 + b) % 1000003 를 바이트마다 적용한 값"""
+    if len(data) < _VECTORIZE_MIN_BYTES:
+        h = 0
+        for b in data:
+            h = (h * _HASH_BASE + b) % _HASH_MOD
+        return h
+    # Σ b_i · 131^(n-1-i) mod P. 항마다 < 2^28 이라 int64 합이 넘치지 않는다
+    values = np.frombuffer(data, dtype=np.uint8).astype(np.int64)
+    return int(values @ _base_powers(len(data))[::-1] % _HASH_MOD)
+
+
+@lru_cache(maxsize=4096)
+def _suffix_state(tag: str) -> tuple[int, int]:
+    """태그 바이트의 해시와 prefix 에 곱할 131^len(tag)"""
+    data = tag.encode("utf-8")
+    return _poly_hash(data), pow(_HASH_BASE, len(data), _HASH_MOD)
+
+
+def stable_scores(text: str, tags: Iterable[str]) -> Dict[str, float]:
+    """
+    여러 태그의 _stable_score 를 한 번에 계산 (결과 동일).
+    text + "||" 의 해시는 한 번만 구하고, 태그마다 hash(prefix) · 131^len(tag) + hash(tag) 로 잇는다.
+    """
+    prefix = _poly_hash((text + "||").encode("utf-8"))
+    scores = {}
+    for tag in tags:
+        tag_hash, shift = _suffix_state(tag)
+        h = (prefix * shift + tag_hash) % _HASH_MOD
+        scores[tag] = round((h % 1000) / 1000.0, 3)
+    return scores
+
 
 def _stable_score(text: str, tag: str) -> float:
-    seed = (text + "||" + tag).encode("utf-8")
-    h = 0
-    for b in seed:
-        h = (h * 131 + b) % 1000003
-    return round((h % 1000) / 1000.0, 3)
+    return stable_scores(text, (tag,))[tag]
 
 
 def analyze_preference(payload: dict) -> dict:
@@ -20,16 +72,17 @@ def analyze_preference(payload: dict) -> dict:
         dislike_tags = [t.strip() for t in dislikes_text.split(",") if t.strip()]
 
     taxonomy = load_taxonomy()
-    e_keys = taxonomy.get("emotion", {}).get("tags", [])
-    n_keys = taxonomy.get("story_flow", {}).get("tags", [])
+    e_keys = taxonomy.tags("emotion")
+    n_keys = taxonomy.tags("story_flow")
 
-    emotion_scores = {k: _stable_score(text, k) for k in e_keys}
-    narrative_traits = {k: _stable_score(text, k) for k in n_keys}
+    scores = stable_scores(text, [*e_keys, *n_keys, "ending_happy", "ending_open", "ending_bittersweet"])
+    emotion_scores = {k: scores[k] for k in e_keys}
+    narrative_traits = {k: scores[k] for k in n_keys}
 
     ending_preference = {
-        "happy": _stable_score(text, "ending_happy"),
-        "open": _stable_score(text, "ending_open"),
-        "bittersweet": _stable_score(text, "ending_bittersweet"),
+        "happy": scores["ending_happy"],
+        "open": scores["ending_open"],
+        "bittersweet": scores["ending_bittersweet"],
     }
 
     return {
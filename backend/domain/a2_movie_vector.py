@@ -1,5 +1,5 @@
 from domain.taxonomy import load_taxonomy
-from domain.a1_preference import _stable_score
+from domain.a1_preference import stable_scores
 
 
 def _movie_text(movie_payload: dict) -> str:
@@ -19,41 +19,51 @@ def _top_tags(scores: dict, top_n: int = 3) -> list[str]:
     return [k for k, _ in sorted(scores.items(), key=lambda x: x[1], reverse=True)[:top_n]]
 
 
-def process_movie_vector(movie_payload: dict) -> dict:
-    """
-    A-2: 영화 입력 -> 영화 프로필 (taste-simulation-engine 형식 맞춤)
-    """
+ENDING_TAGS = {"happy": "ending_happy", "open": "ending_open", "bittersweet": "ending_bittersweet"}
+
+
+def _tag_groups() -> dict:
+    """카테고리별 태그 목록 + 한 번에 점수를 낼 전체 태그 목록"""
+    taxonomy = load_taxonomy()
+    groups = {
+        "emotion_scores": taxonomy.tags("emotion"),
+        "narrative_traits": taxonomy.tags("story_flow"),
+        "direction_mood": taxonomy.tags("direction_mood"),
+        "character_relationship": taxonomy.tags("character_relationship"),
+    }
+    all_tags = [tag for tags in groups.values() for tag in tags] + list(ENDING_TAGS.values())
+    return {"groups": groups, "all_tags": all_tags}
+
+
+def _build_profile(movie_payload: dict, tag_groups: dict) -> dict:
     movie_id = movie_payload.get("movie_id", "dummy_movie")
     title = movie_payload.get("title", "Dummy Movie")
     text = _movie_text(movie_payload)
 
-    taxonomy = load_taxonomy()
-    e_keys = taxonomy.get("emotion", {}).get("tags", [])
-    n_keys = taxonomy.get("story_flow", {}).get("tags", [])
-    d_keys = taxonomy.get("direction_mood", {}).get("tags", [])
-    c_keys = taxonomy.get("character_relationship", {}).get("tags", [])
-
-    emotion_scores = {k: _stable_score(text, k) for k in e_keys}
-    narrative_traits = {k: _stable_score(text, k) for k in n_keys}
-    direction_mood = {k: _stable_score(text, k) for k in d_keys}
-    character_relationship = {k: _stable_score(text, k) for k in c_keys}
-
-    profile = {
-        "movie_id": movie_id,
-        "title": title,
-        "emotion_scores": emotion_scores,
-        "narrative_traits": narrative_traits,
-        "direction_mood": direction_mood,
-        "character_relationship": character_relationship,
-        "ending_preference": {
-            "happy": _stable_score(text, "ending_happy"),
-            "open": _stable_score(text, "ending_open"),
-            "bittersweet": _stable_score(text, "ending_bittersweet"),
-        },
-    }
+    # 시놉시스가 길어도 텍스트 해시는 한 번만 계산
+    scores = stable_scores(text, tag_groups["all_tags"])
+    profile = {"movie_id": movie_id, "title": title}
+    for field, tags in tag_groups["groups"].items():
+        profile[field] = {k: scores[k] for k in tags}
+    profile["ending_preference"] = {key: scores[tag] for key, tag in ENDING_TAGS.items()}
 
-    top_emotions = ", ".join(_top_tags(emotion_scores))
-    top_narrative = ", ".join(_top_tags(narrative_traits))
+    top_emotions = ", ".join(_top_tags(profile["emotion_scores"]))
+    top_narrative = ", ".join(_top_tags(profile["narrative_traits"]))
     profile["embedding_text"] = f"Title: {title}. Emotions: {top_emotions}. Narrative: {top_narrative}."
     profile["embedding"] = []
     return profile
+
+
+def process_movie_vector(movie_payload: dict) -> dict:
+    """
+    A-2: 영화 입력 -> 영화 프로필 (taste-simulation-engine 형식 맞춤)
+    """
+    return _build_profile(movie_payload, _tag_groups())
+
+
+def process_movie_vectors(movie_payloads: list[dict]) -> list[dict]:
+    """
+    A-2 일괄 처리: taxonomy 와 태그 목록을 배치 전체에서 한 번만 준비한다
+    """
+    tag_groups = _tag_groups()
+    return [_build_profile(payload, tag_groups) for payload in movie_payloads]
@@ -1,5 +1,12 @@
 import math
-from typing import Dict, List
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+SCORE_WEIGHTS = {"emotion": 0.5, "narrative": 0.3, "ending": 0.2}
+
+_PROFILE_CATEGORIES = ["emotion_scores", "narrative_traits", "direction_mood", "character_relationship"]
 
 
 def _cosine_sim(a: List[float], b: List[float]) -> float:
@@ -17,8 +24,7 @@ def _align_vector(d: Dict[str, float], keys: List[str]) -> List[float]:
 
 def _calculate_dislike_penalty(movie_profile: Dict, dislikes: List[str]) -> float:
     penalty = 0.0
-    categories = ["emotion_scores", "narrative_traits", "direction_mood", "character_relationship"]
-    for category in categories:
+    for category in _PROFILE_CATEGORIES:
         if category in movie_profile:
             for tag in dislikes:
                 if tag in movie_profile[category]:
@@ -28,8 +34,7 @@ def _calculate_dislike_penalty(movie_profile: Dict, dislikes: List[str]) -> floa
 
 def _calculate_boost_score(movie_profile: Dict, boost_tags: List[str]) -> float:
     boost = 0.0
-    categories = ["emotion_scores", "narrative_traits", "direction_mood", "character_relationship"]
-    for category in categories:
+    for category in _PROFILE_CATEGORIES:
         if category in movie_profile:
             for tag in boost_tags:
                 if tag in movie_profile[category]:
@@ -61,7 +66,7 @@ def calculate_satisfaction_probability(
     if boost_tags is None:
         boost_tags = []
     if weights is None:
-        weights = {"emotion": 0.5, "narrative": 0.3, "ending": 0.2}
+        weights = SCORE_WEIGHTS
 
     e_keys = list(user_profile.get("emotion_scores", {}).keys())
     n_keys = list(user_profile.get("narrative_traits", {}).keys())
@@ -118,6 +123,294 @@ def calculate_satisfaction_probability(
     }
 
 
+def _align_matrix(profiles: Sequence[Dict], category: str, keys: List[str]) -> np.ndarray:
+    matrix = np.zeros((len(profiles), len(keys)), dtype=np.float64)
+    for i, profile in enumerate(profiles):
+        matrix[i] = _align_vector(profile.get(category, {}), keys)
+    return matrix
+
+
+_VECTOR_CATEGORIES = ["emotion_scores", "narrative_traits", "ending_preference"]
+
+
+@dataclass(frozen=True)
+class MovieMatrix:
+    """
+    열 정렬을 끝낸 영화 M개 (calculate_satisfaction_matrix 의 영화 입력).
+
+    keys / blocks: 카테고리별 열 순서와 (M, K) 점수 행렬
+    tag_index / tag_blocks: 태그 → 열, 카테고리별 (M, T) 태그 점수.
+        movie_index 스냅샷처럼 카테고리를 미리 합산했다면 블록 하나.
+    norms: 카테고리별 (M,) L2 norm (선택). 사용자 키가 블록 키와 같을 때만 쓴다.
+    행렬에 없는 키/태그는 0 으로 본다.
+    """
+    keys: Dict[str, Tuple[str, ...]]
+    blocks: Dict[str, np.ndarray]
+    tag_index: Dict[str, int]
+    tag_blocks: Tuple[np.ndarray, ...]
+    norms: Optional[Dict[str, np.ndarray]] = None
+
+    @property
+    def size(self) -> int:
+        return self.blocks[_VECTOR_CATEGORIES[0]].shape[0]
+
+    def columns(self, category: str, keys: Sequence[str]) -> np.ndarray:
+        """사용자 키 순서로 고른 (M, len(keys)) 행렬 (키가 같으면 복사 없이 원본 블록)"""
+        if tuple(keys) == self.keys[category]:
+            return self.blocks[category]
+        index = {key: i for i, key in enumerate(self.keys[category])}
+        block = self.blocks[category]
+        out = np.zeros((self.size, len(keys)), dtype=np.float64)
+        for j, key in enumerate(keys):
+            i = index.get(key)
+            if i is not None:
+                out[:, j] = block[:, i]
+        return out
+
+    def column_norms(self, category: str, keys: Sequence[str]) -> Optional[np.ndarray]:
+        if self.norms is None or tuple(keys) != self.keys[category]:
+            return None
+        return self.norms[category]
+
+    def tag_scores(self, tags: Sequence[str]) -> np.ndarray:
+        """_calculate_boost_score / _calculate_dislike_penalty 의 영화별 벡터 버전 (같은 순서로 누적)"""
+        total = np.zeros(self.size, dtype=np.float64)
+        for block in self.tag_blocks:
+            for tag in tags:
+                i = self.tag_index.get(tag)
+                if i is not None:
+                    total += block[:, i]
+        return total
+
+
+def align_movies(
+    movie_profiles: Sequence[Dict],
+    keys: Dict[str, Sequence[str]],
+    tags: Sequence[str] = (),
+) -> MovieMatrix:
+    """영화 dict 목록 → MovieMatrix. 영화마다 한 번만 훑는다 (사용자 그룹/태그 수와 무관)"""
+    tag_index: Dict[str, int] = {}
+    for tag in tags:
+        tag_index.setdefault(tag, len(tag_index))
+
+    blocks = {}
+    for category, category_keys in keys.items():
+        category_keys = list(category_keys)
+        zeros = [0.0] * len(category_keys)
+        # dict.get 을 map 으로 돌려 _align_vector 보다 빠르게 (값 변환은 np.array 가 한 번에)
+        blocks[category] = np.array(
+            [list(map((profile.get(category) or {}).get, category_keys, zeros)) for profile in movie_profiles],
+            dtype=np.float64,
+        ).reshape(len(movie_profiles), len(category_keys))
+
+    tag_names = list(tag_index)
+    tag_blocks = []
+    for category in _PROFILE_CATEGORIES:
+        rows = []
+        for profile in movie_profiles:
+            scores = profile.get(category) or {}
+            rows.append([float(scores[tag]) if tag in scores else 0.0 for tag in tag_names])
+        tag_blocks.append(np.array(rows, dtype=np.float64).reshape(len(movie_profiles), len(tag_names)))
+
+    return MovieMatrix(
+        keys={category: tuple(category_keys) for category, category_keys in keys.items()},
+        blocks=blocks,
+        tag_index=tag_index,
+        tag_blocks=tuple(tag_blocks),
+    )
+
+
+def _cosine_sim_blas(
+    users: np.ndarray, movies: np.ndarray, movie_norms: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """_cosine_sim_matrix 의 행렬곱 버전 (영화 행렬 dtype 으로 계산, 누적 순서가 달라 마지막 자리는 다를 수 있다)"""
+    users = users.astype(movies.dtype, copy=False)
+    dot = (movies @ users.T).T
+    if movie_norms is None:
+        movie_norms = np.linalg.norm(movies, axis=1)
+    denom = np.linalg.norm(users, axis=1)[:, None] * movie_norms[None, :]
+    sim = np.zeros(dot.shape, dtype=np.float64)
+    np.divide(dot, denom, out=sim, where=denom > 0)
+    return sim
+
+
+def _cosine_sim_matrix(users: np.ndarray, movies: np.ndarray) -> np.ndarray:
+    """
+    users (N, K) x movies (M, K) -> (N, M) 코사인 유사도.
+    키 축은 순서대로 누적해서 _cosine_sim 과 같은 부동소수점 결과를 낸다.
+    """
+    n, m = users.shape[0], movies.shape[0]
+    dot = np.zeros((n, m), dtype=np.float64)
+    nu = np.zeros(n, dtype=np.float64)
+    nm = np.zeros(m, dtype=np.float64)
+    for k in range(users.shape[1]):
+        u = users[:, k]
+        v = movies[:, k]
+        dot += u[:, None] * v[None, :]
+        nu += u * u
+        nm += v * v
+    nu = np.sqrt(nu)
+    nm = np.sqrt(nm)
+    denom = nu[:, None] * nm[None, :]
+    zero = denom == 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sim = np.where(zero, 0.0, dot / np.where(zero, 1.0, denom))
+    return sim
+
+
+def calculate_satisfaction_matrix(
+    user_profiles: Sequence[Dict],
+    movie_profiles: Sequence[Dict] | MovieMatrix,
+    dislikes: Sequence[List[str] | None] | None = None,
+    boost_tags: Sequence[List[str] | None] | None = None,
+    weights: Dict[str, float] | None = None,
+    penalty_weight: float = 0.7,
+    boost_weight: float = 0.5,
+) -> Dict[str, np.ndarray]:
+    """
+    N명의 사용자 x M개의 영화 만족 확률을 한 번에 계산한다.
+
+    movie_profiles 는 영화 dict 목록 또는 미리 정렬한 MovieMatrix (movie_index 스냅샷 등).
+    dislikes / boost_tags 는 사용자별 리스트(길이 N)이다.
+    반환값은 반올림 전 (N, M) float64 배열들이며,
+    dict 입력이면 각 원소는 calculate_satisfaction_probability 와 같은 값이다.
+    MovieMatrix 입력은 코사인을 행렬곱으로 계산한다 (행렬 dtype 정밀도, 카탈로그 전체 순위용).
+    """
+    n = len(user_profiles)
+    if dislikes is None:
+        dislikes = [None] * n
+    if boost_tags is None:
+        boost_tags = [None] * n
+    if weights is None:
+        weights = SCORE_WEIGHTS
+
+    exact = not isinstance(movie_profiles, MovieMatrix)
+    if not exact:
+        movies = movie_profiles
+    else:
+        # 모든 사용자의 키/태그 합집합으로 영화 dict 를 한 번만 정렬
+        movie_keys: Dict[str, Dict[str, None]] = {category: {} for category in _VECTOR_CATEGORIES}
+        for profile in user_profiles:
+            for category in _VECTOR_CATEGORIES:
+                movie_keys[category].update(dict.fromkeys(profile.get(category, {})))
+        tags = dict.fromkeys(tag for tag_list in (*dislikes, *boost_tags) for tag in tag_list or [])
+        movies = align_movies(movie_profiles, {c: list(k) for c, k in movie_keys.items()}, list(tags))
+    m = movies.size
+
+    sim_e = np.zeros((n, m), dtype=np.float64)
+    sim_n = np.zeros((n, m), dtype=np.float64)
+    sim_d = np.zeros((n, m), dtype=np.float64)
+
+    # 같은 키 구성을 가진 사용자끼리 묶어 영화 열 선택을 한 번만 수행
+    groups: Dict[tuple, List[int]] = {}
+    for i, profile in enumerate(user_profiles):
+        key = (
+            tuple(profile.get("emotion_scores", {}).keys()),
+            tuple(profile.get("narrative_traits", {}).keys()),
+            tuple(profile.get("ending_preference", {}).keys()),
+        )
+        groups.setdefault(key, []).append(i)
+
+    for (e_keys, n_keys, d_keys), rows in groups.items():
+        users = [user_profiles[i] for i in rows]
+        for out, category, keys in (
+            (sim_e, "emotion_scores", list(e_keys)),
+            (sim_n, "narrative_traits", list(n_keys)),
+            (sim_d, "ending_preference", list(d_keys)),
+        ):
+            user_matrix = _align_matrix(users, category, keys)
+            if exact:
+                out[rows] = _cosine_sim_matrix(user_matrix, movies.columns(category, keys))
+            else:
+                out[rows] = _cosine_sim_blas(
+                    user_matrix, movies.columns(category, keys), movies.column_norms(category, keys)
+                )
+
+    tag_cache: Dict[tuple, np.ndarray] = {}
+
+    def _tag_scores(tags: List[str] | None) -> np.ndarray:
+        key = tuple(tags or [])
+        if key not in tag_cache:
+            tag_cache[key] = movies.tag_scores(key)
+        return tag_cache[key]
+
+    boost_score = np.vstack([_tag_scores(t) for t in boost_tags]) if n else np.zeros((0, m))
+    dislike_penalty = np.vstack([_tag_scores(t) for t in dislikes]) if n else np.zeros((0, m))
+
+    w_e = weights.get("emotion", 0.5)
+    w_n = weights.get("narrative", 0.3)
+    w_d = weights.get("ending", 0.2)
+
+    raw_score = (
+        (w_e * sim_e + w_n * sim_n + w_d * sim_d)
+        + (boost_weight * boost_score)
+        - (penalty_weight * dislike_penalty)
+    )
+    probability = np.clip((raw_score + 1) / 2, 0.0, 1.0)
+
+    mean = (sim_e + sim_n + sim_d) / 3
+    variance = ((sim_e - mean) ** 2 + (sim_n - mean) ** 2 + (sim_d - mean) ** 2) / 3
+    confidence = 1 - np.minimum(np.sqrt(variance), 1.0)
+
+    return {
+        "probability": probability,
+        "confidence": confidence,
+        "raw_score": raw_score,
+        "emotion_similarity": sim_e,
+        "narrative_similarity": sim_n,
+        "ending_similarity": sim_d,
+        "boost_score": boost_score,
+        "dislike_penalty": dislike_penalty,
+    }
+
+
+def _result_row(matrix: Dict[str, np.ndarray], i: int) -> List[Dict]:
+    """i 번째 사용자의 결과 dict 목록 (행 단위로 한 번에 파이썬 float 로 꺼낸다)"""
+    row = {name: values[i].tolist() for name, values in matrix.items()}
+    results = []
+    for j, (sim_e, sim_n, sim_d) in enumerate(
+        zip(row["emotion_similarity"], row["narrative_similarity"], row["ending_similarity"])
+    ):
+        results.append({
+            "probability": round(row["probability"][j], 3),
+            "confidence": round(row["confidence"][j], 3),
+            "raw_score": round(row["raw_score"][j], 3),
+            "breakdown": {
+                "emotion_similarity": round(sim_e, 3),
+                "narrative_similarity": round(sim_n, 3),
+                "ending_similarity": round(sim_d, 3),
+                "boost_score": round(row["boost_score"][j], 3),
+                "dislike_penalty": round(row["dislike_penalty"][j], 3),
+                "top_factors": _top_factors(sim_e, sim_n, sim_d),
+            },
+        })
+    return results
+
+
+def calculate_satisfaction_batch(
+    user_profile: Dict,
+    movie_profiles: Sequence[Dict] | MovieMatrix,
+    dislikes: List[str] | None = None,
+    boost_tags: List[str] | None = None,
+    weights: Dict[str, float] | None = None,
+    penalty_weight: float = 0.7,
+    boost_weight: float = 0.5,
+) -> List[Dict]:
+    """
+    한 사용자 x M개 영화. 결과 형식은 calculate_satisfaction_probability 와 동일하다.
+    """
+    matrix = calculate_satisfaction_matrix(
+        [user_profile],
+        movie_profiles,
+        dislikes=[dislikes],
+        boost_tags=[boost_tags],
+        weights=weights,
+        penalty_weight=penalty_weight,
+        boost_weight=boost_weight,
+    )
+    return _result_row(matrix, 0)
+
+
 def predict_satisfaction(payload: dict) -> dict:
     """
     A-3: 사용자 + 영화 -> 만족 확률 계산
@@ -143,3 +436,36 @@ def predict_satisfaction(payload: dict) -> dict:
         "match_rate": round(result["probability"] * 100, 2),
         "breakdown": result["breakdown"],
     }
+
+
+def predict_satisfaction_batch(payload: dict) -> dict:
+    """
+    A-3 (batch): 사용자 + 영화 목록 -> 영화별 만족 확률 계산
+    """
+    user_profile = payload.get("user_profile", {})
+    movie_profiles = payload.get("movie_profiles", [])
+    dislikes = payload.get("dislike_tags") or user_profile.get("dislike_tags") or []
+    boost_tags = payload.get("boost_tags") or user_profile.get("boost_tags") or []
+
+    results = calculate_satisfaction_batch(
+        user_profile=user_profile,
+        movie_profiles=movie_profiles,
+        dislikes=dislikes,
+        boost_tags=boost_tags,
+    )
+
+    predictions = []
+    for movie_profile, result in zip(movie_profiles, results):
+        predictions.append(
+            {
+                "movie_id": movie_profile.get("movie_id"),
+                "title": movie_profile.get("title", "Unknown"),
+                "probability": result["probability"],
+                "confidence": result["confidence"],
+                "raw_score": result["raw_score"],
+                "match_rate": round(result["probability"] * 100, 2),
+                "breakdown": result["breakdown"],
+            }
+        )
+
+    return {"predictions": predictions}
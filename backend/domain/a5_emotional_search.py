@@ -1,4 +1,32 @@
 # 감성 검색 로직
+from utils.keyword_matcher import KeywordMatcher
+
+# taste-simulation-engine의 키워드/태그 확장 매핑
+KEYWORD_MAP = {
+    "우울": "우울해요",
+    "슬프": "슬퍼요",
+    "긴장": "긴장돼요",
+    "무서": "무서워요",
+    "설레": "설레요",
+    "로맨": "로맨틱해요",
+    "웃기": "웃겨요",
+    "밝": "밝은 분위기예요",
+    "어둡": "어두운 분위기예요",
+    "잔잔": "잔잔해요",
+    "현실": "현실적이에요",
+    "몽환": "몽환적이에요",
+    "감동": "감동적이에요",
+    "힐링": "힐링돼요",
+    "희망": "희망적이에요",
+    "통쾌": "통쾌해요",
+}
+# "무겁지 않은", "가벼운" → 밝고 잔잔한 쪽으로 보정
+LIGHT_KEYWORDS = ["무겁지 않", "가볍"]
+
+# 키워드 사전이 커져도 입력 한 번 훑기로 끝나도록 모듈 로드 시 한 번 만든다
+_MATCHER = KeywordMatcher(list(KEYWORD_MAP) + LIGHT_KEYWORDS)
+
+
 def emotional_search(payload: dict) -> dict:
     """
     A-5: 의도 분류 + 쿼리 확장 + 하이브리드 검색 페이로드
@@ -8,43 +36,22 @@ def emotional_search(payload: dict) -> dict:
 
     from domain.taxonomy import load_taxonomy
 
-    # taste-simulation-engine의 키워드/태그 확장 매핑
-    keyword_map = {
-        "우울": "우울해요",
-        "슬프": "슬퍼요",
-        "긴장": "긴장돼요",
-        "무서": "무서워요",
-        "설레": "설레요",
-        "로맨": "로맨틱해요",
-        "웃기": "웃겨요",
-        "밝": "밝은 분위기예요",
-        "어둡": "어두운 분위기예요",
-        "잔잔": "잔잔해요",
-        "현실": "현실적이에요",
-        "몽환": "몽환적이에요",
-        "감동": "감동적이에요",
-        "힐링": "힐링돼요",
-        "희망": "희망적이에요",
-        "통쾌": "통쾌해요",
-    }
-
     taxonomy = load_taxonomy()
-    emotion_tags = taxonomy.get("emotion", {}).get("tags", [])
+    emotion_tags = taxonomy.tags("emotion")
     emotion_scores = {tag: 0.0 for tag in emotion_tags}
-    if isinstance(text, str):
-        for k, tag in keyword_map.items():
-            if k in text:
-                if tag in emotion_scores:
-                    emotion_scores[tag] = max(emotion_scores.get(tag, 0.0), 0.8)
+    found = _MATCHER.found(text) if isinstance(text, str) else {}
+    for keyword in found:
+        tag = KEYWORD_MAP.get(keyword)
+        if tag in emotion_scores:
+            emotion_scores[tag] = max(emotion_scores.get(tag, 0.0), 0.8)
 
-    if isinstance(text, str):
-        if "무겁지 않" in text or "가볍" in text:
-            emotion_scores["밝은 분위기예요"] = max(
-                emotion_scores.get("밝은 분위기예요", 0.0), 0.7
-            )
-            emotion_scores["잔잔해요"] = max(
-                emotion_scores.get("잔잔해요", 0.0), 0.6
-            )
+    if any(keyword in found for keyword in LIGHT_KEYWORDS):
+        emotion_scores["밝은 분위기예요"] = max(
+            emotion_scores.get("밝은 분위기예요", 0.0), 0.7
+        )
+        emotion_scores["잔잔해요"] = max(
+            emotion_scores.get("잔잔해요", 0.0), 0.6
+        )
 
     if max(emotion_scores.values()) == 0.0:
         # fallback deterministic scores
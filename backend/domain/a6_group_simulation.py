@@ -1,4 +1,11 @@
 # 그룹 취향 시뮬레이션
+from typing import Dict, List
+
+import numpy as np
+
+AGGREGATIONS = ("mean", "least_misery", "fairness")
+
+
 def simulate_group(payload: dict) -> dict:
     """
     A-6: 그룹 사용자 + 영화 프로필로 그룹 만족 확률 계산
@@ -18,8 +25,9 @@ def simulate_group(payload: dict) -> dict:
 
     for m in members:
         profile = m.get("profile", {})
-        dislikes = m.get("dislikes", [])
-        likes = m.get("likes", [])
+        # A-1 결과를 그대로 profile 로 넣은 경우 그 태그를 사용 (A-3 와 같은 우선순위)
+        dislikes = m.get("dislikes") or profile.get("dislike_tags") or []
+        likes = m.get("likes") or profile.get("boost_tags") or []
         result = calculate_satisfaction_probability(
             user_profile=profile,
             movie_profile=movie_profile,
@@ -48,6 +56,89 @@ def simulate_group(payload: dict) -> dict:
     }
 
 
+def _aggregate(probs: np.ndarray, aggregation: str, fairness_weight: float) -> np.ndarray:
+    """
+    (N, M) 멤버별 확률 → (M,) 그룹 점수.
+    mean: 평균 (simulate_group 과 같은 값), least_misery: 가장 낮은 멤버 확률,
+    fairness: 평균 - fairness_weight * 표준편차 (한 명만 크게 불만인 영화를 뒤로 보냄)
+    """
+    if aggregation == "least_misery":
+        return probs.min(axis=0)
+    mean = probs.sum(axis=0) / probs.shape[0]
+    if aggregation == "fairness":
+        return np.clip(mean - fairness_weight * probs.std(axis=0), 0.0, 1.0)
+    return mean
+
+
+def simulate_group_batch(payload: dict) -> dict:
+    """
+    A-6 (batch): 그룹 사용자 + 후보 영화 목록 → 멤버 x 영화 확률을 한 번에 계산하고 그룹 점수순으로 정렬
+    """
+    from domain.a3_prediction import calculate_satisfaction_matrix
+
+    members = payload.get("members", [])
+    movie_profiles = payload.get("movie_profiles", [])
+    penalty_weight = float(payload.get("penalty_weight", 0.7))
+    boost_weight = float(payload.get("boost_weight", 0.5))
+    aggregation = payload.get("aggregation", "mean")
+    fairness_weight = float(payload.get("fairness_weight", 0.5))
+    top_k = payload.get("top_k")
+
+    if aggregation not in AGGREGATIONS:
+        raise ValueError(f"unknown aggregation: {aggregation}")
+    if not members or not movie_profiles:
+        return {"aggregation": aggregation, "candidates": [], "comment": "그룹 또는 후보 영화 입력이 없습니다."}
+
+    matrix = calculate_satisfaction_matrix(
+        [m.get("profile", {}) for m in members],
+        movie_profiles,
+        dislikes=[m.get("dislikes") or m.get("profile", {}).get("dislike_tags") or [] for m in members],
+        boost_tags=[m.get("likes") or m.get("profile", {}).get("boost_tags") or [] for m in members],
+        penalty_weight=penalty_weight,
+        boost_weight=boost_weight,
+    )
+    # simulate_group 과 같은 점수가 나오도록 반올림된 멤버 확률로 집계
+    probability = [[round(float(p), 3) for p in row] for row in matrix["probability"]]
+    confidence = [[round(float(c), 3) for c in row] for row in matrix["confidence"]]
+    probs = np.asarray(probability, dtype=np.float64)
+    group_scores = _aggregate(probs, aggregation, fairness_weight)
+    min_probs = probs.min(axis=0)
+
+    # 동점이면 입력 순서 유지
+    order = sorted(range(len(movie_profiles)), key=lambda j: -group_scores[j])
+    if top_k is not None:
+        order = order[: int(top_k)]
+
+    candidates: List[Dict] = []
+    for rank, j in enumerate(order, start=1):
+        movie_profile = movie_profiles[j]
+        candidates.append(
+            {
+                "rank": rank,
+                "movie_id": movie_profile.get("movie_id"),
+                "title": movie_profile.get("title", "Unknown"),
+                "group_score": round(float(group_scores[j]), 3),
+                "min_probability": round(float(min_probs[j]), 3),
+                "members": [
+                    {
+                        "user_id": m.get("user_id", ""),
+                        "probability": probability[i][j],
+                        "confidence": confidence[i][j],
+                        "level": _level_from_prob(probability[i][j]),
+                    }
+                    for i, m in enumerate(members)
+                ],
+                "comment": _group_comment(float(group_scores[j])),
+            }
+        )
+
+    return {
+        "aggregation": aggregation,
+        "candidates": candidates,
+        "comment": candidates[0]["comment"],
+    }
+
+
 def _level_from_prob(prob: float) -> str:
     if prob >= 0.85:
         return "매우 만족"
@@ -3,15 +3,15 @@ def build_taste_map(payload: dict) -> dict:
     A-7: 취향 지도 출력 (taste-simulation-engine 형식 맞춤)
     """
     from domain.taxonomy import load_taxonomy
-    from domain.a1_preference import _stable_score
+    from domain.a1_preference import stable_scores
 
     user_text = payload.get("user_text", "")
     k = int(payload.get("k", 8))
 
     taxonomy = load_taxonomy()
-    e_keys = taxonomy.get("emotion", {}).get("tags", [])
+    e_keys = taxonomy.tags("emotion")
 
-    scores = {k: _stable_score(user_text, k) for k in e_keys}
+    scores = stable_scores(user_text, e_keys)
     top = sorted(scores.items(), key=lambda x: x[1], reverse=True)
 
     clusters = []
@@ -1,5 +1,14 @@
 import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Mapping, Optional, Tuple
+
+# 파일 변경 여부(mtime)를 확인하는 최소 간격(초). 0 이면 매 호출마다 확인
+RELOAD_INTERVAL = float(os.getenv("TAXONOMY_RELOAD_INTERVAL", "2.0"))
 
 
 def _default_taxonomy() -> dict:
@@ -11,11 +20,126 @@ def _default_taxonomy() -> dict:
     }
 
 
-def load_taxonomy() -> dict:
-    base = Path(__file__).resolve().parents[3]
-    path = base / "taste-simulation-engine" / "model_sample" / "emotion_tag.json"
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+@dataclass(frozen=True)
+class Taxonomy:
+    """
+    읽기 전용 taxonomy. dict 와 같은 방식(taxonomy.get("emotion", {}).get("tags", []))으로도 쓸 수 있다.
+    """
+    data: Mapping[str, Any]
+    tag_index: Mapping[str, Mapping[str, int]]
+    source: Optional[Path] = None
+    version: Optional[int] = None  # 파일 mtime(ns). 기본 taxonomy 는 None
+    loaded_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def from_dict(cls, raw: dict, source: Optional[Path] = None, version: Optional[int] = None) -> "Taxonomy":
+        tag_index = {}
+        for category, section in raw.items():
+            if isinstance(section, dict) and isinstance(section.get("tags"), list):
+                tag_index[category] = MappingProxyType(
+                    {tag: i for i, tag in enumerate(section["tags"])}
+                )
+        return cls(
+            data=_freeze(raw),
+            tag_index=MappingProxyType(tag_index),
+            source=source,
+            version=version,
+        )
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.data.get(key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        return self.data[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.data
+
+    def tags(self, category: str) -> Tuple[str, ...]:
+        return self.data.get(category, {}).get("tags", ())
+
+    def index(self, category: str) -> Mapping[str, int]:
+        return self.tag_index.get(category, MappingProxyType({}))
+
+
+_lock = threading.Lock()
+_current: Optional[Taxonomy] = None
+_checked_at = 0.0
+
+
+def taxonomy_path() -> Path:
+    override = os.getenv("TAXONOMY_PATH")
+    if override:
+        return Path(override)
+
+    here = Path(__file__).resolve()
+    candidates = []
+    if len(here.parents) > 3:
+        candidates.append(here.parents[3] / "taste-simulation-engine" / "model_sample" / "emotion_tag.json")
+    candidates.append(here.parents[2] / "model_sample" / "emotion_tag.json")
+    for candidate in candidates:
+        if candidate.exists():
+            return candidate
+    return candidates[0]
+
+
+def _mtime(path: Path) -> Optional[int]:
     try:
-        with path.open("r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        return _default_taxonomy()
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def reload_taxonomy(force: bool = False) -> Taxonomy:
+    """
+    파일이 바뀌었으면(mtime 기준) 다시 읽어 교체한다. force=True 면 무조건 다시 읽는다.
+    읽기에 실패하면 직전 taxonomy(없으면 기본값)를 유지한다.
+    """
+    global _current
+    with _lock:
+        path = taxonomy_path()
+        version = _mtime(path)
+        if (
+            not force
+            and _current is not None
+            and _current.source == path
+            and _current.version == version
+        ):
+            return _current
+
+        loaded = None
+        if version is not None:
+            try:
+                with path.open("r", encoding="utf-8") as f:
+                    loaded = Taxonomy.from_dict(json.load(f), source=path, version=version)
+            except Exception:
+                loaded = None
+
+        if loaded is None:
+            if _current is not None and _current.version is not None:
+                return _current
+            loaded = Taxonomy.from_dict(_default_taxonomy(), source=path, version=version)
+
+        _current = loaded
+        return _current
+
+
+def load_taxonomy() -> Taxonomy:
+    """
+    프로세스 전역 taxonomy 를 반환한다.
+    RELOAD_INTERVAL 마다 한 번만 mtime 을 확인하므로 요청마다 파일을 열지 않는다.
+    """
+    global _checked_at
+    now = time.monotonic()
+    if _current is None or now - _checked_at >= RELOAD_INTERVAL:
+        _checked_at = now
+        return reload_taxonomy()
+    return _current
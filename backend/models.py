@@ -7,6 +7,7 @@ from sqlalchemy import (
     ForeignKey, UniqueConstraint, Index, Boolean
 )
 from sqlalchemy.dialects.postgresql import JSONB
+from pgvector.sqlalchemy import Vector
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -44,11 +45,31 @@ class Movie(Base):
     poster_url = Column(String, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
+    # 리뷰 집계 (리뷰 생성/수정/삭제 시 ReviewRepository 가 갱신)
+    review_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_sum = Column(Numeric(10, 1), nullable=False, default=0, server_default="0")
+    rating_avg = Column(Float, nullable=False, default=0, server_default="0", comment="리뷰 없으면 0")
+
     # Relationships
     genres = relationship("MovieGenre", back_populates="movie", cascade="all, delete-orphan")
     tags = relationship("MovieTag", back_populates="movie", cascade="all, delete-orphan")
     reviews = relationship("Review", back_populates="movie", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index('ix_movies_release_id', 'release', 'id'),
+        Index('ix_movies_review_count_id', 'review_count', 'id'),
+        Index('ix_movies_rating_avg_id', 'rating_avg', 'id'),
+        # pg_trgm GIN indexes for ILIKE '%q%' and similarity search
+        Index(
+            'ix_movies_title_trgm', 'title',
+            postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'}
+        ),
+        Index(
+            'ix_movies_synopsis_trgm', 'synopsis',
+            postgresql_using='gin', postgresql_ops={'synopsis': 'gin_trgm_ops'}
+        ),
+    )
+
 
 class MovieGenre(Base):
     """영화 장르 (다대다 분리)"""
@@ -102,6 +123,8 @@ class Review(Base):
     __table_args__ = (
         UniqueConstraint('user_id', 'movie_id', name='uq_user_movie_review'),
         Index('ix_reviews_user_movie', 'user_id', 'movie_id'),
+        Index('ix_reviews_movie_created_id', 'movie_id', 'created_at', 'id'),
+        Index('ix_reviews_user_created_id', 'user_id', 'created_at', 'id'),
     )
 
 
@@ -119,6 +142,10 @@ class Comment(Base):
     review = relationship("Review", back_populates="comments")
     user = relationship("User", back_populates="comments")
 
+    __table_args__ = (
+        Index('ix_comments_review_created_id', 'review_id', 'created_at', 'id'),
+    )
+
 
 class ReviewLike(Base):
     """리뷰 좋아요"""
@@ -200,6 +227,12 @@ class UserPreference(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
 
+# pgvector 컬럼 차원 (taxonomy emotion 20개, story_flow 20개 + 결말 3개). taxonomy 가 바뀌면 마이그레이션 필요
+# (그 전까지 벡터 스토어는 matches_taxonomy() 가 False 가 되어 movie_index 전체 탐색으로 대신한다)
+EMOTION_VECTOR_DIM = 20
+PROFILE_VECTOR_DIM = 43
+
+
 class MovieVector(Base):
     """영화 특성 벡터 (OpenSearch 대신 PostgreSQL 사용)"""
     __tablename__ = "movie_vectors"
@@ -209,5 +242,25 @@ class MovieVector(Base):
     emotion_scores = Column(JSONB, nullable=False, default=dict, comment="감정 태그 점수")
     narrative_traits = Column(JSONB, nullable=False, default=dict, comment="서사 특성 점수")
     ending_preference = Column(JSONB, nullable=False, default=dict, comment="결말 선호도")
+    direction_mood = Column(JSONB, nullable=False, default=dict, comment="연출/분위기 점수")
+    character_relationship = Column(JSONB, nullable=False, default=dict, comment="캐릭터/관계 점수")
     embedding_vector = Column(JSONB, nullable=True, default=list, comment="임베딩 벡터 (향후 벡터 검색용)")
+    emotion_vector = Column(Vector(EMOTION_VECTOR_DIM), nullable=True, comment="감정 점수 (taxonomy 순서, A-5 kNN)")
+    profile_vector = Column(Vector(PROFILE_VECTOR_DIM), nullable=True, comment="블록 정규화 emotion‖narrative‖ending (추천 내적 검색)")
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    __table_args__ = (
+        # pgvector HNSW indexes (emotion: cosine, profile: inner product)
+        Index(
+            'ix_movie_vectors_emotion_hnsw', 'emotion_vector',
+            postgresql_using='hnsw',
+            postgresql_with={'m': 16, 'ef_construction': 64},
+            postgresql_ops={'emotion_vector': 'vector_cosine_ops'}
+        ),
+        Index(
+            'ix_movie_vectors_profile_hnsw', 'profile_vector',
+            postgresql_using='hnsw',
+            postgresql_with={'m': 16, 'ef_construction': 64},
+            postgresql_ops={'profile_vector': 'vector_ip_ops'}
+        ),
+    )
@@ -0,0 +1,63 @@
+"""
+Async base repository running the sync repositories on an AsyncSession
+"""
+from typing import Any, Dict, Generic, List, Optional, Type, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from repositories.base import BaseRepository
+
+RepositoryType = TypeVar("RepositoryType", bound=BaseRepository)
+
+
+class AsyncBaseRepository(Generic[RepositoryType]):
+    """
+    Async counterpart of a sync repository
+    
+    Queries are built by the sync repository and executed through
+    AsyncSession.run_sync, so database I/O awaits the async driver instead of
+    holding a threadpool worker, and each query is defined only once.
+    """
+    
+    repository_class: Type[RepositoryType]
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def _run(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        """Call a sync repository method inside the async session"""
+        def call(session: Session) -> Any:
+            return getattr(self.repository_class(session), method)(*args, **kwargs)
+
+        return await self.db.run_sync(call)
+    
+    async def get(self, id: Any) -> Optional[Any]:
+        """Get a single record by ID"""
+        return await self._run("get", id)
+    
+    async def get_multi(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None,
+        after_id: Optional[Any] = None
+    ) -> List[Any]:
+        """Get multiple records with pagination"""
+        return await self._run("get_multi", skip=skip, limit=limit, filters=filters, after_id=after_id)
+    
+    async def count(self, filters: Optional[Dict[str, Any]] = None) -> int:
+        """Count records"""
+        return await self._run("count", filters=filters)
+    
+    async def create(self, obj_in: Dict[str, Any]) -> Any:
+        """Create a new record"""
+        return await self._run("create", obj_in)
+    
+    async def update(self, id: Any, obj_in: Dict[str, Any]) -> Optional[Any]:
+        """Update a record"""
+        return await self._run("update", id, obj_in)
+    
+    async def delete(self, id: Any) -> bool:
+        """Delete a record"""
+        return await self._run("delete", id)
@@ -25,9 +25,10 @@ class BaseRepository(Generic[ModelType]):
         self,
         skip: int = 0,
         limit: int = 100,
-        filters: Optional[Dict[str, Any]] = None
+        filters: Optional[Dict[str, Any]] = None,
+        after_id: Optional[Any] = None
     ) -> List[ModelType]:
-        """Get multiple records with pagination"""
+        """Get multiple records with pagination (keyset on id when after_id is given)"""
         query = self.db.query(self.model)
         
         if filters:
@@ -35,6 +36,9 @@ class BaseRepository(Generic[ModelType]):
                 if hasattr(self.model, key):
                     query = query.filter(getattr(self.model, key) == value)
         
+        if after_id is not None:
+            return query.filter(self.model.id > after_id).order_by(self.model.id).limit(limit).all()
+        
         return query.offset(skip).limit(limit).all()
     
     def count(self, filters: Optional[Dict[str, Any]] = None) -> int:
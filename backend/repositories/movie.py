@@ -1,14 +1,23 @@
 """
 Movie repository with custom queries
 """
-from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_, and_
+from datetime import date
+from typing import List, Optional, Dict, Any, Iterable, Tuple
+from sqlalchemy.orm import Session, Query, joinedload, selectinload
+from sqlalchemy import or_, and_, case, func, select, tuple_, update
 
 from models import Movie, MovieGenre, MovieTag, Review
+from repositories.async_base import AsyncBaseRepository
 from repositories.base import BaseRepository
 
 
+# Aggregate column behind each keyset-paginated sort (latest uses release)
+SORT_COLUMNS = {
+    "popular": Movie.review_count,
+    "rating": Movie.rating_avg,
+}
+
+
 class MovieRepository(BaseRepository[Movie]):
     """Movie repository with custom queries"""
     
@@ -24,121 +33,232 @@ class MovieRepository(BaseRepository[Movie]):
             .first()
         )
     
-    def search(
+    @property
+    def _has_trigram(self) -> bool:
+        """pg_trgm operators are only available on PostgreSQL"""
+        return self.db.get_bind().dialect.name == "postgresql"
+    
+    def _filter_conditions(
         self,
         query: Optional[str] = None,
         genres: Optional[List[str]] = None,
         category: Optional[str] = None,
-        sort: str = "latest",
-        skip: int = 0,
-        limit: int = 20
-    ) -> List[Movie]:
-        """Search movies by title, genres, category with sorting"""
-        db_query = self.db.query(Movie).options(
-            joinedload(Movie.genres),
-            joinedload(Movie.tags)
-        )
+        fuzzy: bool = False
+    ) -> list:
+        """
+        WHERE conditions shared by search and count_search
+        
+        Genre/tag filters are EXISTS subqueries, so no join + DISTINCT is needed.
+        On PostgreSQL the ILIKE filters are served by the pg_trgm GIN indexes;
+        `fuzzy` also matches titles by trigram similarity (typos).
+        """
+        conditions = []
         
         # Text search
         if query:
-            db_query = db_query.filter(
-                or_(
-                    Movie.title.ilike(f"%{query}%"),
-                    Movie.synopsis.ilike(f"%{query}%")
-                )
-            )
+            text_match = [
+                Movie.title.ilike(f"%{query}%"),
+                Movie.synopsis.ilike(f"%{query}%")
+            ]
+            if fuzzy and self._has_trigram:
+                text_match.append(Movie.title.bool_op("%")(query))
+            conditions.append(or_(*text_match))
         
         # Genre filter
         if genres:
-            db_query = db_query.join(MovieGenre).filter(
-                MovieGenre.genre.in_(genres)
-            ).distinct()
+            conditions.append(Movie.genres.any(MovieGenre.genre.in_(genres)))
         
         # Category filter (can be used for tags or other categorization)
         if category:
-            db_query = db_query.join(MovieTag).filter(
-                MovieTag.tag.ilike(f"%{category}%")
-            ).distinct()
+            conditions.append(Movie.tags.any(MovieTag.tag.ilike(f"%{category}%")))
+        
+        return conditions
+    
+    def _search_query(
+        self,
+        query: Optional[str],
+        genres: Optional[List[str]],
+        category: Optional[str],
+        sort: str,
+        after: Optional[Tuple[Any, int]],
+        *columns
+    ) -> Query:
+        relevance = sort == "relevance" and bool(query)
+        db_query = (
+            self.db.query(Movie, *columns)
+            .options(selectinload(Movie.genres), selectinload(Movie.tags))
+            .filter(*self._filter_conditions(query, genres, category, fuzzy=relevance))
+        )
         
         # Sorting
-        if sort == "popular":
-            # Sort by review count
-            from sqlalchemy import func
-            db_query = (
-                db_query.outerjoin(Review)
-                .group_by(Movie.id)
-                .order_by(func.count(Review.id).desc())
-            )
-        elif sort == "rating":
-            # Sort by average rating
-            from sqlalchemy import func
-            db_query = (
-                db_query.outerjoin(Review)
-                .group_by(Movie.id)
-                .order_by(func.coalesce(func.avg(Review.rating), 0).desc())
-            )
+        if relevance:
+            # Best text match first
+            db_query = db_query.order_by(self._relevance(query).desc(), Movie.id.desc())
+        elif sort in SORT_COLUMNS:
+            # Sort by review count / average rating (stored aggregates, indexed)
+            column = SORT_COLUMNS[sort]
+            if after is not None:
+                db_query = db_query.filter(tuple_(column, Movie.id) < tuple_(*after))
+            db_query = db_query.order_by(column.desc(), Movie.id.desc())
         else:  # latest (default)
-            db_query = db_query.order_by(Movie.release.desc().nullslast())
+            if after is not None:
+                db_query = db_query.filter(self._after_latest(*after))
+            db_query = db_query.order_by(Movie.release.desc().nullslast(), Movie.id.desc())
         
-        return db_query.offset(skip).limit(limit).all()
+        return db_query
     
-    def count_search(
+    def search(
         self,
         query: Optional[str] = None,
         genres: Optional[List[str]] = None,
-        category: Optional[str] = None
-    ) -> int:
-        """Count movies matching search criteria"""
-        db_query = self.db.query(Movie)
-        
-        # Text search
-        if query:
-            db_query = db_query.filter(
-                or_(
-                    Movie.title.ilike(f"%{query}%"),
-                    Movie.synopsis.ilike(f"%{query}%")
-                )
-            )
+        category: Optional[str] = None,
+        sort: str = "latest",
+        skip: int = 0,
+        limit: int = 20,
+        after: Optional[Tuple[Any, int]] = None
+    ) -> List[Movie]:
+        """
+        Search movies by title, genres, category with sorting
         
-        # Genre filter
-        if genres:
-            db_query = db_query.join(MovieGenre).filter(
-                MovieGenre.genre.in_(genres)
-            ).distinct()
+        `after` is a keyset cursor from cursor_values (not valid for sort="relevance").
+        """
+        return (
+            self._search_query(query, genres, category, sort, after)
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+    
+    def _relevance(self, query: str):
+        """
+        Match score for sort="relevance"
         
-        # Category filter
-        if category:
-            db_query = db_query.join(MovieTag).filter(
-                MovieTag.tag.ilike(f"%{category}%")
-            ).distinct()
+        PostgreSQL ranks by pg_trgm similarity of the title (synopsis matches
+        count half). SQLite has no trigram support, so it falls back to a
+        coarse exact > prefix > substring > synopsis-only ranking.
+        """
+        if self._has_trigram:
+            return func.greatest(
+                func.similarity(Movie.title, query),
+                func.word_similarity(query, Movie.title),
+                func.coalesce(func.word_similarity(query, Movie.synopsis), 0) * 0.5
+            )
+        return case(
+            (func.lower(Movie.title) == query.lower(), 1.0),
+            (Movie.title.ilike(f"{query}%"), 0.8),
+            (Movie.title.ilike(f"%{query}%"), 0.6),
+            else_=0.3
+        )
+    
+    def search_with_total(
+        self,
+        query: Optional[str] = None,
+        genres: Optional[List[str]] = None,
+        category: Optional[str] = None,
+        sort: str = "latest",
+        skip: int = 0,
+        limit: int = 20
+    ) -> Tuple[List[Movie], int]:
+        """
+        Search movies and count all matches in one round trip (COUNT(*) OVER ())
         
-        return db_query.count()
+        Falls back to count_search only when the requested page is empty.
+        """
+        total_column = func.count().over().label("total")
+        rows = (
+            self._search_query(query, genres, category, sort, None, total_column)
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+        if not rows:
+            total = (
+                self.count_search(query, genres, category, fuzzy=sort == "relevance")
+                if skip else 0
+            )
+            return [], total
+        return [movie for movie, _ in rows], rows[0][1]
+    
+    @staticmethod
+    def cursor_values(movie: Movie, sort: Optional[str]) -> List[Any]:
+        """Keyset cursor values for the last movie of a page"""
+        if sort in SORT_COLUMNS:
+            return [getattr(movie, SORT_COLUMNS[sort].key), movie.id]
+        return [movie.release, movie.id]
+    
+    @staticmethod
+    def _after_latest(release: Optional[date], movie_id: int):
+        """Rows after (release, id) in `release DESC NULLS LAST, id DESC` order"""
+        if release is None:
+            return and_(Movie.release.is_(None), Movie.id < movie_id)
+        return or_(
+            Movie.release < release,
+            and_(Movie.release == release, Movie.id < movie_id),
+            Movie.release.is_(None),
+        )
+    
+    def count_search(
+        self,
+        query: Optional[str] = None,
+        genres: Optional[List[str]] = None,
+        category: Optional[str] = None,
+        fuzzy: bool = False
+    ) -> int:
+        """Count movies matching search criteria"""
+        return (
+            self.db.query(func.count(Movie.id))
+            .filter(*self._filter_conditions(query, genres, category, fuzzy))
+            .scalar()
+        )
     
     def get_by_genre(self, genre: str, limit: int = 20) -> List[Movie]:
         """Get movies by genre"""
         return (
             self.db.query(Movie)
-            .join(MovieGenre)
-            .filter(MovieGenre.genre == genre)
-            .options(joinedload(Movie.genres), joinedload(Movie.tags))
+            .filter(Movie.genres.any(MovieGenre.genre == genre))
+            .options(selectinload(Movie.genres), selectinload(Movie.tags))
             .limit(limit)
             .all()
         )
     
     def get_popular(self, limit: int = 20) -> List[Movie]:
         """Get popular movies (by review count)"""
-        from sqlalchemy import func
-        
         return (
             self.db.query(Movie)
-            .outerjoin(Review)
-            .group_by(Movie.id)
-            .order_by(func.count(Review.id).desc())
-            .options(joinedload(Movie.genres), joinedload(Movie.tags))
+            .order_by(Movie.review_count.desc(), Movie.id.desc())
+            .options(selectinload(Movie.genres), selectinload(Movie.tags))
             .limit(limit)
             .all()
         )
     
+    def refresh_review_stats(self, movie_ids: Optional[Iterable[int]] = None) -> None:
+        """
+        Recompute review_count / rating_sum / rating_avg from the reviews table
+        
+        Repairs drift from reviews removed outside ReviewRepository
+        (e.g. ORM cascades when a user is deleted). All movies when movie_ids is None.
+        """
+        count = (
+            select(func.count(Review.id))
+            .where(Review.movie_id == Movie.id)
+            .scalar_subquery()
+        )
+        total = (
+            select(func.coalesce(func.sum(Review.rating), 0))
+            .where(Review.movie_id == Movie.id)
+            .scalar_subquery()
+        )
+        average = (
+            select(func.coalesce(func.avg(Review.rating), 0))
+            .where(Review.movie_id == Movie.id)
+            .scalar_subquery()
+        )
+        stmt = update(Movie).values(review_count=count, rating_sum=total, rating_avg=average)
+        if movie_ids is not None:
+            stmt = stmt.where(Movie.id.in_(list(movie_ids)))
+        self.db.execute(stmt.execution_options(synchronize_session=False))
+        self.db.commit()
+    
     def add_genre(self, movie_id: int, genre: str) -> bool:
         """Add genre to movie"""
         movie_genre = MovieGenre(movie_id=movie_id, genre=genre)
@@ -152,3 +272,76 @@ class MovieRepository(BaseRepository[Movie]):
         self.db.add(movie_tag)
         self.db.commit()
         return True
+
+
+class AsyncMovieRepository(AsyncBaseRepository[MovieRepository]):
+    """Async movie repository (see AsyncBaseRepository)"""
+    
+    repository_class = MovieRepository
+    cursor_values = staticmethod(MovieRepository.cursor_values)
+    
+    async def get_with_details(self, movie_id: int) -> Optional[Movie]:
+        """Get movie with genres and tags"""
+        return await self._run("get_with_details", movie_id)
+    
+    async def search(
+        self,
+        query: Optional[str] = None,
+        genres: Optional[List[str]] = None,
+        category: Optional[str] = None,
+        sort: str = "latest",
+        skip: int = 0,
+        limit: int = 20,
+        after: Optional[Tuple[Any, int]] = None
+    ) -> List[Movie]:
+        """Search movies by title, genres, category with sorting"""
+        return await self._run(
+            "search", query=query, genres=genres, category=category,
+            sort=sort, skip=skip, limit=limit, after=after
+        )
+    
+    async def search_with_total(
+        self,
+        query: Optional[str] = None,
+        genres: Optional[List[str]] = None,
+        category: Optional[str] = None,
+        sort: str = "latest",
+        skip: int = 0,
+        limit: int = 20
+    ) -> Tuple[List[Movie], int]:
+        """Search movies and count all matches in one round trip"""
+        return await self._run(
+            "search_with_total", query=query, genres=genres, category=category,
+            sort=sort, skip=skip, limit=limit
+        )
+    
+    async def count_search(
+        self,
+        query: Optional[str] = None,
+        genres: Optional[List[str]] = None,
+        category: Optional[str] = None,
+        fuzzy: bool = False
+    ) -> int:
+        """Count movies matching search criteria"""
+        return await self._run("count_search", query, genres, category, fuzzy)
+    
+    async def get_by_genre(self, genre: str, limit: int = 20) -> List[Movie]:
+        """Get movies by genre"""
+        return await self._run("get_by_genre", genre, limit=limit)
+    
+    async def get_popular(self, limit: int = 20) -> List[Movie]:
+        """Get popular movies (by review count)"""
+        return await self._run("get_popular", limit=limit)
+    
+    async def refresh_review_stats(self, movie_ids: Optional[Iterable[int]] = None) -> None:
+        """Recompute review aggregates from the reviews table"""
+        movie_ids = list(movie_ids) if movie_ids is not None else None
+        await self._run("refresh_review_stats", movie_ids)
+    
+    async def add_genre(self, movie_id: int, genre: str) -> bool:
+        """Add genre to movie"""
+        return await self._run("add_genre", movie_id, genre)
+    
+    async def add_tag(self, movie_id: int, tag: str) -> bool:
+        """Add tag to movie"""
+        return await self._run("add_tag", movie_id, tag)
@@ -0,0 +1,144 @@
+"""
+Movie vector repository (A-2 movie profiles)
+"""
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from models import Movie, MovieVector
+from repositories.base import BaseRepository
+
+PROFILE_FIELDS = [
+    "emotion_scores",
+    "narrative_traits",
+    "direction_mood",
+    "character_relationship",
+    "ending_preference",
+]
+
+
+class MovieVectorRepository(BaseRepository[MovieVector]):
+    """Movie vector repository with profile (de)serialization"""
+
+    def __init__(self, db: Session):
+        super().__init__(MovieVector, db)
+
+    @staticmethod
+    def to_profile(vector: MovieVector, title: Optional[str] = None) -> Dict:
+        """Convert a movie_vectors row into an A-2 profile dict"""
+        profile = {"movie_id": vector.movie_id, "title": title or ""}
+        for field in PROFILE_FIELDS:
+            profile[field] = dict(getattr(vector, field) or {})
+        profile["embedding"] = list(vector.embedding_vector or [])
+        return profile
+
+    def get_by_movie_id(self, movie_id: int) -> Optional[MovieVector]:
+        """Get vector row for a movie"""
+        return (
+            self.db.query(MovieVector)
+            .filter(MovieVector.movie_id == movie_id)
+            .first()
+        )
+
+    def get_profiles(self, movie_ids: Iterable[int]) -> Dict[int, Dict]:
+        """Get profiles (with movie titles) for many movies in one query"""
+        ids = list(set(movie_ids))
+        if not ids:
+            return {}
+
+        rows = (
+            self.db.query(MovieVector, Movie.title)
+            .join(Movie, Movie.id == MovieVector.movie_id)
+            .filter(MovieVector.movie_id.in_(ids))
+            .all()
+        )
+        return {vector.movie_id: self.to_profile(vector, title) for vector, title in rows}
+
+    def upsert_profile(
+        self,
+        movie_id: int,
+        profile: Dict,
+        commit: bool = True,
+        vectors: Optional[Dict[str, Optional[List[float]]]] = None
+    ) -> MovieVector:
+        """
+        Create or update the vector row for a movie from an A-2 profile
+
+        vectors maps pgvector column names (emotion_vector, profile_vector) to
+        their encoded values so the ANN columns stay in step with the profile.
+        """
+        vector = self.get_by_movie_id(movie_id)
+        if not vector:
+            vector = MovieVector(movie_id=movie_id)
+            self.db.add(vector)
+
+        for field in PROFILE_FIELDS:
+            setattr(vector, field, dict(profile.get(field) or {}))
+        vector.embedding_vector = list(profile.get("embedding") or [])
+        for column, value in (vectors or {}).items():
+            setattr(vector, column, value)
+
+        if commit:
+            self.db.commit()
+            self.db.refresh(vector)
+        return vector
+
+    def bulk_upsert_profiles(
+        self,
+        profiles: List[Dict],
+        vectors: Optional[List[Dict[str, Optional[List[float]]]]] = None
+    ) -> int:
+        """
+        Insert or update many vector rows in one INSERT ... ON CONFLICT (movie_id)
+
+        profiles must carry integer movie_ids of existing movies; vectors, when
+        given, is aligned with profiles (see upsert_profile).
+        """
+        if not profiles:
+            return 0
+
+        rows = []
+        for i, profile in enumerate(profiles):
+            row = {"movie_id": int(profile["movie_id"])}
+            for field in PROFILE_FIELDS:
+                row[field] = dict(profile.get(field) or {})
+            row["embedding_vector"] = list(profile.get("embedding") or [])
+            if vectors is not None:
+                row.update(vectors[i])
+            rows.append(row)
+
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            for i, profile in enumerate(profiles):
+                self.upsert_profile(
+                    int(profile["movie_id"]),
+                    profile,
+                    commit=False,
+                    vectors=vectors[i] if vectors is not None else None
+                )
+            self.db.commit()
+            return len(profiles)
+
+        stmt = insert(MovieVector).values(rows)
+        columns = [column for column in rows[0] if column != "movie_id"]
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[MovieVector.movie_id],
+            set_={**{column: stmt.excluded[column] for column in columns}, "updated_at": func.now()}
+        )
+        self.db.execute(stmt)
+        self.db.commit()
+        return len(rows)
+
+    def delete_by_movie_id(self, movie_id: int) -> bool:
+        """Delete vector row for a movie"""
+        deleted = (
+            self.db.query(MovieVector)
+            .filter(MovieVector.movie_id == movie_id)
+            .delete(synchronize_session=False)
+        )
+        self.db.commit()
+        return deleted > 0
@@ -1,11 +1,14 @@
 """
 Review repository with custom queries
 """
-from typing import List, Optional
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session, Query, joinedload
+from sqlalchemy import case, func, select, tuple_, update
 
-from models import Review, ReviewLike, Comment
+from models import Movie, Review, ReviewLike, Comment
+from repositories.async_base import AsyncBaseRepository
 from repositories.base import BaseRepository
 
 
@@ -15,27 +18,182 @@ class ReviewRepository(BaseRepository[Review]):
     def __init__(self, db: Session):
         super().__init__(Review, db)
     
-    def get_by_movie(self, movie_id: int, skip: int = 0, limit: int = 20) -> List[Review]:
+    def _apply_movie_stats(self, movie_id: int, count_delta: int, rating_delta: Any) -> None:
+        """
+        Shift the movie's review aggregates in the current transaction
+        
+        Relative UPDATE, so concurrent writers don't overwrite each other.
+        """
+        count = Movie.review_count + count_delta
+        total = Movie.rating_sum + Decimal(str(rating_delta))
+        self.db.execute(
+            update(Movie)
+            .where(Movie.id == movie_id)
+            .values(
+                review_count=count,
+                rating_sum=total,
+                rating_avg=case((count > 0, total / count), else_=0)
+            )
+            .execution_options(synchronize_session=False)
+        )
+    
+    def create(self, obj_in: Dict[str, Any]) -> Review:
+        """Create a review and count it in the movie aggregates"""
+        db_obj = Review(**obj_in)
+        self.db.add(db_obj)
+        self.db.flush()
+        self._apply_movie_stats(db_obj.movie_id, 1, db_obj.rating)
+        self.db.commit()
+        self.db.refresh(db_obj)
+        return db_obj
+    
+    def update(self, id: Any, obj_in: Dict[str, Any]) -> Optional[Review]:
+        """Update a review, moving the movie rating_sum/avg by the rating change"""
+        db_obj = self.get(id)
+        if not db_obj:
+            return None
+        
+        old_rating = Decimal(str(db_obj.rating))
+        for key, value in obj_in.items():
+            if value is not None and hasattr(db_obj, key):
+                setattr(db_obj, key, value)
+        
+        delta = Decimal(str(db_obj.rating)) - old_rating
+        if delta:
+            self._apply_movie_stats(db_obj.movie_id, 0, delta)
+        self.db.commit()
+        self.db.refresh(db_obj)
+        return db_obj
+    
+    def delete(self, id: Any) -> bool:
+        """Delete a review and remove it from the movie aggregates"""
+        db_obj = self.get(id)
+        if not db_obj:
+            return False
+        
+        self._apply_movie_stats(db_obj.movie_id, -1, -Decimal(str(db_obj.rating)))
+        self.db.delete(db_obj)
+        self.db.commit()
+        return True
+    
+    def _count_columns(self):
+        """Correlated like/comment count subqueries for a Review query"""
+        likes_count = (
+            select(func.count(ReviewLike.id))
+            .where(ReviewLike.review_id == Review.id, ReviewLike.is_like == True)
+            .correlate(Review)
+            .scalar_subquery()
+            .label("likes_count")
+        )
+        comments_count = (
+            select(func.count(Comment.id))
+            .where(Comment.review_id == Review.id)
+            .correlate(Review)
+            .scalar_subquery()
+            .label("comments_count")
+        )
+        return likes_count, comments_count
+    
+    def _query_with_counts(self) -> Query:
+        return self.db.query(Review, *self._count_columns())
+    
+    def _timestamp_key(self, value: Any) -> Any:
+        """
+        created_at as a keyset sort key
+        
+        SQLite stores DATETIME as text: server defaults are written as
+        '2026-10-18 06:27:05' but a bound datetime is '2026-10-18 06:27:05.000000',
+        so equal timestamps compare as different strings. On SQLite both the column
+        and the cursor value go through the same strftime() (millisecond precision),
+        and ORDER BY uses that expression too so the cursor and the order agree.
+        """
+        if self.db.get_bind().dialect.name == "sqlite":
+            return func.strftime("%Y-%m-%d %H:%M:%f", value)
+        return value
+    
+    def _newest_first(self, query: Query, after: Optional[Tuple[datetime, int]] = None) -> Query:
+        """Order by (created_at, id) desc, continuing after a keyset cursor"""
+        created_at = self._timestamp_key(Review.created_at)
+        if after is not None:
+            query = query.filter(tuple_(created_at, Review.id) < tuple_(self._timestamp_key(after[0]), after[1]))
+        return query.order_by(created_at.desc(), Review.id.desc())
+    
+    @staticmethod
+    def _rows_to_dicts(rows) -> List[dict]:
+        return [
+            {"review": review, "likes_count": likes_count, "comments_count": comments_count}
+            for review, likes_count, comments_count in rows
+        ]
+    
+    def get_by_movie(
+        self,
+        movie_id: int,
+        skip: int = 0,
+        limit: int = 20,
+        after: Optional[Tuple[datetime, int]] = None
+    ) -> List[Review]:
         """Get reviews for a movie"""
         return (
-            self.db.query(Review)
-            .filter(Review.movie_id == movie_id)
-            .order_by(Review.created_at.desc())
+            self._newest_first(
+                self.db.query(Review).filter(Review.movie_id == movie_id), after
+            )
             .offset(skip)
             .limit(limit)
             .all()
         )
     
-    def get_by_user(self, user_id: str, skip: int = 0, limit: int = 20) -> List[Review]:
+    def get_by_user(
+        self,
+        user_id: str,
+        skip: int = 0,
+        limit: int = 20,
+        after: Optional[Tuple[datetime, int]] = None
+    ) -> List[Review]:
         """Get reviews by a user"""
         return (
-            self.db.query(Review)
-            .filter(Review.user_id == user_id)
-            .order_by(Review.created_at.desc())
+            self._newest_first(
+                self.db.query(Review).filter(Review.user_id == user_id), after
+            )
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+    
+    def get_by_movie_with_counts(
+        self,
+        movie_id: int,
+        skip: int = 0,
+        limit: int = 20,
+        after: Optional[Tuple[datetime, int]] = None
+    ) -> List[dict]:
+        """Get reviews for a movie with like and comment counts (single query)"""
+        rows = (
+            self._newest_first(
+                self._query_with_counts().filter(Review.movie_id == movie_id), after
+            )
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+        return self._rows_to_dicts(rows)
+    
+    def get_by_user_with_counts(
+        self,
+        user_id: str,
+        skip: int = 0,
+        limit: int = 20,
+        after: Optional[Tuple[datetime, int]] = None
+    ) -> List[dict]:
+        """Get reviews by a user with like and comment counts (single query)"""
+        rows = (
+            self._newest_first(
+                self._query_with_counts().filter(Review.user_id == user_id), after
+            )
             .offset(skip)
             .limit(limit)
             .all()
         )
+        return self._rows_to_dicts(rows)
     
     def get_user_review_for_movie(self, user_id: str, movie_id: int) -> Optional[Review]:
         """Get user's review for a specific movie"""
@@ -47,27 +205,11 @@ class ReviewRepository(BaseRepository[Review]):
     
     def get_with_counts(self, review_id: int) -> Optional[dict]:
         """Get review with like and comment counts"""
-        review = self.get(review_id)
-        if not review:
+        row = self._query_with_counts().filter(Review.id == review_id).first()
+        if not row:
             return None
         
-        likes_count = (
-            self.db.query(func.count(ReviewLike.id))
-            .filter(ReviewLike.review_id == review_id, ReviewLike.is_like == True)
-            .scalar()
-        )
-        
-        comments_count = (
-            self.db.query(func.count(Comment.id))
-            .filter(Comment.review_id == review_id)
-            .scalar()
-        )
-        
-        return {
-            "review": review,
-            "likes_count": likes_count,
-            "comments_count": comments_count
-        }
+        return self._rows_to_dicts([row])[0]
     
     def toggle_like(self, review_id: int, user_id: str, is_like: bool = True) -> bool:
         """Toggle like/dislike on a review"""
@@ -100,13 +242,94 @@ class ReviewRepository(BaseRepository[Review]):
         self.db.refresh(comment)
         return comment
     
-    def get_comments(self, review_id: int, skip: int = 0, limit: int = 50) -> List[Comment]:
-        """Get comments for a review"""
+    def get_comments(
+        self,
+        review_id: int,
+        skip: int = 0,
+        limit: int = 50,
+        after: Optional[Tuple[datetime, int]] = None
+    ) -> List[Comment]:
+        """Get comments for a review (oldest first)"""
+        query = self.db.query(Comment).filter(Comment.review_id == review_id)
+        created_at = self._timestamp_key(Comment.created_at)
+        if after is not None:
+            query = query.filter(tuple_(created_at, Comment.id) > tuple_(self._timestamp_key(after[0]), after[1]))
         return (
-            self.db.query(Comment)
-            .filter(Comment.review_id == review_id)
-            .order_by(Comment.created_at.asc())
+            query
+            .order_by(created_at.asc(), Comment.id.asc())
             .offset(skip)
             .limit(limit)
             .all()
         )
+
+
+class AsyncReviewRepository(AsyncBaseRepository[ReviewRepository]):
+    """Async review repository (see AsyncBaseRepository)"""
+    
+    repository_class = ReviewRepository
+    
+    async def get_by_movie(
+        self,
+        movie_id: int,
+        skip: int = 0,
+        limit: int = 20,
+        after: Optional[Tuple[datetime, int]] = None
+    ) -> List[Review]:
+        """Get reviews for a movie"""
+        return await self._run("get_by_movie", movie_id, skip=skip, limit=limit, after=after)
+    
+    async def get_by_user(
+        self,
+        user_id: str,
+        skip: int = 0,
+        limit: int = 20,
+        after: Optional[Tuple[datetime, int]] = None
+    ) -> List[Review]:
+        """Get reviews by a user"""
+        return await self._run("get_by_user", user_id, skip=skip, limit=limit, after=after)
+    
+    async def get_by_movie_with_counts(
+        self,
+        movie_id: int,
+        skip: int = 0,
+        limit: int = 20,
+        after: Optional[Tuple[datetime, int]] = None
+    ) -> List[dict]:
+        """Get reviews for a movie with like and comment counts"""
+        return await self._run("get_by_movie_with_counts", movie_id, skip=skip, limit=limit, after=after)
+    
+    async def get_by_user_with_counts(
+        self,
+        user_id: str,
+        skip: int = 0,
+        limit: int = 20,
+        after: Optional[Tuple[datetime, int]] = None
+    ) -> List[dict]:
+        """Get reviews by a user with like and comment counts"""
+        return await self._run("get_by_user_with_counts", user_id, skip=skip, limit=limit, after=after)
+    
+    async def get_user_review_for_movie(self, user_id: str, movie_id: int) -> Optional[Review]:
+        """Get user's review for a specific movie"""
+        return await self._run("get_user_review_for_movie", user_id, movie_id)
+    
+    async def get_with_counts(self, review_id: int) -> Optional[dict]:
+        """Get review with like and comment counts"""
+        return await self._run("get_with_counts", review_id)
+    
+    async def toggle_like(self, review_id: int, user_id: str, is_like: bool = True) -> bool:
+        """Toggle like/dislike on a review"""
+        return await self._run("toggle_like", review_id, user_id, is_like)
+    
+    async def add_comment(self, review_id: int, user_id: str, content: str) -> Comment:
+        """Add comment to review"""
+        return await self._run("add_comment", review_id, user_id, content)
+    
+    async def get_comments(
+        self,
+        review_id: int,
+        skip: int = 0,
+        limit: int = 50,
+        after: Optional[Tuple[datetime, int]] = None
+    ) -> List[Comment]:
+        """Get comments for a review (oldest first)"""
+        return await self._run("get_comments", review_id, skip=skip, limit=limit, after=after)
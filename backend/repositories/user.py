@@ -5,6 +5,7 @@ from typing import Optional
 from sqlalchemy.orm import Session
 
 from models import User, TasteAnalysis
+from repositories.async_base import AsyncBaseRepository
 from repositories.base import BaseRepository
 
 
@@ -39,3 +40,21 @@ class UserRepository(BaseRepository[User]):
         self.db.commit()
         self.db.refresh(taste)
         return taste
+
+
+class AsyncUserRepository(AsyncBaseRepository[UserRepository]):
+    """Async user repository (see AsyncBaseRepository)"""
+    
+    repository_class = UserRepository
+    
+    async def get_by_name(self, name: str) -> Optional[User]:
+        """Get user by name"""
+        return await self._run("get_by_name", name)
+    
+    async def get_taste_analysis(self, user_id: str) -> Optional[TasteAnalysis]:
+        """Get user's taste analysis"""
+        return await self._run("get_taste_analysis", user_id)
+    
+    async def update_taste_analysis(self, user_id: str, summary_text: str) -> TasteAnalysis:
+        """Update or create taste analysis"""
+        return await self._run("update_taste_analysis", user_id, summary_text)
@@ -67,9 +67,10 @@ class MovieResponse(MovieBase):
 
 class MovieListResponse(BaseModel):
     movies: List[MovieResponse]
-    total: int
+    total: Optional[int] = None
     page: int
     page_size: int
+    next_cursor: Optional[str] = None
 
 
 # ============================================
@@ -103,7 +104,8 @@ class ReviewResponse(ReviewBase):
 
 class ReviewListResponse(BaseModel):
     reviews: List[ReviewResponse]
-    total: int
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 
 # ============================================
@@ -182,6 +184,8 @@ class MovieVectorResponse(BaseModel):
     emotion_scores: Dict[str, float]
     narrative_traits: Dict[str, float]
     ending_preference: Dict[str, float]
+    direction_mood: Dict[str, float] = {}
+    character_relationship: Dict[str, float] = {}
     updated_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
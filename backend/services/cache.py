@@ -1,7 +1,464 @@
-# 캐시 인터페이스 → ElastiCache(또는 DynamoDB TTL)(예상)
+# 캐시 → 프로세스 내 TTL+LRU 1차 캐시 + (선택) Redis 2차 캐시, 네임스페이스/single-flight/지표 포함
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from utils.logger import log
+
+_MISSING = object()
+
+
+@dataclass
+class CacheMetrics:
+    hits: int = 0
+    l2_hits: int = 0
+    misses: int = 0
+    loads: int = 0
+    coalesced: int = 0  # single-flight 로 다른 요청의 계산 결과를 기다린 횟수
+    evictions: int = 0
+    errors: int = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        data = asdict(self)
+        lookups = self.hits + self.l2_hits + self.misses
+        data["hit_rate"] = round((self.hits + self.l2_hits) / lookups, 4) if lookups else 0.0
+        return data
+
+
 class Cache:
-    def get(self, key: str):
-        pass
+    """
+    캐시 인터페이스 (get 은 없으면 default 를 반환).
+    값은 JSON 으로 직렬화 가능한 것만 저장한다 (Redis 와 프로세스 내 캐시가 같은 값을 돌려주도록).
+    """
+
+    def get(self, key: str, default=None):
+        return default
 
     def set(self, key: str, value, ttl: int = 0):
         pass
+
+    def delete(self, key: str) -> None:
+        pass
+
+    def delete_prefix(self, prefix: str) -> None:
+        pass
+
+
+class MemoryCache(Cache):
+    """
+    프로세스 내 TTL+LRU 캐시.
+    항목 수와 (JSON 직렬화 기준) 바이트 수 두 한도를 넘으면 오래 안 쓴 항목부터 내보낸다.
+    """
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 64 * 1024 * 1024, default_ttl: int = 60):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.evictions = 0
+        self._bytes = 0
+        self._entries: "OrderedDict[str, Tuple[float, int, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return len(self._entries)
+
+    @property
+    def bytes(self) -> int:
+        return self._bytes
+
+    def get(self, key: str, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires_at, size, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self._bytes -= size
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value, ttl: int = 0, size: Optional[int] = None):
+        if size is None:
+            size = len(json.dumps(value, ensure_ascii=False, separators=(",", ":")))
+        if size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + (ttl or self.default_ttl)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (expires_at, size, value)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry[1]
+
+    def delete_prefix(self, prefix: str) -> None:
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                self._bytes -= self._entries.pop(key)[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+class RedisCache(Cache):
+    """
+    Redis 2차 캐시 (redis-py 호환 클라이언트, 테스트에서는 fakeredis 사용 가능).
+    Redis 오류는 캐시 미스로 취급해 요청을 실패시키지 않는다.
+    """
+
+    def __init__(self, client, default_ttl: int = 300):
+        self.client = client
+        self.default_ttl = default_ttl
+        self.errors = 0
+
+    def get(self, key: str, default=None):
+        try:
+            raw = self.client.get(key)
+        except Exception as exc:
+            self._error("get", exc)
+            return default
+        return default if raw is None else json.loads(raw)
+
+    def set(self, key: str, value, ttl: int = 0):
+        try:
+            self.client.set(key, json.dumps(value, ensure_ascii=False), ex=ttl or self.default_ttl)
+        except Exception as exc:
+            self._error("set", exc)
+
+    def delete(self, key: str) -> None:
+        try:
+            self.client.delete(key)
+        except Exception as exc:
+            self._error("delete", exc)
+
+    def incr(self, key: str) -> Optional[int]:
+        """정수 카운터 증가 (만료 없음). 실패하면 None"""
+        try:
+            return int(self.client.incr(key))
+        except Exception as exc:
+            self._error("incr", exc)
+            return None
+
+    def delete_prefix(self, prefix: str) -> None:
+        try:
+            batch = []
+            for key in self.client.scan_iter(match=f"{prefix}*", count=500):
+                batch.append(key)
+                if len(batch) >= 500:
+                    self.client.delete(*batch)
+                    batch = []
+            if batch:
+                self.client.delete(*batch)
+        except Exception as exc:
+            self._error("delete_prefix", exc)
+
+    def _error(self, operation: str, exc: Exception) -> None:
+        self.errors += 1
+        log(f"redis cache {operation} failed: {exc}")
+
+
+class TieredCache(Cache):
+    """
+    1차(프로세스 내) → 2차(Redis, 선택) 순으로 찾는 캐시.
+    get_or_set / aget_or_set 은 같은 키의 동시 미스를 한 번의 계산으로 합친다 (single-flight).
+    """
+
+    def __init__(self, l1: MemoryCache, l2: Optional[RedisCache] = None):
+        self.l1 = l1
+        self.l2 = l2
+        self.metrics = CacheMetrics()
+        self._flights: Dict[str, threading.Event] = {}
+        self._flights_lock = threading.Lock()
+        self._async_flights: Dict[str, asyncio.Future] = {}
+        # Redis 가 없을 때의 세대 번호 (LRU 로 밀려나 0 으로 돌아가면 무효화된 항목이 되살아나므로 따로 보관)
+        self._generations: Dict[str, int] = {}
+        self._generations_lock = threading.Lock()
+
+    def _l1_ttl(self, ttl: int) -> int:
+        if self.l2 is None:
+            return ttl or self.l1.default_ttl
+        # 다른 프로세스의 무효화를 놓쳐도 1차 캐시가 오래 틀리지 않도록 2차 TTL 보다 짧게
+        return min(ttl or self.l1.default_ttl, self.l1.default_ttl)
+
+    def lookup(self, key: str) -> Tuple[Any, Optional[str]]:
+        """(값, 찾은 계층 "l1"/"l2") — 없으면 (_MISSING, None)"""
+        value = self.l1.get(key, _MISSING)
+        if value is not _MISSING:
+            self.metrics.hits += 1
+            return value, "l1"
+        if self.l2 is not None:
+            value = self.l2.get(key, _MISSING)
+            if value is not _MISSING:
+                self.metrics.l2_hits += 1
+                self.l1.set(key, value, ttl=self._l1_ttl(0))
+                return value, "l2"
+        self.metrics.misses += 1
+        return _MISSING, None
+
+    def get(self, key: str, default=None):
+        value, _ = self.lookup(key)
+        return default if value is _MISSING else value
+
+    def set(self, key: str, value, ttl: int = 0):
+        try:
+            self.l1.set(key, value, ttl=self._l1_ttl(ttl))
+        except (TypeError, ValueError) as exc:
+            # JSON 으로 표현할 수 없는 값은 캐시하지 않는다
+            self.metrics.errors += 1
+            log(f"cache set skipped for {key}: {exc}")
+            return
+        if self.l2 is not None:
+            self.l2.set(key, value, ttl)
+
+    def delete(self, key: str) -> None:
+        self.l1.delete(key)
+        if self.l2 is not None:
+            self.l2.delete(key)
+
+    def delete_prefix(self, prefix: str) -> None:
+        self.l1.delete_prefix(prefix)
+        if self.l2 is not None:
+            self.l2.delete_prefix(prefix)
+
+    def generation(self, key: str) -> int:
+        """
+        무효화 세대 번호. 캐시 키에 넣어 두면 bump 한 번으로 이전 세대 항목이 모두 조회되지 않는다
+        (SCAN + DELETE 없이 O(1) 무효화, 남은 항목은 TTL/LRU 로 정리).
+        Redis 가 있으면 Redis 값이 기준이고 1차 캐시에는 짧게만 둔다.
+        """
+        if self.l2 is None:
+            return self._generations.get(key, 0)
+        value = self.l1.get(key, _MISSING)
+        if value is _MISSING:
+            value = self.l2.get(key, 0)
+            self.l1.set(key, value, ttl=self._l1_ttl(0))
+        return int(value)
+
+    async def ageneration(self, key: str) -> int:
+        if self.l2 is None:
+            return self.generation(key)
+        value = self.l1.get(key, _MISSING)
+        if value is not _MISSING:
+            return int(value)
+        return await asyncio.to_thread(self.generation, key)
+
+    def bump(self, key: str) -> None:
+        if self.l2 is None:
+            with self._generations_lock:
+                self._generations[key] = self._generations.get(key, 0) + 1
+            return
+        value = self.l2.incr(key)
+        if value is not None:
+            # 이 프로세스는 바로 새 세대를 보도록 (다른 프로세스는 1차 TTL 안에 따라온다)
+            self.l1.set(key, value, ttl=self._l1_ttl(0))
+
+    async def abump(self, key: str) -> None:
+        if self.l2 is None:
+            self.bump(key)
+        else:
+            await asyncio.to_thread(self.bump, key)
+
+    def get_or_set(self, key: str, loader: Callable[[], Any], ttl: int = 0) -> Any:
+        """동기 호출용 single-flight (스레드풀에서 실행되는 엔드포인트)"""
+        while True:
+            value, _ = self.lookup(key)
+            if value is not _MISSING:
+                return value
+            with self._flights_lock:
+                flight = self._flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._flights[key] = threading.Event()
+            if leader:
+                break
+            self.metrics.coalesced += 1
+            flight.wait()
+            # 선행 계산이 끝났으면 캐시에서 다시 읽는다 (실패했으면 이 요청이 계산)
+
+        try:
+            self.metrics.loads += 1
+            value = loader()
+            self.set(key, value, ttl)
+            return value
+        finally:
+            with self._flights_lock:
+                self._flights.pop(key, None)
+            flight.set()
+
+    async def aget_or_set(self, key: str, loader: Callable[[], Awaitable[Any]], ttl: int = 0) -> Any:
+        """async 엔드포인트용 single-flight (Redis 호출은 스레드로 넘겨 이벤트 루프를 막지 않음)"""
+        value = self.l1.get(key, _MISSING)
+        if value is not _MISSING:
+            self.metrics.hits += 1
+            return value
+
+        flight = self._async_flights.get(key)
+        if flight is not None:
+            self.metrics.coalesced += 1
+            return await asyncio.shield(flight)
+
+        flight = asyncio.get_running_loop().create_future()
+        self._async_flights[key] = flight
+        try:
+            if self.l2 is not None:
+                value, _ = await asyncio.to_thread(self.lookup, key)
+            else:
+                self.metrics.misses += 1
+            if value is _MISSING:
+                self.metrics.loads += 1
+                value = await loader()
+                if self.l2 is not None:
+                    await asyncio.to_thread(self.set, key, value, ttl)
+                else:
+                    self.set(key, value, ttl)
+            flight.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except Exception as exc:
+            flight.set_exception(exc)
+            # 기다리는 요청이 없으면 "exception was never retrieved" 경고가 나지 않도록
+            flight.exception()
+            raise
+        finally:
+            self._async_flights.pop(key, None)
+
+    def namespace(self, name: str, default_ttl: int = 0) -> "CacheNamespace":
+        return CacheNamespace(self, name, default_ttl)
+
+    def stats(self) -> Dict[str, Any]:
+        self.metrics.evictions = self.l1.evictions
+        data = self.metrics.snapshot()
+        data.update(entries=self.l1.size, bytes=self.l1.bytes, redis=self.l2 is not None)
+        if self.l2 is not None:
+            data["redis_errors"] = self.l2.errors
+        return data
+
+
+class CacheNamespace:
+    """키 앞에 `{name}:` 을 붙이는 뷰. clear/delete_prefix 는 이 네임스페이스 안에서만 동작한다"""
+
+    def __init__(self, cache: TieredCache, name: str, default_ttl: int = 0):
+        self.cache = cache
+        self.name = name
+        self.default_ttl = default_ttl
+
+    def key(self, *parts: Any) -> str:
+        return ":".join([self.name, *(str(p) for p in parts)])
+
+    def get(self, key: str, default=None):
+        return self.cache.get(self.key(key), default)
+
+    def set(self, key: str, value, ttl: int = 0):
+        self.cache.set(self.key(key), value, ttl or self.default_ttl)
+
+    def delete(self, key: str) -> None:
+        self.cache.delete(self.key(key))
+
+    def delete_prefix(self, prefix: str) -> None:
+        self.cache.delete_prefix(self.key(prefix))
+
+    def generation(self, scope: str) -> int:
+        return self.cache.generation(self.key("gen", scope))
+
+    async def ageneration(self, scope: str) -> int:
+        return await self.cache.ageneration(self.key("gen", scope))
+
+    def bump(self, scope: str) -> None:
+        self.cache.bump(self.key("gen", scope))
+
+    async def abump(self, scope: str) -> None:
+        await self.cache.abump(self.key("gen", scope))
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self.delete(key)
+
+    def clear(self) -> None:
+        self.cache.delete_prefix(f"{self.name}:")
+
+    def get_or_set(self, key: str, loader: Callable[[], Any], ttl: int = 0) -> Any:
+        return self.cache.get_or_set(self.key(key), loader, ttl or self.default_ttl)
+
+    async def aget_or_set(self, key: str, loader: Callable[[], Awaitable[Any]], ttl: int = 0) -> Any:
+        return await self.cache.aget_or_set(self.key(key), loader, ttl or self.default_ttl)
+
+
+def _redis_tier() -> Optional[RedisCache]:
+    url = os.getenv("REDIS_URL")
+    if not url:
+        return None
+    try:
+        import redis
+    except ImportError:
+        log("REDIS_URL is set but redis is not installed; using in-process cache only")
+        return None
+    timeout = float(os.getenv("CACHE_REDIS_TIMEOUT", "0.1"))
+    client = redis.Redis.from_url(url, socket_timeout=timeout, socket_connect_timeout=timeout)
+    return RedisCache(client, default_ttl=int(os.getenv("CACHE_REDIS_TTL", "300")))
+
+
+def build_cache() -> TieredCache:
+    return TieredCache(
+        MemoryCache(
+            max_entries=int(os.getenv("CACHE_MAX_ENTRIES", "10000")),
+            max_bytes=int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+            default_ttl=int(os.getenv("CACHE_DEFAULT_TTL", "60")),
+        ),
+        _redis_tier(),
+    )
+
+
+cache = build_cache()
+
+# 응답 캐시 네임스페이스 (값은 jsonable 응답)
+movie_cache = cache.namespace("movie", int(os.getenv("MOVIE_CACHE_TTL", "60")))
+review_list_cache = cache.namespace("reviews", int(os.getenv("REVIEW_LIST_CACHE_TTL", "30")))
+prediction_cache = cache.namespace("a3", int(os.getenv("PREDICTION_CACHE_TTL", "300")))
+
+
+def _review_list_scopes(movie_id: Optional[int], user_id: Optional[str]) -> List[str]:
+    scopes = []
+    if movie_id is not None:
+        scopes.append(f"movie:{movie_id}")
+    if user_id is not None:
+        scopes.append(f"user:{user_id}")
+    return scopes
+
+
+async def review_list_key(scope: str, *parts: Any) -> str:
+    """리뷰 목록 캐시 키 (scope 의 현재 세대 포함 → 무효화 후에는 이전 키를 더 이상 조회하지 않음)"""
+    generation = await review_list_cache.ageneration(scope)
+    return ":".join([scope, str(generation), *(str(p) for p in parts)])
+
+
+def invalidate_review_lists(movie_id: Optional[int] = None, user_id: Optional[str] = None) -> None:
+    """리뷰/좋아요/댓글 변경 시 해당 영화·사용자의 리뷰 목록 세대를 올린다 (scope 당 INCR 한 번)"""
+    for scope in _review_list_scopes(movie_id, user_id):
+        review_list_cache.bump(scope)
+
+
+async def ainvalidate_review_lists(movie_id: Optional[int] = None, user_id: Optional[str] = None) -> None:
+    """async 엔드포인트용 (Redis 호출은 스레드로 넘겨 이벤트 루프를 막지 않음)"""
+    for scope in _review_list_scopes(movie_id, user_id):
+        await review_list_cache.abump(scope)
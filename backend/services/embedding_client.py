@@ -1,4 +1,242 @@
-# 임베딩 생성 인터페이스 → Bedrock Embeddings(예상)
+# 임베딩 생성 인터페이스 → Bedrock Embeddings(예상), 동시 요청을 micro-batch 로 묶고 float32 로 캐시
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "amazon.titan-embed-text-v2:0")
+EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "1024"))
+BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+BATCH_WAIT_MS = float(os.getenv("EMBEDDING_BATCH_WAIT_MS", "10"))
+CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "50000"))
+
+
+@dataclass
+class EmbeddingMetrics:
+    requests: int = 0  # embed / embed_many 로 들어온 텍스트 수
+    cache_hits: int = 0
+    deduped: int = 0  # 같은 배치 안의 중복이라 보내지 않은 텍스트 수
+    embedded: int = 0  # 실제로 모델에 보낸 텍스트 수
+    batches: int = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["hit_rate"] = round(self.cache_hits / self.requests, 4) if self.requests else 0.0
+        return data
+
+
 class EmbeddingClient:
+    """
+    embed(text) 를 여러 스레드에서 동시에 부르면 batch_size 개 또는 batch_wait_ms 동안 모인 요청을
+    한 번의 _embed_batch 로 처리한다 (먼저 온 요청이 배치를 모으고 실행, 나머지는 결과만 기다림).
+    벡터는 model id + 텍스트 해시로 LRU 캐시하며 float32 로 보관한다.
+    하위 클래스는 _embed_batch 만 구현한다.
+    """
+
+    def __init__(
+        self,
+        model_id: str = EMBEDDING_MODEL,
+        dim: int = EMBEDDING_DIM,
+        batch_size: int = BATCH_SIZE,
+        batch_wait_ms: float = BATCH_WAIT_MS,
+        cache_max_entries: int = CACHE_MAX_ENTRIES,
+    ):
+        self.model_id = model_id
+        self.dim = dim
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait_ms / 1000.0
+        self.cache_max_entries = cache_max_entries
+        self.metrics = EmbeddingMetrics()
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._pending: List[Tuple[str, str, Future]] = []
+        self._inflight: Dict[str, Future] = {}
+        self._batch_cond = threading.Condition()
+
+    # ------------------------------------------------------------------
+    # 캐시
+    # ------------------------------------------------------------------
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_id}\n{self.dim}\n{text}".encode("utf-8")).hexdigest()
+
+    def _cached(self, key: str) -> Optional[np.ndarray]:
+        with self._cache_lock:
+            vector = self._cache.get(key)
+            if vector is not None:
+                self._cache.move_to_end(key)
+            return vector
+
+    def _store(self, key: str, vector: np.ndarray) -> None:
+        vector.setflags(write=False)
+        with self._cache_lock:
+            self._cache[key] = vector
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_max_entries:
+                self._cache.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # 일괄 임베딩
+    # ------------------------------------------------------------------
+
+    def embed_many(self, texts: Sequence[str]) -> np.ndarray:
+        """texts → (N, dim) float32. 캐시에 없는 고유 텍스트만 batch_size 단위로 모델에 보낸다"""
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        misses: Dict[str, List[int]] = {}
+        for i, text in enumerate(texts):
+            key = self._key(text)
+            vector = self._cached(key)
+            if vector is not None:
+                out[i] = vector
+                self.metrics.cache_hits += 1
+            elif key in misses:
+                misses[key].append(i)
+                self.metrics.deduped += 1
+            else:
+                misses[key] = [i]
+        self.metrics.requests += len(texts)
+
+        keys = list(misses)
+        for start in range(0, len(keys), self.batch_size):
+            chunk = keys[start:start + self.batch_size]
+            vectors = np.asarray(
+                self._embed_batch([texts[misses[key][0]] for key in chunk]), dtype=np.float32
+            )
+            self.metrics.batches += 1
+            self.metrics.embedded += len(chunk)
+            for key, vector in zip(chunk, vectors):
+                self._store(key, vector)
+                out[misses[key]] = vector
+        return out
+
     def embed(self, text: str) -> list[float]:
-        pass
+        """동시 호출을 micro-batch 로 합쳐서 처리 (이미 대기/처리 중인 같은 텍스트는 그 결과를 공유)"""
+        key = self._key(text)
+        vector = self._cached(key)
+        if vector is not None:
+            self.metrics.requests += 1
+            self.metrics.cache_hits += 1
+            return vector.tolist()
+
+        leader = False
+        with self._batch_cond:
+            future = self._inflight.get(key)
+            if future is None:
+                future = Future()
+                self._inflight[key] = future
+                self._pending.append((key, text, future))
+                leader = len(self._pending) == 1
+                if len(self._pending) >= self.batch_size:
+                    self._batch_cond.notify_all()
+            else:
+                self.metrics.requests += 1
+                self.metrics.deduped += 1
+        if leader:
+            self._run_pending()
+        return future.result().tolist()
+
+    def _run_pending(self) -> None:
+        deadline = time.monotonic() + self.batch_wait
+        with self._batch_cond:
+            while len(self._pending) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._batch_cond.wait(remaining)
+            batch, self._pending = self._pending[: self.batch_size], self._pending[self.batch_size:]
+            if self._pending:
+                # 넘친 요청은 다음 배치로: 새 리더를 세운다
+                threading.Thread(target=self._run_pending, daemon=True).start()
+        try:
+            vectors = self.embed_many([text for _, text, _ in batch])
+        except Exception as exc:
+            vectors = None
+            error = exc
+        with self._batch_cond:
+            for key, _, _ in batch:
+                self._inflight.pop(key, None)
+        for i, (_, _, future) in enumerate(batch):
+            if vectors is None:
+                future.set_exception(error)
+            else:
+                future.set_result(vectors[i])
+
+    def _embed_batch(self, texts: List[str]) -> np.ndarray:
+        raise NotImplementedError
+
+
+class BedrockEmbeddingClient(EmbeddingClient):
+    """
+    Titan Text Embeddings v2. invoke_model 이 텍스트 하나만 받으므로 배치 안에서는 스레드로 병렬 호출한다.
+    """
+
+    def __init__(self, client=None, max_concurrency: int = 8, **kwargs):
+        super().__init__(**kwargs)
+        if client is None:
+            import boto3
+
+            client = boto3.client("bedrock-runtime", region_name=os.getenv("AWS_REGION", "ap-northeast-2"))
+        self.client = client
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency)
+
+    def _embed_one(self, text: str) -> List[float]:
+        response = self.client.invoke_model(
+            modelId=self.model_id,
+            body=json.dumps({"inputText": text, "dimensions": self.dim, "normalize": True}),
+            accept="application/json",
+            contentType="application/json",
+        )
+        return json.loads(response["body"].read())["embedding"]
+
+    def _embed_batch(self, texts: List[str]) -> np.ndarray:
+        return np.asarray(list(self._executor.map(self._embed_one, texts)), dtype=np.float32)
+
+
+class StubEmbeddingClient(EmbeddingClient):
+    """텍스트 해시를 시드로 한 결정적 단위 벡터 (로컬 개발/검증용). latency 는 배치당 지연"""
+
+    def __init__(self, latency: float = 0.0, **kwargs):
+        super().__init__(**kwargs)
+        self.latency = latency
+        self.batch_sizes: List[int] = []
+
+    @staticmethod
+    def vector(text: str, dim: int) -> np.ndarray:
+        seed = int(hashlib.sha256(text.encode("utf-8")).hexdigest()[:16], 16)
+        vec = np.random.default_rng(seed).standard_normal(dim).astype(np.float32)
+        return vec / np.linalg.norm(vec)
+
+    def _embed_batch(self, texts: List[str]) -> np.ndarray:
+        if self.latency:
+            time.sleep(self.latency)
+        self.batch_sizes.append(len(texts))
+        return np.stack([self.vector(text, self.dim) for text in texts])
+
+
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "bedrock")
+
+_client: Optional[EmbeddingClient] = None
+_client_lock = threading.Lock()
+
+
+def get_embedding_client() -> EmbeddingClient:
+    """프로세스 내 싱글턴 (EMBEDDING_BACKEND=bedrock|stub). 여러 요청이 같은 배치/캐시를 공유해야 한다"""
+    global _client
+    if _client is not None:
+        return _client
+    with _client_lock:
+        if _client is None:
+            if EMBEDDING_BACKEND == "bedrock":
+                _client = BedrockEmbeddingClient()
+            elif EMBEDDING_BACKEND == "stub":
+                _client = StubEmbeddingClient()
+            else:
+                raise ValueError(f"unknown EMBEDDING_BACKEND: {EMBEDDING_BACKEND}")
+        return _client
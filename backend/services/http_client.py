@@ -0,0 +1,57 @@
+# 공용 비동기 HTTP 클라이언트 → 앱 수명 동안 keep-alive 커넥션 풀 공유 (Kakao OAuth 등)
+import importlib.util
+import os
+from typing import Optional
+
+import httpx
+
+MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+
+# 호출부에서 단계별 timeout 을 넘기지 않았을 때의 기본값
+DEFAULT_TIMEOUT = httpx.Timeout(5.0, connect=2.0)
+
+
+def _http2_available() -> bool:
+    """HTTP/2 는 h2 패키지가 있을 때만 켠다 (없으면 HTTP/1.1 keep-alive)"""
+    return importlib.util.find_spec("h2") is not None
+
+
+class SharedHttpClient:
+    """
+    프로세스 전체가 공유하는 httpx.AsyncClient.
+    lifespan 에서 start/close 하고, 시작 전에 호출되면 그 자리에서 만든다.
+    """
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _create(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            http2=_http2_available(),
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            ),
+            timeout=DEFAULT_TIMEOUT,
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = self._create()
+        return self._client
+
+    async def start(self) -> None:
+        if self._client is None or self._client.is_closed:
+            self._client = self._create()
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+http_client = SharedHttpClient()
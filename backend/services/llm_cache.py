@@ -0,0 +1,138 @@
+# LLM 응답 캐시 → 요청 내용 해시를 키로 하는 SQLite 디스크 캐시 (TTL + 용량 한도, 적중률 지표)
+# model_sample/llm_cache.py 는 이 파일의 사본 (키 규칙, 테이블, 기본 경로) → 한쪽을 바꾸면 다른 쪽도 같이 바꾼다
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from services.cache import CacheMetrics
+from utils.logger import log
+
+# 실행 위치(CWD)와 상관없이 model_sample 과 같은 파일 (저장소 루트/model_sample/.cache)
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(_REPO_ROOT, "model_sample", ".cache", "llm_responses.sqlite3"))
+DEFAULT_TTL = int(os.getenv("LLM_CACHE_TTL", str(30 * 24 * 3600)))
+DEFAULT_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+
+
+def cache_key(model_id: str, request: Dict[str, Any]) -> str:
+    """
+    model id + 요청 본문(프롬프트, temperature, max_tokens 등)의 정규화 JSON 을 sha256 으로.
+    model_sample/llm_cache.py 와 같은 규칙이라 두 쪽이 같은 캐시 파일을 공유할 수 있다.
+    """
+    canonical = json.dumps(request, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(f"{model_id}\n{canonical}".encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    content-addressed 응답 캐시. 같은 요청이면 프로세스를 다시 띄워도 모델을 다시 부르지 않는다.
+    만료(TTL)는 읽을 때 확인하고, 전체 크기가 max_bytes 를 넘으면 오래 안 쓴 항목부터 지운다.
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH, ttl: int = DEFAULT_TTL, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.metrics = CacheMetrics()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_responses ("
+            " key TEXT PRIMARY KEY, model_id TEXT NOT NULL, response TEXT NOT NULL,"
+            " size INTEGER NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_responses_accessed ON llm_responses (accessed_at)")
+        # 크기 합계는 메모리에서 갱신 (다른 프로세스가 쓴 양은 다음 실행 때 반영)
+        self._bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_responses").fetchone()[0]
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (self.ttl and row[1] + self.ttl < now):
+                if row is not None:
+                    self._delete(key)
+                    self.metrics.evictions += 1
+                self.metrics.misses += 1
+                return None
+            self._conn.execute("UPDATE llm_responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self.metrics.hits += 1
+            return row[0]
+
+    def set(self, key: str, model_id: str, response: str) -> None:
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._delete(key)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, model_id, response, size, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model_id, response, size, now, now),
+            )
+            self._bytes += size
+            self.metrics.loads += 1
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def _delete(self, key: str) -> None:
+        row = self._conn.execute("SELECT size FROM llm_responses WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            self._conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+            self._bytes -= row[0]
+
+    def _evict(self) -> None:
+        # 한도의 90% 까지 비워서 매번 지우지 않도록
+        target = self._bytes - int(self.max_bytes * 0.9)
+        freed = 0
+        victims = []
+        for key, size in self._conn.execute("SELECT key, size FROM llm_responses ORDER BY accessed_at"):
+            victims.append((key,))
+            freed += size
+            if freed >= target:
+                break
+        self._conn.executemany("DELETE FROM llm_responses WHERE key = ?", victims)
+        self._bytes -= freed
+        self.metrics.evictions += len(victims)
+        log(f"llm cache evicted {len(victims)} entries ({freed} bytes)")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_responses"
+            ).fetchone()
+        return {**self.metrics.snapshot(), "entries": entries, "bytes": total}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_responses")
+            self._bytes = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_shared: Optional[LLMResponseCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """프로세스 공용 캐시 (LLMClient 기본값). LLM_CACHE=0 이면 None"""
+    global _shared
+    if os.getenv("LLM_CACHE", "1") == "0":
+        return None
+    with _shared_lock:
+        if _shared is None:
+            _shared = LLMResponseCache()
+        return _shared
@@ -1,4 +1,91 @@
-# LLM 추상 인터페이스 → Bedrock 호출(예상)
+# LLM 추상 인터페이스 → Bedrock 호출(예상), 응답은 LLMResponseCache 로 디스크 캐시
+import json
+import os
+from typing import Any, Dict, Optional
+
+from services.llm_cache import LLMResponseCache, cache_key, get_llm_cache
+
+LLM_MODEL = os.getenv("LLM_MODEL", "anthropic.claude-3-haiku-20240307-v1:0")
+
+
 class LLMClient:
-    def generate(self, prompt: str) -> str:
-        pass
+    """
+    generate(prompt) 는 같은 (model id, prompt, temperature, max_tokens) 요청이면 캐시된 응답을 돌려준다.
+    캐시에는 invoke_model 응답 본문(JSON 문자열) 그대로 저장한다 → model_sample/llm_cache.py 와 같은 값이라
+    두 쪽이 한 캐시 파일을 공유해도 서로의 항목을 읽을 수 있다.
+    cache 를 주지 않으면 프로세스 공용 캐시(get_llm_cache)를 쓰고, use_cache=False 면 캐시하지 않는다.
+    하위 클래스는 _invoke (요청 본문 → 응답 본문 문자열) 만 구현한다.
+    """
+
+    def __init__(
+        self,
+        model_id: str = LLM_MODEL,
+        temperature: float = 0.3,
+        max_tokens: int = 1000,
+        cache: Optional[LLMResponseCache] = None,
+        use_cache: bool = True,
+    ):
+        self.model_id = model_id
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.cache = (cache or get_llm_cache()) if use_cache else None
+        self.calls = 0
+
+    def request_body(self, prompt: str, temperature: float, max_tokens: int) -> Dict[str, Any]:
+        return {
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": max_tokens,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": temperature,
+        }
+
+    def generate(self, prompt: str, temperature: Optional[float] = None, max_tokens: Optional[int] = None) -> str:
+        body = self.request_body(
+            prompt,
+            self.temperature if temperature is None else temperature,
+            self.max_tokens if max_tokens is None else max_tokens,
+        )
+        key = cache_key(self.model_id, body)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            text = self.completion_text(cached) if cached is not None else None
+            if text is not None:
+                return text
+        response = self._invoke(body)
+        self.calls += 1
+        text = self.completion_text(response)
+        if text is None:
+            raise ValueError(f"unexpected {self.model_id} response: {response[:200]}")
+        if self.cache is not None:
+            self.cache.set(key, self.model_id, response)
+        return text
+
+    @staticmethod
+    def completion_text(response: str) -> Optional[str]:
+        """Anthropic messages 응답 본문 → 생성 텍스트. 형식이 다르면 None (캐시에서는 miss 로 취급)"""
+        try:
+            payload = json.loads(response)
+        except ValueError:
+            return None
+        if not isinstance(payload, dict) or not isinstance(payload.get("content"), list):
+            return None
+        return "".join(part.get("text", "") for part in payload["content"] if isinstance(part, dict))
+
+    def _invoke(self, body: Dict[str, Any]) -> str:
+        raise NotImplementedError
+
+
+class BedrockLLMClient(LLMClient):
+    """bedrock-runtime invoke_model (Anthropic messages 형식)"""
+
+    def __init__(self, client=None, **kwargs):
+        super().__init__(**kwargs)
+        if client is None:
+            import boto3
+
+            client = boto3.client("bedrock-runtime", region_name=os.getenv("AWS_REGION", "ap-northeast-2"))
+        self.client = client
+
+    def _invoke(self, body: Dict[str, Any]) -> str:
+        response = self.client.invoke_model(modelId=self.model_id, body=json.dumps(body))
+        return response["body"].read().decode("utf-8")
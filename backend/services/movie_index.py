@@ -0,0 +1,334 @@
+# 전체 영화 추천 인덱스 → movie_vectors 를 float32 행렬로 메모리에 유지
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from domain.a3_prediction import SCORE_WEIGHTS, MovieMatrix, calculate_satisfaction_matrix
+from domain.taxonomy import load_taxonomy
+from models import Movie, MovieVector
+from repositories.movie_vector import MovieVectorRepository
+from utils.logger import log
+
+ENDING_KEYS = ["happy", "open", "bittersweet"]
+TAG_CATEGORIES = ["emotion_scores", "narrative_traits", "direction_mood", "character_relationship"]
+
+REFRESH_INTERVAL = float(os.getenv("MOVIE_INDEX_REFRESH_INTERVAL", "60"))
+# updated_at 은 트랜잭션 시작 시각(now())이라, 늦게 커밋된 다른 트랜잭션의 행은 워터마크보다 이전 시각을 가질 수 있다.
+# 그만큼 겹쳐서 다시 읽는다 (가장 긴 쓰기 트랜잭션보다 길게)
+WATERMARK_OVERLAP = timedelta(seconds=float(os.getenv("MOVIE_INDEX_WATERMARK_OVERLAP", "300")))
+
+
+@dataclass(frozen=True)
+class _Layout:
+    """taxonomy 로부터 정해지는 열 배치 (emotion ‖ narrative ‖ ending)"""
+    e_keys: Tuple[str, ...]
+    n_keys: Tuple[str, ...]
+    tag_index: Dict[str, int]
+    version: Optional[int]
+
+    @property
+    def blocks(self) -> List[Tuple[int, int]]:
+        e, n = len(self.e_keys), len(self.n_keys)
+        return [(0, e), (e, e + n), (e + n, e + n + len(ENDING_KEYS))]
+
+    def vector(self, profile: Dict) -> np.ndarray:
+        row = [float(profile.get("emotion_scores", {}).get(k, 0.0)) for k in self.e_keys]
+        row += [float(profile.get("narrative_traits", {}).get(k, 0.0)) for k in self.n_keys]
+        row += [float(profile.get("ending_preference", {}).get(k, 0.0)) for k in ENDING_KEYS]
+        return np.asarray(row, dtype=np.float32)
+
+    def tags(self, profile: Dict) -> np.ndarray:
+        """boost/penalty 용: 태그별로 네 카테고리 점수를 합산"""
+        row = np.zeros(len(self.tag_index), dtype=np.float32)
+        for category in TAG_CATEGORIES:
+            for tag, score in (profile.get(category) or {}).items():
+                idx = self.tag_index.get(tag)
+                if idx is not None:
+                    row[idx] += float(score)
+        return row
+
+    def unit_blocks(self, vector: np.ndarray, weights: Sequence[float] = (1.0, 1.0, 1.0)) -> np.ndarray:
+        """
+        블록별 L2 정규화 후 가중치를 곱한다.
+        영화 쪽은 가중치 1, 사용자 쪽은 A-3 가중치로 만들면 내적이 태그 보정 전 A-3 raw 점수와 같다.
+        """
+        out = np.zeros(len(vector), dtype=np.float32)
+        for (lo, hi), weight in zip(self.blocks, weights):
+            norm = np.linalg.norm(vector[lo:hi])
+            if norm > 0:
+                out[lo:hi] = vector[lo:hi] * np.float32(weight / norm)
+        return out
+
+    def norms(self, vectors: np.ndarray) -> np.ndarray:
+        return np.stack(
+            [np.linalg.norm(vectors[:, lo:hi], axis=1) for lo, hi in self.blocks], axis=1
+        ).astype(np.float32)
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+    layout: _Layout
+    movie_ids: np.ndarray  # (M,) int64
+    titles: np.ndarray  # (M,) object
+    vectors: np.ndarray  # (M, E+N+3) float32
+    norms: np.ndarray  # (M, 3) float32, 블록별 L2 norm
+    tags: np.ndarray  # (M, T) float32
+
+    @property
+    def size(self) -> int:
+        return len(self.movie_ids)
+
+    def movie_matrix(self, rows: Optional[np.ndarray] = None) -> MovieMatrix:
+        """calculate_satisfaction_matrix 입력으로 쓸 열 정렬 행렬 (rows 가 없으면 전체, 있으면 그 행만)"""
+        vectors = self.vectors if rows is None else self.vectors[rows]
+        tags = self.tags if rows is None else self.tags[rows]
+        layout = self.layout
+        (e_lo, e_hi), (n_lo, n_hi), (d_lo, d_hi) = layout.blocks
+        return MovieMatrix(
+            keys={
+                "emotion_scores": layout.e_keys,
+                "narrative_traits": layout.n_keys,
+                "ending_preference": tuple(ENDING_KEYS),
+            },
+            blocks={
+                "emotion_scores": vectors[:, e_lo:e_hi],
+                "narrative_traits": vectors[:, n_lo:n_hi],
+                "ending_preference": vectors[:, d_lo:d_hi],
+            },
+            tag_index=layout.tag_index,
+            # 스냅샷은 네 카테고리 점수를 태그별로 미리 합산해 두었다
+            tag_blocks=(tags,),
+            norms={
+                category: (self.norms if rows is None else self.norms[rows])[:, b]
+                for b, category in enumerate(["emotion_scores", "narrative_traits", "ending_preference"])
+            },
+        )
+
+
+def current_layout() -> _Layout:
+    taxonomy = load_taxonomy()
+    all_tags: Dict[str, int] = {}
+    for category in ["emotion", "story_flow", "direction_mood", "character_relationship"]:
+        for tag in taxonomy.tags(category):
+            all_tags.setdefault(tag, len(all_tags))
+    return _Layout(
+        e_keys=tuple(taxonomy.tags("emotion")),
+        n_keys=tuple(taxonomy.tags("story_flow")),
+        tag_index=all_tags,
+        version=taxonomy.version,
+    )
+
+
+def _empty(layout: _Layout) -> _Snapshot:
+    width = layout.blocks[-1][1]
+    return _Snapshot(
+        layout=layout,
+        movie_ids=np.zeros(0, dtype=np.int64),
+        titles=np.zeros(0, dtype=object),
+        vectors=np.zeros((0, width), dtype=np.float32),
+        norms=np.zeros((0, 3), dtype=np.float32),
+        tags=np.zeros((0, len(layout.tag_index)), dtype=np.float32),
+    )
+
+
+class MovieIndex:
+    """
+    movie_vectors 전체를 dense float32 행렬로 들고 있는 top-K 추천 인덱스.
+    갱신은 새 스냅샷을 만들어 교체하므로 검색 중에는 잠금이 필요 없다.
+    """
+
+    def __init__(self, refresh_interval: float = REFRESH_INTERVAL):
+        self.refresh_interval = refresh_interval
+        self._snapshot: Optional[_Snapshot] = None
+        self._watermark: Optional[datetime] = None
+        self._refreshed_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return self._snapshot.size if self._snapshot is not None else 0
+
+    # ------------------------------------------------------------------
+    # 빌드 / 갱신
+    # ------------------------------------------------------------------
+
+    def _load_rows(self, db: Session, since: Optional[datetime] = None):
+        query = db.query(MovieVector, Movie.title).join(Movie, Movie.id == MovieVector.movie_id)
+        if since is not None:
+            # 늦게 커밋된 행을 놓치지 않도록 WATERMARK_OVERLAP 만큼 겹쳐 읽는다 (중복 반영은 무해)
+            query = query.filter(MovieVector.updated_at >= since - WATERMARK_OVERLAP)
+        return query.all()
+
+    def build(self, db: Session) -> None:
+        """movie_vectors 전체로 인덱스를 새로 만든다"""
+        started = time.perf_counter()
+        rows = self._load_rows(db)
+        layout = current_layout()
+        profiles = [MovieVectorRepository.to_profile(vector, title) for vector, title in rows]
+        with self._lock:
+            self._snapshot = self._merge(_empty(layout), profiles, ())
+            self._watermark = max((v.updated_at for v, _ in rows), default=None)
+            self._refreshed_at = time.monotonic()
+        log(f"movie index built: {len(rows)} movies in {time.perf_counter() - started:.3f}s")
+
+    def refresh(self, db: Session) -> None:
+        """마지막 갱신 이후 바뀐 행만 반영하고, 사라진 영화는 제거한다"""
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.layout.version != load_taxonomy().version:
+            self.build(db)
+            return
+
+        rows = self._load_rows(db, since=self._watermark)
+        live_ids = np.array([row[0] for row in db.query(MovieVector.movie_id).all()], dtype=np.int64)
+        removed = snapshot.movie_ids[~np.isin(snapshot.movie_ids, live_ids)].tolist()
+        profiles = [MovieVectorRepository.to_profile(vector, title) for vector, title in rows]
+
+        with self._lock:
+            self._snapshot = self._merge(self._snapshot, profiles, removed)
+            if rows:
+                latest = max(v.updated_at for v, _ in rows)
+                if self._watermark is None or latest > self._watermark:
+                    self._watermark = latest
+            self._refreshed_at = time.monotonic()
+
+    def maybe_refresh(self, db: Session) -> None:
+        if self._snapshot is None:
+            self.build(db)
+        elif time.monotonic() - self._refreshed_at >= self.refresh_interval:
+            self.refresh(db)
+
+    def upsert(self, profile: Dict) -> None:
+        """저장 직후의 프로필을 바로 반영 (다음 refresh 를 기다리지 않음)"""
+        self.upsert_many([profile])
+
+    def upsert_many(self, profiles: Sequence[Dict]) -> None:
+        """일괄 저장분을 스냅샷 한 번 교체로 반영"""
+        with self._lock:
+            if self._snapshot is not None and profiles:
+                self._snapshot = self._merge(self._snapshot, profiles, ())
+
+    def remove(self, movie_id: int) -> None:
+        with self._lock:
+            if self._snapshot is not None:
+                self._snapshot = self._merge(self._snapshot, [], [movie_id])
+
+    @staticmethod
+    def _merge(snapshot: _Snapshot, profiles: Sequence[Dict], removed: Iterable[int]) -> _Snapshot:
+        layout = snapshot.layout
+        drop = set(removed) | {int(p["movie_id"]) for p in profiles}
+        keep = ~np.isin(snapshot.movie_ids, np.fromiter(drop, dtype=np.int64, count=len(drop)))
+
+        movie_ids = snapshot.movie_ids[keep]
+        titles = snapshot.titles[keep]
+        vectors = snapshot.vectors[keep]
+        tags = snapshot.tags[keep]
+
+        if profiles:
+            new_vectors = np.stack([layout.vector(p) for p in profiles])
+            movie_ids = np.concatenate([movie_ids, np.array([int(p["movie_id"]) for p in profiles], dtype=np.int64)])
+            titles = np.concatenate([titles, np.array([p.get("title") or "" for p in profiles], dtype=object)])
+            vectors = np.concatenate([vectors, new_vectors])
+            tags = np.concatenate([tags, np.stack([layout.tags(p) for p in profiles])])
+
+        return _Snapshot(
+            layout=layout,
+            movie_ids=movie_ids,
+            titles=titles,
+            vectors=vectors,
+            norms=layout.norms(vectors),
+            tags=tags,
+        )
+
+    # ------------------------------------------------------------------
+    # 검색
+    # ------------------------------------------------------------------
+
+    def top_k(
+        self,
+        user_profile: Dict,
+        k: int = 20,
+        dislikes: List[str] | None = None,
+        boost_tags: List[str] | None = None,
+        weights: Dict[str, float] | None = None,
+        penalty_weight: float = 0.7,
+        boost_weight: float = 0.5,
+        exclude_movie_ids: Iterable[int] | None = None,
+        candidate_ids: Iterable[int] | None = None,
+    ) -> List[Dict]:
+        """
+        전체 영화에 대해 A-3 점수를 한 번에 계산하고 상위 k 개를 반환.
+        사용자 벡터는 taxonomy 태그 순서로 정렬된다.
+        candidate_ids 가 주어지면 (벡터 검색 후보) 그 영화 행만 모아서 계산한다.
+        """
+        snapshot = self._snapshot
+        if snapshot is None or snapshot.size == 0 or k <= 0:
+            return []
+        layout = snapshot.layout
+
+        # 제외/후보 조건이 있으면 해당 행만 모은다 (없으면 전체 스냅샷을 복사 없이 사용)
+        keep = None
+        if candidate_ids is not None:
+            allowed = np.fromiter((int(m) for m in candidate_ids), dtype=np.int64)
+            keep = np.isin(snapshot.movie_ids, allowed)
+        if exclude_movie_ids:
+            excluded = np.fromiter((int(m) for m in exclude_movie_ids), dtype=np.int64)
+            not_excluded = ~np.isin(snapshot.movie_ids, excluded)
+            keep = not_excluded if keep is None else keep & not_excluded
+        rows = None if keep is None else np.flatnonzero(keep)
+        if rows is not None and rows.size == 0:
+            return []
+
+        # 사용자 벡터도 taxonomy 키만, taxonomy 순서로 (스냅샷과 같은 열)
+        user = layout.vector(user_profile).tolist()
+        (e_lo, e_hi), (n_lo, n_hi), (d_lo, d_hi) = layout.blocks
+        aligned_user = {
+            "emotion_scores": dict(zip(layout.e_keys, user[e_lo:e_hi])),
+            "narrative_traits": dict(zip(layout.n_keys, user[n_lo:n_hi])),
+            "ending_preference": dict(zip(ENDING_KEYS, user[d_lo:d_hi])),
+        }
+        scores = calculate_satisfaction_matrix(
+            [aligned_user],
+            snapshot.movie_matrix(rows),
+            dislikes=[dislikes],
+            boost_tags=[boost_tags],
+            weights=weights,
+            penalty_weight=penalty_weight,
+            boost_weight=boost_weight,
+        )
+        raw = scores["raw_score"][0]
+        sims = np.stack(
+            [scores["emotion_similarity"][0], scores["narrative_similarity"][0], scores["ending_similarity"][0]],
+            axis=1,
+        )
+
+        k = min(k, raw.shape[0])
+        top = np.argpartition(-raw, k - 1)[:k]
+        top = top[np.argsort(-raw[top], kind="stable")]
+
+        results = []
+        for i in top:
+            # raw/sims 는 모은 행 기준 → 스냅샷 행 번호로 되돌린다
+            row = i if rows is None else rows[i]
+            probability = min(1.0, max(0.0, (float(raw[i]) + 1) / 2))
+            results.append(
+                {
+                    "movie_id": int(snapshot.movie_ids[row]),
+                    "title": snapshot.titles[row],
+                    "probability": round(probability, 3),
+                    "match_rate": round(probability * 100, 2),
+                    "raw_score": round(float(raw[i]), 3),
+                    "emotion_similarity": round(float(sims[i, 0]), 3),
+                    "narrative_similarity": round(float(sims[i, 1]), 3),
+                    "ending_similarity": round(float(sims[i, 2]), 3),
+                }
+            )
+        return results
+
+
+movie_index = MovieIndex()
@@ -0,0 +1,66 @@
+# A-2 일괄 벡터화 → JSON 배열/NDJSON 입력을 청크 단위로 처리해 NDJSON 으로 스트리밍
+import json
+import os
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from db import SessionLocal
+from domain.a2_movie_vector import process_movie_vectors
+from services.movie_index import movie_index
+from services.profile_store import profile_store
+from services.vector_store import index_profiles
+from utils.logger import log
+from utils.validator import validate_request
+
+# 청크마다 taxonomy 준비 1번, movie_vectors upsert 1번
+CHUNK_SIZE = int(os.getenv("MOVIE_VECTOR_BATCH_CHUNK", "500"))
+
+
+def iter_ndjson(body: bytes) -> Iterator[str]:
+    """NDJSON 본문을 줄 단위로 (빈 줄 제외)"""
+    for line in body.splitlines():
+        if line.strip():
+            yield line.decode("utf-8")
+
+
+def _vectorize_chunk(chunk: List[Tuple[int, Any]], persist: bool) -> List[str]:
+    """입력 한 건당 결과 한 줄: 성공하면 A-2 프로필, 실패하면 {"index", "error"}"""
+    results: Dict[int, dict] = {}
+    valid: List[Tuple[int, dict]] = []
+    for index, item in chunk:
+        try:
+            valid.append((index, validate_request("a2_movie_vector_request.json", item)))
+        except Exception as exc:
+            results[index] = {"index": index, "error": str(exc)}
+
+    profiles = process_movie_vectors([body for _, body in valid])
+    for (index, _), profile in zip(valid, profiles):
+        results[index] = profile
+
+    if persist and profiles:
+        try:
+            with SessionLocal() as db:
+                stored = profile_store.put_many(db, profiles)
+            movie_index.upsert_many(stored)
+            index_profiles(stored)
+        except Exception as exc:
+            log(f"movie vector batch persist failed: {exc}")
+            for index, _ in valid:
+                results[index] = {"index": index, "error": f"persist failed: {exc}"}
+
+    return [json.dumps(results[index], ensure_ascii=False) + "\n" for index, _ in chunk]
+
+
+async def vectorize_stream(items: Iterable[Any], persist: bool) -> AsyncIterator[str]:
+    """CHUNK_SIZE 건씩 스레드풀에서 처리하고, 처리된 청크부터 바로 내보낸다"""
+    chunk: List[Tuple[int, Any]] = []
+    for index, item in enumerate(items):
+        chunk.append((index, item))
+        if len(chunk) >= CHUNK_SIZE:
+            for line in await run_in_threadpool(_vectorize_chunk, chunk, persist):
+                yield line
+            chunk = []
+    if chunk:
+        for line in await run_in_threadpool(_vectorize_chunk, chunk, persist):
+            yield line
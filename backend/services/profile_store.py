@@ -0,0 +1,159 @@
+# 영화 프로필 저장소 → movie_vectors 테이블 + 프로세스 내 LRU
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session, selectinload
+
+from domain.a2_movie_vector import process_movie_vector
+from models import Movie
+from repositories.movie_vector import PROFILE_FIELDS, MovieVectorRepository
+from services.vector_store import encode_profile
+
+
+def as_movie_id(value: Any) -> Optional[int]:
+    """A-2 payload 의 movie_id("123", 123 등)를 movies.id 로 변환"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value.strip())
+    return None
+
+
+def movie_payload(movie: Movie) -> dict:
+    """movies 행을 A-2 입력 형식으로 변환"""
+    return {
+        "movie_id": movie.id,
+        "title": movie.title,
+        "overview": movie.synopsis or "",
+        "genres": [g.genre for g in movie.genres],
+        "keywords": [t.tag for t in movie.tags],
+    }
+
+
+class MovieProfileStore:
+    """
+    movie_id -> A-2 프로필 조회.
+    LRU(프로세스 내) -> movie_vectors -> movies 행에서 생성 후 저장 순으로 찾는다.
+    반환된 프로필은 캐시와 공유되므로 수정하지 않는다.
+    """
+
+    def __init__(self, max_size: int = 2048, ttl: float = 300.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[int, Tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_cached(self, movie_id: int) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(movie_id)
+            if entry is None:
+                return None
+            expires_at, profile = entry
+            if self.ttl and expires_at < time.monotonic():
+                del self._entries[movie_id]
+                return None
+            self._entries.move_to_end(movie_id)
+            return profile
+
+    def _set_cached(self, movie_id: int, profile: dict) -> None:
+        with self._lock:
+            self._entries[movie_id] = (time.monotonic() + self.ttl, profile)
+            self._entries.move_to_end(movie_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get(self, db: Session, movie_id: int) -> Optional[dict]:
+        return self.get_many(db, [movie_id]).get(movie_id)
+
+    def get_many(self, db: Session, movie_ids: Iterable[int]) -> Dict[int, dict]:
+        found: Dict[int, dict] = {}
+        missing: List[int] = []
+        for movie_id in dict.fromkeys(movie_ids):
+            profile = self._get_cached(movie_id)
+            if profile is None:
+                missing.append(movie_id)
+            else:
+                found[movie_id] = profile
+
+        if missing:
+            stored = MovieVectorRepository(db).get_profiles(missing)
+            missing = [m for m in missing if m not in stored]
+            if missing:
+                stored.update(self._derive(db, missing))
+            for movie_id, profile in stored.items():
+                self._set_cached(movie_id, profile)
+                found[movie_id] = profile
+
+        return found
+
+    def _derive(self, db: Session, movie_ids: List[int]) -> Dict[int, dict]:
+        """저장된 프로필이 없는 영화는 movies 행으로 A-2 를 한 번 계산해 저장"""
+        movies = (
+            db.query(Movie)
+            .options(selectinload(Movie.genres), selectinload(Movie.tags))
+            .filter(Movie.id.in_(movie_ids))
+            .all()
+        )
+        if not movies:
+            return {}
+
+        repo = MovieVectorRepository(db)
+        derived = {}
+        for movie in movies:
+            profile = process_movie_vector(movie_payload(movie))
+            vector = repo.upsert_profile(movie.id, profile, commit=False, vectors=encode_profile(profile))
+            derived[movie.id] = MovieVectorRepository.to_profile(vector, movie.title)
+        db.commit()
+        return derived
+
+    def put(self, db: Session, movie_id: int, profile: dict) -> dict:
+        """A-2 결과를 movie_vectors 에 저장하고 캐시를 갱신"""
+        vector = MovieVectorRepository(db).upsert_profile(movie_id, profile, vectors=encode_profile(profile))
+        stored = MovieVectorRepository.to_profile(vector, profile.get("title"))
+        self._set_cached(movie_id, stored)
+        return stored
+
+    def put_many(self, db: Session, profiles: List[dict]) -> List[dict]:
+        """A-2 결과 여러 건을 한 문장으로 저장 (movies 에 없는 movie_id 는 건너뛴다)"""
+        by_id: Dict[int, dict] = {}
+        for profile in profiles:
+            movie_id = as_movie_id(profile.get("movie_id"))
+            if movie_id is not None:
+                by_id[movie_id] = profile
+        if not by_id:
+            return []
+
+        existing = {row[0] for row in db.query(Movie.id).filter(Movie.id.in_(list(by_id))).all()}
+        stored = []
+        for movie_id, profile in by_id.items():
+            if movie_id not in existing:
+                continue
+            row = {"movie_id": movie_id, "title": profile.get("title") or ""}
+            for field in PROFILE_FIELDS:
+                row[field] = dict(profile.get(field) or {})
+            row["embedding"] = list(profile.get("embedding") or [])
+            stored.append(row)
+
+        MovieVectorRepository(db).bulk_upsert_profiles(stored, [encode_profile(p) for p in stored])
+        for profile in stored:
+            self._set_cached(profile["movie_id"], profile)
+        return stored
+
+    def invalidate(self, movie_id: int) -> None:
+        with self._lock:
+            self._entries.pop(movie_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+profile_store = MovieProfileStore(
+    max_size=int(os.getenv("MOVIE_PROFILE_CACHE_SIZE", "2048")),
+    ttl=float(os.getenv("MOVIE_PROFILE_CACHE_TTL", "300")),
+)
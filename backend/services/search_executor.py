@@ -0,0 +1,89 @@
+# A-5 하이브리드 쿼리 실행 → 검색 클러스터 없이 로컬 벡터 인덱스에서 filtered kNN
+from typing import Dict, List
+
+from sqlalchemy.orm import Session, selectinload
+
+from models import Movie
+from services.vector_store import FIELDS, get_vector_store
+
+# knn.field(OpenSearch 필드명) → 벡터 스토어 필드
+_FIELD_BY_COLUMN = {field.column: name for name, field in FIELDS.items()}
+
+
+def parse_filters(clauses: List[Dict]) -> Dict:
+    """
+    bool.filter 절 → VectorStore filters.
+    지원: genres 의 term/terms (한 절), release_year 의 range (gte/gt/lte/lt, 여러 절이면 교집합)
+    """
+    filters: Dict = {}
+    for clause in clauses:
+        if "terms" in clause or "term" in clause:
+            (name, values), = (clause.get("terms") or clause.get("term")).items()
+            if name != "genres":
+                raise ValueError(f"unsupported filter field: {name}")
+            if "genres" in filters:
+                raise ValueError("only one genres filter is supported")
+            filters["genres"] = list(values) if isinstance(values, list) else [values]
+        elif "range" in clause:
+            (name, bounds), = clause["range"].items()
+            if name != "release_year":
+                raise ValueError(f"unsupported range field: {name}")
+            lower = [bounds["gte"]] if "gte" in bounds else []
+            lower += [bounds["gt"] + 1] if "gt" in bounds else []
+            upper = [bounds["lte"]] if "lte" in bounds else []
+            upper += [bounds["lt"] - 1] if "lt" in bounds else []
+            for year in lower:
+                filters["year_from"] = max(year, filters.get("year_from", year))
+            for year in upper:
+                filters["year_to"] = min(year, filters.get("year_to", year))
+        else:
+            raise ValueError(f"unsupported filter clause: {sorted(clause)}")
+    return filters
+
+
+def execute_hybrid_query(hybrid_query: Dict, db: Session) -> List[Dict]:
+    """
+    emotional_search 의 hybrid_query 를 실행해 점수순 영화 목록을 반환.
+    필터(장르 비트맵, 개봉 연도)를 먼저 적용하고 knn.num_candidates 만큼 후보를 본 뒤 상위 k 개를 고른다.
+    """
+    knn = hybrid_query["knn"]
+    field = _FIELD_BY_COLUMN.get(knn["field"])
+    if field is None:
+        raise ValueError(f"unknown knn field: {knn['field']}")
+    bool_query = hybrid_query.get("query", {}).get("bool", {})
+    if bool_query.get("must"):
+        raise ValueError("full-text must clauses are not supported by the local executor")
+
+    hits = get_vector_store(field).search(
+        knn["query_vector"],
+        top_k=knn["k"],
+        filters=parse_filters(bool_query.get("filter") or []),
+        num_candidates=knn.get("num_candidates"),
+    )
+    if not hits:
+        return []
+
+    movies = {
+        movie.id: movie
+        for movie in db.query(Movie)
+        .options(selectinload(Movie.genres))
+        .filter(Movie.id.in_([hit["movie_id"] for hit in hits]))
+        .all()
+    }
+    results = []
+    for hit in hits:
+        movie = movies.get(hit["movie_id"])
+        if movie is None:
+            # 인덱스 갱신 전에 삭제된 영화
+            continue
+        results.append(
+            {
+                "movie_id": movie.id,
+                "title": movie.title,
+                "score": hit["score"],
+                "release_year": movie.release.year if movie.release else None,
+                "genres": [g.genre for g in movie.genres],
+                "poster_url": movie.poster_url,
+            }
+        )
+    return results
@@ -1,4 +1,523 @@
-# 벡터 DB 인터페이스 → OpenSearch/pgvector(예상)
+# 벡터 DB 인터페이스 → pgvector(HNSW) 또는 NumPy 메모리 백엔드로 movie_vectors 근사 최근접 검색
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import bindparam, exists, extract, func, select, update
+from sqlalchemy.orm import Session
+
+from db import SessionLocal
+from domain.a3_prediction import SCORE_WEIGHTS
+from models import Movie, MovieGenre, MovieVector
+from services.movie_index import WATERMARK_OVERLAP, current_layout
+from utils.logger import log
+
+# auto: PostgreSQL 이면 pgvector, 아니면 메모리
+VECTOR_STORE_BACKEND = os.getenv("VECTOR_STORE_BACKEND", "auto")
+REFRESH_INTERVAL = float(os.getenv("VECTOR_STORE_REFRESH_INTERVAL", "60"))
+HNSW_EF_SEARCH = int(os.getenv("PGVECTOR_EF_SEARCH", "100"))
+# pgvector 0.8+: 필터 때문에 결과가 k 개보다 모자라면 인덱스를 더 훑는다 (빈 값이면 끔)
+HNSW_ITERATIVE_SCAN = os.getenv("PGVECTOR_ITERATIVE_SCAN", "relaxed_order")
+
+
+@dataclass(frozen=True)
+class VectorField:
+    """movie_vectors 의 벡터 컬럼 하나 (metric: cosine | ip)"""
+    name: str
+    column: str
+    metric: str
+
+    @property
+    def dim(self) -> int:
+        return MovieVector.__table__.c[self.column].type.dim
+
+    def layout_dim(self) -> int:
+        """현재 taxonomy 로 인코딩했을 때의 차원 (hot reload 로 태그 수가 바뀌면 dim 과 달라진다)"""
+        blocks = current_layout().blocks
+        return blocks[0][1] if self.name == "emotion" else blocks[-1][1]
+
+
+FIELDS = {
+    # A-5 감성 검색: 감정 점수끼리 cosine
+    "emotion": VectorField("emotion", "emotion_vector", "cosine"),
+    # 추천: 블록 정규화 벡터 내적 = A-3 raw 점수 (태그 보정 전)
+    "profile": VectorField("profile", "profile_vector", "ip"),
+}
+
+
+def encode_profile(profile: Dict) -> Dict[str, Optional[List[float]]]:
+    """A-2 프로필 → 벡터 컬럼 값. taxonomy 차원이 컬럼과 다르면 None (마이그레이션 전까지 검색 제외)"""
+    layout = current_layout()
+    vector = layout.vector(profile)
+    lo, hi = layout.blocks[0]
+    encoded = {
+        FIELDS["emotion"].column: vector[lo:hi],
+        FIELDS["profile"].column: layout.unit_blocks(vector),
+    }
+    columns = {}
+    for field in FIELDS.values():
+        value = encoded[field.column]
+        columns[field.column] = value.tolist() if len(value) == field.dim else None
+    return columns
+
+
+def recommendation_query(user_profile: Dict, weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+    """사용자 프로필 → "profile" 필드 질의 벡터 (A-3 가중치를 블록에 곱해 둔다)"""
+    layout = current_layout()
+    weights = weights or SCORE_WEIGHTS
+    return layout.unit_blocks(
+        layout.vector(user_profile),
+        (weights.get("emotion", 0.5), weights.get("narrative", 0.3), weights.get("ending", 0.2)),
+    )
+
+
+def _release_year(release) -> int:
+    return release.year if release is not None else 0
+
+
 class VectorStore:
-    def search(self, vector: list[float], top_k: int = 5) -> list[dict]:
-        pass
+    """
+    영화 벡터 검색 공통 인터페이스.
+
+    search 의 filters: genres(하나라도 일치), year_from/year_to(개봉 연도), exclude_movie_ids
+    num_candidates: 근사 검색에서 top_k 를 고르기 전에 살펴볼 후보 수 (OpenSearch knn 과 같은 의미)
+    upsert 의 item: {"movie_id", "vector", "genres"?, "release_year"?}
+    결과: [{"movie_id", "score"}] (score 가 클수록 가깝다)
+    """
+
+    backend = ""
+
+    def __init__(self, field: VectorField, session_factory: Callable[[], Session] = SessionLocal):
+        self.field = field
+        self.session_factory = session_factory
+        self._mismatch_logged: Optional[int] = None
+
+    def search(
+        self,
+        vector: Sequence[float],
+        top_k: int = 5,
+        filters: Optional[Dict] = None,
+        num_candidates: Optional[int] = None,
+    ) -> List[Dict]:
+        raise NotImplementedError
+
+    def upsert(self, items: Iterable[Dict]) -> int:
+        raise NotImplementedError
+
+    def delete(self, movie_ids: Iterable[int]) -> int:
+        raise NotImplementedError
+
+    def matches_taxonomy(self) -> bool:
+        """
+        컬럼 차원이 현재 taxonomy 와 같은지. 다르면 (마이그레이션 전) 인덱스가 비어 있으므로
+        호출부는 movie_index 전체 탐색으로 대신한다. 불일치는 차원 조합마다 한 번만 로그를 남긴다.
+        """
+        live = self.field.layout_dim()
+        if live == self.field.dim:
+            return True
+        if self._mismatch_logged != live:
+            self._mismatch_logged = live
+            log(f"vector store '{self.field.name}' disabled: column dim {self.field.dim} != taxonomy dim {live}")
+        return False
+
+    def _query_vector(self, vector: Sequence[float]) -> Optional[np.ndarray]:
+        query = np.asarray(vector, dtype=np.float32)
+        if query.shape != (self.field.dim,):
+            log(f"vector store '{self.field.name}' skipped: query has {query.size} dims, column has {self.field.dim}")
+            return None
+        if self.field.metric == "cosine":
+            norm = np.linalg.norm(query)
+            if norm == 0:
+                return None
+            query = query / norm
+        return query
+
+
+@dataclass(frozen=True)
+class _Rows:
+    movie_ids: np.ndarray  # (M,) int64
+    vectors: np.ndarray  # (M, D) float32, cosine 이면 행 단위 정규화
+    genre_index: Dict[str, int]  # 장르 → genre_bits 열
+    genre_bits: np.ndarray  # (M, G) bool, 장르별 비트맵
+    years: np.ndarray  # (M,) int32, 0 = 개봉일 미상
+
+    @classmethod
+    def empty(cls, dim: int) -> "_Rows":
+        return cls(
+            movie_ids=np.zeros(0, dtype=np.int64),
+            vectors=np.zeros((0, dim), dtype=np.float32),
+            genre_index={},
+            genre_bits=np.zeros((0, 0), dtype=bool),
+            years=np.zeros(0, dtype=np.int32),
+        )
+
+
+class InMemoryVectorStore(VectorStore):
+    """
+    NumPy float32 행렬 전체 탐색 (로컬/테스트용, 결과는 정확한 top-k).
+    movie_vectors 의 JSONB 프로필에서 직접 인코딩하므로 벡터 컬럼이 비어 있는 DB 에서도 동작한다.
+    갱신은 새 스냅샷으로 교체하므로 검색 중에는 잠금이 필요 없다.
+    주기적 갱신은 movie_index 처럼 updated_at 이후 바뀐 행만 반영하고, 한 요청만 수행한다 (나머지는 기존 스냅샷 사용).
+    """
+
+    backend = "memory"
+
+    def __init__(
+        self,
+        field: VectorField,
+        session_factory: Callable[[], Session] = SessionLocal,
+        refresh_interval: float = REFRESH_INTERVAL,
+    ):
+        super().__init__(field, session_factory)
+        self.refresh_interval = refresh_interval
+        self._rows: Optional[_Rows] = None
+        self._version: Optional[int] = None
+        self._watermark: Optional[datetime] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return len(self._rows.movie_ids) if self._rows is not None else 0
+
+    def _load_items(self, db: Session, since: Optional[datetime] = None):
+        """(인코딩된 item 목록, 인코딩할 수 없는 movie id 목록, 최신 updated_at)"""
+        query = db.query(MovieVector, Movie.release).join(Movie, Movie.id == MovieVector.movie_id)
+        if since is not None:
+            # movie_index 와 같이, 늦게 커밋된 행을 놓치지 않도록 WATERMARK_OVERLAP 만큼 겹쳐 읽는다 (중복 반영은 무해)
+            query = query.filter(MovieVector.updated_at >= since - WATERMARK_OVERLAP)
+        rows = query.all()
+        genre_query = db.query(MovieGenre.movie_id, MovieGenre.genre)
+        if since is not None:
+            genre_query = genre_query.filter(MovieGenre.movie_id.in_([vector.movie_id for vector, _ in rows]))
+        genres: Dict[int, set] = {}
+        for movie_id, genre in genre_query.all():
+            genres.setdefault(movie_id, set()).add(genre)
+
+        items, unencodable = [], []
+        for vector, release in rows:
+            encoded = encode_profile({
+                "emotion_scores": vector.emotion_scores or {},
+                "narrative_traits": vector.narrative_traits or {},
+                "ending_preference": vector.ending_preference or {},
+            })[self.field.column]
+            if encoded is None:
+                unencodable.append(vector.movie_id)
+                continue
+            items.append({
+                "movie_id": vector.movie_id,
+                "vector": encoded,
+                "genres": genres.get(vector.movie_id, ()),
+                "release_year": _release_year(release),
+            })
+        watermark = max((vector.updated_at for vector, _ in rows), default=None)
+        return items, unencodable, watermark
+
+    def load(self, db: Session) -> None:
+        """movie_vectors 전체로 다시 만든다"""
+        started = time.perf_counter()
+        version = current_layout().version
+        items, _, watermark = self._load_items(db)
+        with self._lock:
+            self._rows = self._merge(_Rows.empty(self.field.dim), items, ())
+            self._version = version
+            self._watermark = watermark
+            self._loaded_at = time.monotonic()
+        log(f"vector store '{self.field.name}' loaded: {len(items)} movies in {time.perf_counter() - started:.3f}s")
+
+    def refresh(self, db: Session) -> None:
+        """마지막 갱신 이후 바뀐 행만 반영하고, 사라진 영화는 제거한다 (taxonomy 가 바뀌었으면 전체 재로딩)"""
+        if self._rows is None or self._version != current_layout().version:
+            self.load(db)
+            return
+        items, unencodable, watermark = self._load_items(db, since=self._watermark)
+        live_ids = np.array([row[0] for row in db.query(MovieVector.movie_id).all()], dtype=np.int64)
+        with self._lock:
+            rows = self._rows
+            removed = rows.movie_ids[~np.isin(rows.movie_ids, live_ids)].tolist() + unencodable
+            if items or removed:
+                self._rows = self._merge(rows, items, removed)
+            if watermark is not None and (self._watermark is None or watermark > self._watermark):
+                self._watermark = watermark
+            self._loaded_at = time.monotonic()
+
+    def _current(self) -> _Rows:
+        if self._rows is None:
+            with self._refresh_lock:
+                if self._rows is None:
+                    with self.session_factory() as db:
+                        self.load(db)
+            return self._rows
+
+        if time.monotonic() - self._loaded_at >= self.refresh_interval and self._refresh_lock.acquire(blocking=False):
+            try:
+                with self.session_factory() as db:
+                    self.refresh(db)
+            except Exception as exc:
+                # 갱신 실패는 다음 주기에 다시 시도하고 이번 요청은 기존 스냅샷으로 응답
+                self._loaded_at = time.monotonic()
+                log(f"vector store '{self.field.name}' refresh failed: {exc}")
+            finally:
+                self._refresh_lock.release()
+        return self._rows
+
+    def upsert(self, items: Iterable[Dict]) -> int:
+        items = list(items)
+        with self._lock:
+            if self._rows is not None and items:
+                self._rows = self._merge(self._rows, items, ())
+        return len(items)
+
+    def delete(self, movie_ids: Iterable[int]) -> int:
+        movie_ids = list(movie_ids)
+        with self._lock:
+            if self._rows is not None:
+                self._rows = self._merge(self._rows, [], movie_ids)
+        return len(movie_ids)
+
+    def _merge(self, rows: _Rows, items: Sequence[Dict], removed: Iterable[int]) -> _Rows:
+        updated = {int(item["movie_id"]): item for item in items}
+        updated_ids = np.fromiter(updated, dtype=np.int64, count=len(updated))
+        drop = set(removed) | set(updated)
+        keep = ~np.isin(rows.movie_ids, np.fromiter(drop, dtype=np.int64, count=len(drop)))
+
+        genre_index = dict(rows.genre_index)
+        for item in updated.values():
+            for genre in item.get("genres") or ():
+                genre_index.setdefault(genre, len(genre_index))
+        genre_bits = rows.genre_bits
+        if len(genre_index) > genre_bits.shape[1]:
+            genre_bits = np.pad(genre_bits, ((0, 0), (0, len(genre_index) - genre_bits.shape[1])))
+
+        # 메타데이터 없이 벡터만 들어오면 기존 값을 유지 (새 영화는 다음 load 까지 장르/연도 미상)
+        previous = {int(rows.movie_ids[i]): i for i in np.flatnonzero(np.isin(rows.movie_ids, updated_ids))}
+        movie_ids = [rows.movie_ids[keep]]
+        vectors = [rows.vectors[keep]]
+        bits = [genre_bits[keep]]
+        years = [rows.years[keep]]
+        if updated:
+            new_vectors = np.asarray([item["vector"] for item in updated.values()], dtype=np.float32)
+            if self.field.metric == "cosine":
+                norms = np.linalg.norm(new_vectors, axis=1, keepdims=True)
+                np.divide(new_vectors, norms, out=new_vectors, where=norms > 0)
+            new_bits = np.zeros((len(updated), len(genre_index)), dtype=bool)
+            new_years = np.zeros(len(updated), dtype=np.int32)
+            for i, (movie_id, item) in enumerate(updated.items()):
+                old = previous.get(movie_id)
+                if "genres" in item:
+                    new_bits[i, [genre_index[g] for g in item["genres"]]] = True
+                elif old is not None:
+                    new_bits[i] = genre_bits[old]
+                new_years[i] = item.get("release_year") or (rows.years[old] if old is not None else 0)
+            movie_ids.append(updated_ids)
+            vectors.append(new_vectors)
+            bits.append(new_bits)
+            years.append(new_years)
+
+        return _Rows(
+            movie_ids=np.concatenate(movie_ids),
+            vectors=np.concatenate(vectors),
+            genre_index=genre_index,
+            genre_bits=np.concatenate(bits),
+            years=np.concatenate(years),
+        )
+
+    @staticmethod
+    def _mask(rows: _Rows, filters: Dict) -> Optional[np.ndarray]:
+        mask = None
+
+        def narrow(condition: np.ndarray) -> None:
+            nonlocal mask
+            mask = condition if mask is None else mask & condition
+
+        if filters.get("genres"):
+            columns = [rows.genre_index[g] for g in filters["genres"] if g in rows.genre_index]
+            narrow(rows.genre_bits[:, columns].any(axis=1))
+        if filters.get("year_from") is not None:
+            narrow(rows.years >= int(filters["year_from"]))
+        if filters.get("year_to") is not None:
+            narrow((rows.years > 0) & (rows.years <= int(filters["year_to"])))
+        if filters.get("exclude_movie_ids"):
+            excluded = np.fromiter((int(m) for m in filters["exclude_movie_ids"]), dtype=np.int64)
+            narrow(~np.isin(rows.movie_ids, excluded))
+        return mask
+
+    def search(
+        self,
+        vector: Sequence[float],
+        top_k: int = 5,
+        filters: Optional[Dict] = None,
+        num_candidates: Optional[int] = None,
+    ) -> List[Dict]:
+        """필터를 먼저 적용(pre-filter)한 뒤 남은 행만 점수를 계산한다. 전체 탐색이라 num_candidates 는 쓰지 않는다"""
+        query = self._query_vector(vector)
+        rows = self._current()
+        if query is None or top_k <= 0 or len(rows.movie_ids) == 0:
+            return []
+
+        mask = self._mask(rows, filters or {})
+        candidates = np.flatnonzero(mask) if mask is not None else np.arange(len(rows.movie_ids))
+        k = min(top_k, len(candidates))
+        if k == 0:
+            return []
+        scores = rows.vectors[candidates] @ query
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [
+            {"movie_id": int(rows.movie_ids[candidates[i]]), "score": round(float(scores[i]), 4)}
+            for i in top
+        ]
+
+
+class PgVectorStore(VectorStore):
+    """
+    movie_vectors 의 pgvector 컬럼 + HNSW 인덱스로 근사 검색.
+    벡터는 MovieVectorRepository.upsert_profile 이 프로필과 같은 트랜잭션에서 쓴다.
+    """
+
+    backend = "pgvector"
+
+    @property
+    def _column(self):
+        return getattr(MovieVector, self.field.column)
+
+    def search(
+        self,
+        vector: Sequence[float],
+        top_k: int = 5,
+        filters: Optional[Dict] = None,
+        num_candidates: Optional[int] = None,
+    ) -> List[Dict]:
+        """num_candidates 는 HNSW 후보 리스트 크기(ef_search)로 쓴다"""
+        query = self._query_vector(vector)
+        if query is None or top_k <= 0:
+            return []
+        filters = filters or {}
+        column = self._column
+        if self.field.metric == "cosine":
+            distance = column.cosine_distance(query.tolist())
+            score = 1 - distance
+        else:
+            # <#> 는 음의 내적
+            distance = column.max_inner_product(query.tolist())
+            score = -distance
+
+        stmt = select(MovieVector.movie_id, score.label("score")).where(column.isnot(None))
+        if filters.get("year_from") is not None or filters.get("year_to") is not None:
+            year = extract("year", Movie.release)
+            stmt = stmt.join(Movie, Movie.id == MovieVector.movie_id)
+            if filters.get("year_from") is not None:
+                stmt = stmt.where(year >= int(filters["year_from"]))
+            if filters.get("year_to") is not None:
+                stmt = stmt.where(year <= int(filters["year_to"]))
+        if filters.get("genres"):
+            stmt = stmt.where(
+                exists().where(
+                    MovieGenre.movie_id == MovieVector.movie_id,
+                    MovieGenre.genre.in_(list(filters["genres"])),
+                )
+            )
+        if filters.get("exclude_movie_ids"):
+            stmt = stmt.where(MovieVector.movie_id.notin_([int(m) for m in filters["exclude_movie_ids"]]))
+        stmt = stmt.order_by(distance).limit(top_k)
+
+        with self.session_factory() as db:
+            # 트랜잭션 범위 설정 (set_config(..., true) == SET LOCAL)
+            ef_search = max(num_candidates or HNSW_EF_SEARCH, top_k)
+            db.execute(select(func.set_config("hnsw.ef_search", str(ef_search), True)))
+            if HNSW_ITERATIVE_SCAN:
+                db.execute(select(func.set_config("hnsw.iterative_scan", HNSW_ITERATIVE_SCAN, True)))
+            rows = db.execute(stmt).all()
+        # relaxed_order 는 순서가 약간 어긋날 수 있어 다시 정렬
+        rows.sort(key=lambda row: row.score, reverse=True)
+        return [{"movie_id": row.movie_id, "score": round(float(row.score), 4)} for row in rows]
+
+    def upsert(self, items: Iterable[Dict]) -> int:
+        """벡터 컬럼만 일괄 갱신 (movie_vectors 행이 있는 영화만 반영된다)"""
+        params = [
+            {"b_movie_id": int(item["movie_id"]), "b_vector": np.asarray(item["vector"], dtype=np.float32).tolist()}
+            for item in items
+        ]
+        if not params:
+            return 0
+        table = MovieVector.__table__
+        stmt = (
+            update(table)
+            .where(table.c.movie_id == bindparam("b_movie_id"))
+            .values({self.field.column: bindparam("b_vector")})
+        )
+        with self.session_factory() as db:
+            result = db.execute(stmt, params)
+            db.commit()
+        return result.rowcount
+
+    def delete(self, movie_ids: Iterable[int]) -> int:
+        ids = [int(m) for m in movie_ids]
+        if not ids:
+            return 0
+        table = MovieVector.__table__
+        with self.session_factory() as db:
+            result = db.execute(
+                update(table).where(table.c.movie_id.in_(ids)).values({self.field.column: None})
+            )
+            db.commit()
+        return result.rowcount
+
+
+_stores: Dict[str, VectorStore] = {}
+_stores_lock = threading.Lock()
+
+
+def _backend() -> str:
+    if VECTOR_STORE_BACKEND != "auto":
+        return VECTOR_STORE_BACKEND
+    with SessionLocal() as db:
+        return "pgvector" if db.get_bind().dialect.name == "postgresql" else "memory"
+
+
+def get_vector_store(name: str) -> VectorStore:
+    """필드별 벡터 스토어 (프로세스 내 싱글턴, 첫 호출 시 백엔드 결정)"""
+    store = _stores.get(name)
+    if store is not None:
+        return store
+    with _stores_lock:
+        if name not in _stores:
+            backend = _backend()
+            if backend == "pgvector":
+                _stores[name] = PgVectorStore(FIELDS[name])
+            elif backend == "memory":
+                _stores[name] = InMemoryVectorStore(FIELDS[name])
+            else:
+                raise ValueError(f"unknown VECTOR_STORE_BACKEND: {backend}")
+        return _stores[name]
+
+
+def index_profile(profile: Dict) -> None:
+    """저장 직후의 프로필을 메모리 스토어에 바로 반영 (pgvector 는 저장 시 이미 반영됨)"""
+    index_profiles([profile])
+
+
+def index_profiles(profiles: Sequence[Dict]) -> None:
+    encoded = [
+        (int(p["movie_id"]), encode_profile(p)) for p in profiles if p.get("movie_id") is not None
+    ]
+    for store in list(_stores.values()):
+        if not isinstance(store, InMemoryVectorStore):
+            continue
+        column = store.field.column
+        store.upsert(
+            {"movie_id": movie_id, "vector": columns[column]}
+            for movie_id, columns in encoded
+            if columns[column] is not None
+        )
+
+
+def remove_movie(movie_id: int) -> None:
+    for store in list(_stores.values()):
+        if isinstance(store, InMemoryVectorStore):
+            store.delete([movie_id])
@@ -0,0 +1,44 @@
+# 커서(keyset) 페이지네이션용 불투명 커서 인코딩
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional
+
+from utils.errors import ValidationError
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+
+def _from_json(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+    return value
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """정렬 키 값들 -> URL-safe 문자열"""
+    raw = json.dumps([_to_json(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], size: int) -> Optional[List[Any]]:
+    """encode_cursor 의 역변환. 형식이 맞지 않으면 ValidationError"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(values, list) or len(values) != size:
+            raise ValueError("cursor size mismatch")
+        return [_from_json(v) for v in values]
+    except (ValueError, TypeError) as exc:
+        raise ValidationError("Invalid cursor") from exc
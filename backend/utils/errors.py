@@ -1,5 +1,5 @@
 # 공통 예외 정의
-class ValidationError(Exception):
+class ValidationError(ValueError):
     pass
 
 class DomainError(Exception):
@@ -0,0 +1,74 @@
+# 다중 키워드 매칭 (Aho-Corasick) → 입력을 한 번만 훑어 모든 키워드 위치를 찾는다
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple
+
+
+class Match(NamedTuple):
+    start: int
+    end: int  # exclusive, text[start:end] == keyword
+    keyword: str
+
+
+class KeywordMatcher:
+    """
+    키워드 집합으로 한 번 만들어 두고 재사용하는 Aho-Corasick 오토마톤.
+    문자 단위로 동작하므로 한글 부분 문자열("무서" in "무섭거나")도 `in` 과 같은 결과를 낸다.
+    겹치는 매칭과 같은 키워드의 반복 등장도 모두 반환한다.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = list(dict.fromkeys(k for k in keywords if k))
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[str]] = [[]]
+        for keyword in self.keywords:
+            self._insert(keyword)
+        self._link()
+
+    def _insert(self, keyword: str) -> None:
+        state = 0
+        for char in keyword:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = nxt
+        self._output[state].append(keyword)
+
+    def _link(self) -> None:
+        """BFS 로 failure link 를 잇고, 출력을 failure 쪽 상태의 출력과 합친다"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._output[nxt] = self._output[nxt] + self._output[self._fail[nxt]]
+
+    def find_all(self, text: str) -> List[Match]:
+        """모든 매칭을 끝 위치 순으로 반환 (같은 끝 위치면 긴 키워드 먼저)"""
+        matches: List[Match] = []
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for i, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for keyword in output[state]:
+                matches.append(Match(i + 1 - len(keyword), i + 1, keyword))
+        return matches
+
+    def found(self, text: str) -> Dict[str, int]:
+        """등장한 키워드 → 첫 등장 위치 (str.find 와 같은 값)"""
+        first: Dict[str, int] = {}
+        for match in self.find_all(text):
+            # 같은 키워드는 길이가 같으므로 끝 위치 순서 = 시작 위치 순서
+            first.setdefault(match.keyword, match.start)
+        return first
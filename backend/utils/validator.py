@@ -1,18 +1,62 @@
 import json
-from typing import Any, Dict
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+import fastjsonschema
+
+from utils.errors import ValidationError
+
+SCHEMA_DIR = Path(__file__).resolve().parents[1] / "schemas"
+
+# 스키마 파일명 -> 컴파일된 검증 함수
+_validators: Dict[str, Callable[[Any], Any]] = {}
+
+
+def _compile(schema_name: str) -> Callable[[Any], Any]:
+    with (SCHEMA_DIR / schema_name).open("r", encoding="utf-8") as f:
+        return fastjsonschema.compile(json.load(f))
+
+
+def get_validator(schema_name: str) -> Callable[[Any], Any]:
+    """
+    스키마 이름으로 컴파일된 검증 함수를 반환 (없으면 컴파일 후 캐시)
+    """
+    validator = _validators.get(schema_name)
+    if validator is None:
+        try:
+            validator = _compile(schema_name)
+        except FileNotFoundError as exc:
+            raise ValidationError(f"Unknown schema: {schema_name}") from exc
+        _validators[schema_name] = validator
+    return validator
+
+
+def _compile_all() -> None:
+    for path in sorted(SCHEMA_DIR.glob("*.json")):
+        _validators[path.name] = _compile(path.name)
+
+
+# import 시점에 모든 스키마를 한 번만 컴파일
+_compile_all()
+
 
 # JSON Schema 검증
 def validate_request(schema_name: str, body: Any) -> Dict[str, Any]:
     """
-    JSON Schema 검증 (구현은 단순 타입 체크)
+    JSON Schema 검증 (schemas/ 의 스키마를 컴파일해 적용)
     """
     if isinstance(body, str):
         try:
             body = json.loads(body)
         except json.JSONDecodeError as exc:
-            raise ValueError("Request body must be JSON object") from exc
+            raise ValidationError("Request body must be JSON object") from exc
 
     if not isinstance(body, dict):
-        raise ValueError("Request body must be JSON object")
+        raise ValidationError("Request body must be JSON object")
+
+    try:
+        get_validator(schema_name)(body)
+    except fastjsonschema.JsonSchemaException as exc:
+        raise ValidationError(exc.message) from exc
 
-    return body
\ No newline at end of file
+    return body
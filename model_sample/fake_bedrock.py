@@ -0,0 +1,103 @@
+"""
+로컬 Bedrock 스텁 (AWS 호출 없이 movie_a_2 파이프라인 실행/부하 테스트용)
+bedrock-runtime 클라이언트의 invoke_model 만 흉내 낸다.
+"""
+
+import hashlib
+import io
+import json
+import os
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Dict, Optional
+
+import numpy as np
+from botocore.exceptions import ClientError
+
+
+def _score(text: str, tag: str) -> float:
+    h = hashlib.sha256((text + '||' + tag).encode('utf-8')).hexdigest()
+    return round(int(h[:8], 16) / 0xFFFFFFFF, 3)
+
+
+class FakeBedrockClient:
+    """
+    지연 시간, 서비스 측 초당 호출 한도(모델별), 일시적 오류 비율을 설정할 수 있는 가짜 클라이언트.
+
+    - latency: 호출당 지연(초), jitter 비율만큼 흔들림
+    - max_rps: 모델별 1초 슬라이딩 윈도 한도. 넘으면 ThrottlingException
+    - error_rate: 이 확률로 ServiceUnavailableException
+    """
+
+    def __init__(
+        self,
+        latency: float = 1.5,
+        jitter: float = 0.2,
+        max_rps: Optional[float] = None,
+        error_rate: float = 0.0,
+        taxonomy: Optional[Dict] = None,
+        seed: int = 0,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.max_rps = max_rps
+        self.error_rate = error_rate
+        if taxonomy is None:
+            path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'emotion_tag.json')
+            with open(path, 'r', encoding='utf-8') as f:
+                taxonomy = json.load(f)
+        self.taxonomy = taxonomy
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._recent = defaultdict(deque)
+        self.calls = defaultdict(int)
+        self.throttled = defaultdict(int)
+        self.errors = defaultdict(int)
+
+    def _admit(self, model_id: str) -> Optional[str]:
+        """한도 초과/일시 오류면 에러 코드를 반환"""
+        with self._lock:
+            now = time.monotonic()
+            recent = self._recent[model_id]
+            while recent and now - recent[0] >= 1.0:
+                recent.popleft()
+            if self.max_rps is not None and len(recent) >= self.max_rps:
+                self.throttled[model_id] += 1
+                return 'ThrottlingException'
+            recent.append(now)
+            self.calls[model_id] += 1
+            if self._rng.random() < self.error_rate:
+                self.errors[model_id] += 1
+                return 'ServiceUnavailableException'
+            delay = self.latency * (1 + self._rng.uniform(-self.jitter, self.jitter))
+        time.sleep(max(0.0, delay))
+        return None
+
+    def invoke_model(self, modelId: str, body: str, **kwargs) -> Dict:
+        code = self._admit(modelId)
+        if code is not None:
+            raise ClientError({'Error': {'Code': code, 'Message': 'fake bedrock'}}, 'InvokeModel')
+
+        request = json.loads(body)
+        if 'inputText' in request:
+            payload = {'embedding': self._embedding(request['inputText'], request.get('dimensions', 1024))}
+        else:
+            payload = {'content': [{'type': 'text', 'text': json.dumps(self._analysis(request), ensure_ascii=False)}]}
+        return {'body': io.BytesIO(json.dumps(payload, ensure_ascii=False).encode('utf-8'))}
+
+    def _analysis(self, request: Dict) -> Dict:
+        prompt = request['messages'][0]['content']
+        result = {}
+        for category in ['emotion', 'story_flow', 'direction_mood', 'character_relationship']:
+            tags = self.taxonomy.get(category, {}).get('tags', [])
+            result[category] = {'scores': {tag: _score(prompt, tag) for tag in tags}}
+        result['ending_preference'] = {key: _score(prompt, 'ending_' + key) for key in ['happy', 'open', 'bittersweet']}
+        return result
+
+    @staticmethod
+    def _embedding(text: str, dimensions: int) -> list:
+        seed = int(hashlib.sha256(text.encode('utf-8')).hexdigest()[:8], 16)
+        vec = np.random.default_rng(seed).standard_normal(dimensions)
+        return (vec / np.linalg.norm(vec)).round(6).tolist()
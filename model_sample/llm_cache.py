@@ -0,0 +1,162 @@
+"""
+Bedrock 응답 디스크 캐시 (backend/services/llm_cache.py 와 같은 키 규칙/테이블/기본 경로)
+backend 파일의 사본이므로 키 규칙, 테이블 구조, 기본 경로를 바꿀 때는 두 파일을 함께 고친다.
+같은 modelId + 요청 본문(프롬프트, temperature, max_tokens ...)이면 invoke_model 을 다시 부르지 않는다.
+
+사용: client = with_llm_cache(boto3.client('bedrock-runtime', ...))
+환경 변수: LLM_CACHE=0 (끄기), LLM_CACHE_PATH, LLM_CACHE_TTL(초), LLM_CACHE_MAX_BYTES
+"""
+
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'llm_responses.sqlite3')
+
+
+def cache_key(model_id: str, request: Dict) -> str:
+    canonical = json.dumps(request, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(f"{model_id}\n{canonical}".encode('utf-8')).hexdigest()
+
+
+class LLMResponseCache:
+    """SQLite 캐시. TTL 은 읽을 때 확인, 용량을 넘으면 오래 안 쓴 항목부터 한도의 90% 까지 삭제"""
+
+    def __init__(self, path: str = DEFAULT_PATH, ttl: int = 30 * 24 * 3600, max_bytes: int = 512 * 1024 * 1024):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS llm_responses ('
+            ' key TEXT PRIMARY KEY, model_id TEXT NOT NULL, response TEXT NOT NULL,'
+            ' size INTEGER NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS ix_llm_responses_accessed ON llm_responses (accessed_at)')
+        self._bytes = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM llm_responses').fetchone()[0]
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT response, created_at FROM llm_responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None or (self.ttl and row[1] + self.ttl < now):
+                if row is not None:
+                    self._delete(key)
+                    self.evictions += 1
+                self.misses += 1
+                return None
+            self._conn.execute('UPDATE llm_responses SET accessed_at = ? WHERE key = ?', (now, key))
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, model_id: str, response: str) -> None:
+        now = time.time()
+        size = len(response.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._delete(key)
+            self._conn.execute(
+                'INSERT OR REPLACE INTO llm_responses (key, model_id, response, size, created_at, accessed_at)'
+                ' VALUES (?, ?, ?, ?, ?, ?)',
+                (key, model_id, response, size, now, now),
+            )
+            self._bytes += size
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def _delete(self, key: str) -> None:
+        row = self._conn.execute('SELECT size FROM llm_responses WHERE key = ?', (key,)).fetchone()
+        if row is not None:
+            self._conn.execute('DELETE FROM llm_responses WHERE key = ?', (key,))
+            self._bytes -= row[0]
+
+    def _evict(self) -> None:
+        target = self._bytes - int(self.max_bytes * 0.9)
+        freed = 0
+        victims = []
+        for key, size in self._conn.execute('SELECT key, size FROM llm_responses ORDER BY accessed_at'):
+            victims.append((key,))
+            freed += size
+            if freed >= target:
+                break
+        self._conn.executemany('DELETE FROM llm_responses WHERE key = ?', victims)
+        self._bytes -= freed
+        self.evictions += len(victims)
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'bytes': self._bytes,
+        }
+
+
+def _usable(request: Dict, cached: str) -> bool:
+    """캐시 값이 이 요청의 응답 본문 형식인지 (예전 backend 가 생성 텍스트만 저장한 항목은 miss 로 취급)"""
+    try:
+        payload = json.loads(cached)
+    except ValueError:
+        return False
+    if not isinstance(payload, dict):
+        return False
+    if 'messages' in request:
+        return isinstance(payload.get('content'), list)
+    return True
+
+
+class CachedBedrockClient:
+    """
+    bedrock-runtime 클라이언트 래퍼. 성공한 invoke_model 응답 본문만 저장한다 (오류는 캐시하지 않음).
+    backend/services/llm_client.py 도 같은 응답 본문을 저장하므로 캐시 파일을 공유할 수 있다.
+    그 밖의 속성은 감싼 클라이언트로 넘긴다.
+    """
+
+    def __init__(self, client, cache: LLMResponseCache):
+        self.client = client
+        self.cache = cache
+        self.calls = 0
+
+    def invoke_model(self, **kwargs):
+        model_id = kwargs['modelId']
+        request = json.loads(kwargs['body'])
+        key = cache_key(model_id, request)
+        cached = self.cache.get(key)
+        if cached is None or not _usable(request, cached):
+            response = self.client.invoke_model(**kwargs)
+            self.calls += 1
+            cached = response['body'].read().decode('utf-8')
+            self.cache.set(key, model_id, cached)
+        return {'body': io.BytesIO(cached.encode('utf-8')), 'contentType': 'application/json'}
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+def with_llm_cache(client, path: Optional[str] = None):
+    """환경 변수 설정에 따라 캐시를 씌운 클라이언트 (None 이나 LLM_CACHE=0 이면 그대로)"""
+    if client is None or isinstance(client, CachedBedrockClient) or os.getenv('LLM_CACHE', '1') == '0':
+        return client
+    cache = LLMResponseCache(
+        path or os.getenv('LLM_CACHE_PATH', DEFAULT_PATH),
+        ttl=int(os.getenv('LLM_CACHE_TTL', str(30 * 24 * 3600))),
+        max_bytes=int(os.getenv('LLM_CACHE_MAX_BYTES', str(512 * 1024 * 1024))),
+    )
+    return CachedBedrockClient(client, cache)
@@ -0,0 +1,181 @@
+"""
+LLM 일괄 처리 파이프라인 (movie_a_2 프로필 추출용)
+- 동시 실행 수 제한 (스레드 풀, boto3 클라이언트는 스레드 간 공유 가능)
+- 모델(단계)별 초당 호출 한도 (토큰 버킷)
+- 일시 오류는 지수 백오프 + full jitter 로 재시도
+- 완료된 항목은 JSONL 체크포인트에 바로 기록 → 중단 후 재실행하면 남은 항목만 처리
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+RETRYABLE_CODES = {
+    'ThrottlingException',
+    'TooManyRequestsException',
+    'ServiceUnavailableException',
+    'ModelTimeoutException',
+    'InternalServerException',
+    'ModelNotReadyException',
+}
+
+
+class RateLimiter:
+    """초당 rate 개의 토큰 버킷. acquire() 는 토큰이 생길 때까지 대기"""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_for = (1 - self._tokens) / self.rate
+            time.sleep(wait_for)
+
+
+def is_retryable(exc: Exception) -> bool:
+    response = getattr(exc, 'response', None)
+    if isinstance(response, dict):
+        return response.get('Error', {}).get('Code') in RETRYABLE_CODES
+    # botocore 연결/타임아웃 계열
+    return type(exc).__name__ in {'EndpointConnectionError', 'ConnectTimeoutError', 'ReadTimeoutError'}
+
+
+class ResilientBedrockClient:
+    """
+    bedrock-runtime 클라이언트 래퍼. invoke_model 에 모델별 rate limit 과 재시도를 붙인다.
+    movie_a_2.build_profile 에 그대로 넘길 수 있다.
+    """
+
+    def __init__(
+        self,
+        client,
+        rate_limits: Optional[Dict[str, float]] = None,
+        max_attempts: int = 6,
+        base_delay: float = 0.5,
+        max_delay: float = 20.0,
+    ):
+        self.client = client
+        self.limiters = {model: RateLimiter(rps) for model, rps in (rate_limits or {}).items() if rps}
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retries = 0
+        self._local = threading.local()
+
+    def invoke_model(self, **kwargs):
+        limiter = self.limiters.get(kwargs.get('modelId'))
+        for attempt in range(self.max_attempts):
+            if limiter is not None:
+                limiter.acquire()
+            try:
+                return self.client.invoke_model(**kwargs)
+            except Exception as exc:
+                if not is_retryable(exc) or attempt == self.max_attempts - 1:
+                    # 호출부(analyze_with_llm 등)는 예외를 삼키고 fallback 하므로 실패 여부를 따로 기록
+                    self._local.failed = True
+                    raise
+                self.retries += 1
+                time.sleep(random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt)))
+
+    def call_tracked(self, fn: Callable, *args, **kwargs) -> Tuple[Any, bool]:
+        """fn 실행 중 Bedrock 호출이 최종 실패했는지 함께 반환 (같은 스레드 기준)"""
+        self._local.failed = False
+        result = fn(*args, **kwargs)
+        return result, not self._local.failed
+
+
+class Checkpoint:
+    """완료 항목을 한 줄씩 추가하는 JSONL 파일 ({"key": ..., "result": ...})"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.results: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            valid_end = 0
+            with open(path, 'rb') as f:
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        # 기록 도중 중단된 마지막 줄
+                        break
+                    valid_end += len(line)
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    self.results[record['key']] = record['result']
+            # 잘린 꼬리를 지워야 다음 기록이 그 뒤에 붙어 함께 버려지지 않는다
+            with open(path, 'r+b') as f:
+                f.truncate(valid_end)
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def add(self, key: str, result: Any) -> None:
+        with self._lock:
+            self._file.write(json.dumps({'key': key, 'result': result}, ensure_ascii=False) + '\n')
+            self._file.flush()
+            self.results[key] = result
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def run_pipeline(
+    items: Iterable[Any],
+    worker: Callable[[Any], Tuple[Any, bool]],
+    key: Callable[[Any], Any],
+    concurrency: int = 8,
+    checkpoint: Optional[Checkpoint] = None,
+    progress: Optional[Callable[[int, int, Any], None]] = None,
+) -> List[Any]:
+    """
+    worker(item) -> (result, ok) 를 최대 concurrency 개 동시에 실행하고 입력 순서대로 결과를 반환.
+    ok 인 결과만 체크포인트에 남기므로, 실패(fallback) 항목은 다음 실행에서 다시 처리된다.
+    """
+    items = list(items)
+    results: List[Any] = [None] * len(items)
+    pending = []
+    for i, item in enumerate(items):
+        k = str(key(item))
+        if checkpoint is not None and k in checkpoint.results:
+            results[i] = checkpoint.results[k]
+        else:
+            pending.append(i)
+
+    done_count = len(items) - len(pending)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        in_flight = {}
+        queue = iter(pending)
+        while True:
+            # 대기열 전체를 한 번에 제출하지 않고 동시 실행 수의 2배까지만 유지
+            for i in queue:
+                in_flight[executor.submit(worker, items[i])] = i
+                if len(in_flight) >= concurrency * 2:
+                    break
+            if not in_flight:
+                break
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                i = in_flight.pop(future)
+                result, ok = future.result()
+                results[i] = result
+                if ok and checkpoint is not None:
+                    checkpoint.add(str(key(items[i])), result)
+                done_count += 1
+                if progress is not None:
+                    progress(done_count, len(items), items[i])
+    return results
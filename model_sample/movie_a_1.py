@@ -5,6 +5,8 @@ import json
 from typing import Dict, List
 
 import movie_a_2
+from keyword_matcher import KeywordMatcher
+from llm_cache import with_llm_cache
 
 
 # 사용자 텍스트에서 취향 프로필 생성 (더미 버전)
@@ -124,12 +126,12 @@ def extract_negative_filters_with_llm(user_text: str, bedrock_client=None) -> Di
     
     # Bedrock 클라이언트 생성
     if bedrock_client is None:
-        bedrock_client = boto3.client(
+        bedrock_client = with_llm_cache(boto3.client(
             'bedrock-runtime',
             region_name=os.getenv('AWS_REGION', 'ap-northeast-2'),
             aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
             aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY')
-        )
+        ))
     
     # 프롬프트 생성
     prompt = f"""당신은 영화 추천 시스템의 사용자 의도 파서입니다.
@@ -205,6 +207,63 @@ def extract_negative_filters_with_llm(user_text: str, bedrock_client=None) -> Di
         return detect_negation_fallback(user_text)
 
 
+NEGATION_KEYWORDS = [
+    "싫어", "제외", "말고", "빼고", "아니", "안", "싫다", 
+    "NO", "No", "싫고", "제거", "거부", "없이", "빼"
+]
+POSITIVE_KEYWORDS = [
+    "좋아", "추천", "원해", "보고싶", "찾", "선호", "좋다", "원함"
+]
+
+GENRE_MAP = {
+    "무서": "Horror",
+    "공포": "Horror",
+    "호러": "Horror",
+    "스릴": "Thriller",
+    "액션": "Action",
+    "코미디": "Comedy",
+    "코메디": "Comedy",
+    "로맨": "Romance",
+    "드라마": "Drama",
+    "SF": "SF",
+    "애니": "Animation",
+    "판타지": "Fantasy",
+    "다큐": "Documentary",
+}
+TAG_MAP = {
+    "무서": "무서워요",
+    "공포": "무서워요",
+    "소름": "소름 돋아요",
+    "슬프": "슬퍼요",
+    "우울": "우울해요",
+    "긴장": "긴장돼요",
+    "감동": "감동적이에요",
+    "어두": "어두운 분위기예요",
+    "반전": "반전이 많아요",
+    "웃": "웃겨요",
+    "밝": "밝은 분위기예요",
+    "잔인": "잔인해요",
+    "폭력": "폭력적이에요",
+}
+
+# 부정어/긍정어/장르/태그 키워드를 한 오토마톤으로 (사전이 커져도 문장당 한 번 훑기)
+_NEGATION_MATCHER = KeywordMatcher(
+    NEGATION_KEYWORDS + POSITIVE_KEYWORDS + list(GENRE_MAP) + list(TAG_MAP)
+)
+_NEGATIONS = set(NEGATION_KEYWORDS)
+_POSITIVES = set(POSITIVE_KEYWORDS)
+_GENRE_ORDER = {keyword: i for i, keyword in enumerate(GENRE_MAP)}
+_TAG_ORDER = {keyword: i for i, keyword in enumerate(TAG_MAP)}
+
+
+def _collect(keywords, keyword_map: Dict[str, str], order: Dict[str, int], target: List[str]) -> None:
+    """매칭된 키워드의 값을 사전 순서대로 (중복 없이) 추가"""
+    for keyword in sorted((k for k in keywords if k in keyword_map), key=order.get):
+        value = keyword_map[keyword]
+        if value not in target:
+            target.append(value)
+
+
 def detect_negation_fallback(text: str) -> Dict:
     """
     LLM 실패 시 백업용 규칙 기반 부정어 검출 (개선 v3)
@@ -215,51 +274,15 @@ def detect_negation_fallback(text: str) -> Dict:
     - 부정어/긍정어 키워드 확장
     - 더 정확한 문맥 파싱
     
+    키워드 검사는 Aho-Corasick 매처로 문장마다 한 번만 훑고,
+    결과(순서 포함)는 키워드별 `in` 검사와 같다.
+    
     Args:
         text: 사용자 입력
     
     Returns:
         필터 딕셔너리
     """
-    NEGATION_KEYWORDS = [
-        "싫어", "제외", "말고", "빼고", "아니", "안", "싫다", 
-        "NO", "No", "싫고", "제거", "거부", "없이", "빼"
-    ]
-    POSITIVE_KEYWORDS = [
-        "좋아", "추천", "원해", "보고싶", "찾", "선호", "좋다", "원함"
-    ]
-    
-    GENRE_MAP = {
-        "무서": "Horror",
-        "공포": "Horror",
-        "호러": "Horror",
-        "스릴": "Thriller",
-        "액션": "Action",
-        "코미디": "Comedy",
-        "코메디": "Comedy",
-        "로맨": "Romance",
-        "드라마": "Drama",
-        "SF": "SF",
-        "애니": "Animation",
-        "판타지": "Fantasy",
-        "다큐": "Documentary",
-    }
-    TAG_MAP = {
-        "무서": "무서워요",
-        "공포": "무서워요",
-        "소름": "소름 돋아요",
-        "슬프": "슬퍼요",
-        "우울": "우울해요",
-        "긴장": "긴장돼요",
-        "감동": "감동적이에요",
-        "어두": "어두운 분위기예요",
-        "반전": "반전이 많아요",
-        "웃": "웃겨요",
-        "밝": "밝은 분위기예요",
-        "잔인": "잔인해요",
-        "폭력": "폭력적이에요",
-    }
-    
     exclude_genres = []
     exclude_tags = []
     include_genres = []
@@ -277,71 +300,43 @@ def detect_negation_fallback(text: str) -> Dict:
         if not sentence:
             continue
         
-        has_negation = any(neg in sentence for neg in NEGATION_KEYWORDS)
-        has_positive = any(pos in sentence for pos in POSITIVE_KEYWORDS)
+        matches = _NEGATION_MATCHER.find_all(sentence)
+        # 키워드별 첫 등장 위치 (str.find)
+        found = {}
+        for m in matches:
+            found.setdefault(m.keyword, m.start)
+        neg_positions = [pos for keyword, pos in found.items() if keyword in _NEGATIONS]
+        pos_positions = [pos for keyword, pos in found.items() if keyword in _POSITIVES]
+        has_negation = bool(neg_positions)
+        has_positive = bool(pos_positions)
         
         # 케이스 1: 부정어만 있음 → 제외 목록
         if has_negation and not has_positive:
-            # 개선: 부분 매칭으로 모든 키워드 검사
-            for keyword, genre in GENRE_MAP.items():
-                # "무서" in "무섭거나" → True
-                if keyword in sentence and genre not in exclude_genres:
-                    exclude_genres.append(genre)
-            
-            for keyword, tag in TAG_MAP.items():
-                if keyword in sentence and tag not in exclude_tags:
-                    exclude_tags.append(tag)
+            # 부분 매칭: "무서" in "무섭거나" → True
+            _collect(found, GENRE_MAP, _GENRE_ORDER, exclude_genres)
+            _collect(found, TAG_MAP, _TAG_ORDER, exclude_tags)
         
         # 케이스 2: 긍정어만 있음 → 포함 목록
         elif has_positive and not has_negation:
-            for keyword, genre in GENRE_MAP.items():
-                if keyword in sentence and genre not in include_genres:
-                    include_genres.append(genre)
-            
-            for keyword, tag in TAG_MAP.items():
-                if keyword in sentence and tag not in include_tags:
-                    include_tags.append(tag)
+            _collect(found, GENRE_MAP, _GENRE_ORDER, include_genres)
+            _collect(found, TAG_MAP, _TAG_ORDER, include_tags)
         
         # 케이스 3: 부정어와 긍정어 둘 다 있음 (복잡)
         # "A 말고 B" → A 제외, B 포함
         elif has_negation and has_positive:
-            # 부정어 위치 찾기
-            neg_positions = []
-            for neg in NEGATION_KEYWORDS:
-                if neg in sentence:
-                    pos = sentence.find(neg)
-                    if pos != -1:
-                        neg_positions.append(pos)
+            min_neg_pos = min(neg_positions)
+            max_pos_pos = max(pos_positions)
             
-            # 긍정어 위치 찾기
-            pos_positions = []
-            for pos in POSITIVE_KEYWORDS:
-                if pos in sentence:
-                    pos_idx = sentence.find(pos)
-                    if pos_idx != -1:
-                        pos_positions.append(pos_idx)
+            # 부정어 앞 부분 sentence[:min_neg_pos] → 제외 (부분 매칭)
+            before_neg = {m.keyword for m in matches if m.end <= min_neg_pos}
+            _collect(before_neg, GENRE_MAP, _GENRE_ORDER, exclude_genres)
+            _collect(before_neg, TAG_MAP, _TAG_ORDER, exclude_tags)
             
-            if neg_positions and pos_positions:
-                min_neg_pos = min(neg_positions)
-                max_pos_pos = max(pos_positions)
-                
-                # 부정어 앞 부분 → 제외 (부분 매칭)
-                before_neg = sentence[:min_neg_pos]
-                for keyword, genre in GENRE_MAP.items():
-                    if keyword in before_neg and genre not in exclude_genres:
-                        exclude_genres.append(genre)
-                for keyword, tag in TAG_MAP.items():
-                    if keyword in before_neg and tag not in exclude_tags:
-                        exclude_tags.append(tag)
-                
-                # 긍정어 주변 부분 → 포함 (부분 매칭)
-                around_pos = sentence[max_pos_pos-10:max_pos_pos+20]
-                for keyword, genre in GENRE_MAP.items():
-                    if keyword in around_pos and genre not in include_genres:
-                        include_genres.append(genre)
-                for keyword, tag in TAG_MAP.items():
-                    if keyword in around_pos and tag not in include_tags:
-                        include_tags.append(tag)
+            # 긍정어 주변 부분 sentence[max_pos_pos-10:max_pos_pos+20] → 포함 (슬라이스 규칙 그대로)
+            lo, hi, _ = slice(max_pos_pos - 10, max_pos_pos + 20).indices(len(sentence))
+            around_pos = {m.keyword for m in matches if m.start >= lo and m.end <= hi}
+            _collect(around_pos, GENRE_MAP, _GENRE_ORDER, include_genres)
+            _collect(around_pos, TAG_MAP, _TAG_ORDER, include_tags)
     
     # 포함 목록에 있는 것은 제외 목록에서 제거
     exclude_genres = [g for g in exclude_genres if g not in include_genres]
@@ -432,12 +427,12 @@ def analyze_user_preference_with_llm(user_text: str, taxonomy: Dict, bedrock_cli
     # Bedrock 클라이언트 생성
     if bedrock_client is None:
         try:
-            bedrock_client = boto3.client(
+            bedrock_client = with_llm_cache(boto3.client(
                 'bedrock-runtime',
                 region_name=os.getenv('AWS_REGION', 'ap-northeast-2'),
                 aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
                 aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY')
-            )
+            ))
         except Exception as e:
             print(f"⚠️ Bedrock 클라이언트 생성 실패: {e}")
             print("   → 키워드 매칭으로 대체")
@@ -8,6 +8,9 @@ from typing import Dict, List
 import boto3
 from dotenv import load_dotenv
 
+from llm_cache import with_llm_cache
+from llm_pipeline import Checkpoint, ResilientBedrockClient, run_pipeline
+
 # .env 파일에서 환경 변수 로드
 load_dotenv()
 
@@ -29,8 +32,8 @@ def stable_score(text: str, tag: str) -> float:
     return round(v, 3)
 
 # AWS Bedrock 클라이언트 초기화
-def get_bedrock_client():
-    """AWS Bedrock Runtime 클라이언트를 생성합니다."""
+def get_bedrock_client(cache: bool = True):
+    """AWS Bedrock Runtime 클라이언트를 생성합니다. cache=True 면 응답 디스크 캐시(llm_cache)를 씌웁니다."""
     try:
         bedrock_runtime = boto3.client(
             service_name='bedrock-runtime',
@@ -38,7 +41,7 @@ def get_bedrock_client():
             aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
             aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY')
         )
-        return bedrock_runtime
+        return with_llm_cache(bedrock_runtime) if cache else bedrock_runtime
     except Exception as e:
         print(f"Bedrock 클라이언트 초기화 실패: {e}")
         return None
@@ -340,6 +343,16 @@ def main():
     parser.add_argument('--movie-id', type=int, default=None)
     parser.add_argument('--output', default=None)
     parser.add_argument('--pretty', action='store_true')
+    parser.add_argument('--concurrency', type=int, default=8, help='동시에 처리할 영화 수')
+    parser.add_argument('--llm-rps', type=float, default=None, help='태그 추출 LLM 초당 호출 한도')
+    parser.add_argument('--embedding-rps', type=float, default=None, help='Titan 임베딩 초당 호출 한도')
+    parser.add_argument('--max-attempts', type=int, default=6, help='일시 오류 시 최대 시도 횟수')
+    parser.add_argument('--checkpoint', default=None, help='완료 프로필을 기록할 JSONL (재실행 시 이어서 처리)')
+    parser.add_argument('--fake-bedrock', action='store_true', help='AWS 대신 로컬 스텁 사용')
+    parser.add_argument('--fake-latency', type=float, default=1.5)
+    parser.add_argument('--fake-max-rps', type=float, default=None)
+    parser.add_argument('--fake-error-rate', type=float, default=0.0)
+    parser.add_argument('--llm-cache', default=None, help='응답 캐시 SQLite 경로 (--fake-bedrock 은 지정할 때만 캐시)')
     args = parser.parse_args()
 
     # 경로 처리
@@ -360,7 +373,27 @@ def main():
         return
     
     # Bedrock 클라이언트 생성 (Client 재사용)
-    bedrock_client = get_bedrock_client()
+    if args.fake_bedrock:
+        from fake_bedrock import FakeBedrockClient
+        bedrock_client = FakeBedrockClient(
+            latency=args.fake_latency,
+            max_rps=args.fake_max_rps,
+            error_rate=args.fake_error_rate,
+            taxonomy=taxonomy,
+        )
+    else:
+        bedrock_client = get_bedrock_client(cache=False)
+    llm_cache = None
+    if bedrock_client is not None:
+        bedrock_client = ResilientBedrockClient(
+            bedrock_client,
+            rate_limits={LLM_MODEL: args.llm_rps, EMBEDDING_MODEL: args.embedding_rps},
+            max_attempts=args.max_attempts,
+        )
+        # 캐시를 가장 바깥에 둬서 캐시 적중은 rate limit 토큰을 쓰지 않도록
+        if args.llm_cache or not args.fake_bedrock:
+            bedrock_client = with_llm_cache(bedrock_client, args.llm_cache)
+            llm_cache = getattr(bedrock_client, 'cache', None)
 
     if args.movie_id is not None:
         movies = [m for m in movies if m.get('id') == args.movie_id]
@@ -369,11 +402,31 @@ def main():
         movies = movies[: args.limit]
 
     # 프로필 생성 (bedrock_client 전달)
-    profiles = []
-    print(f"Processing {len(movies)} movies...")
-    for i, m in enumerate(movies):
-        print(f"[{i+1}/{len(movies)}] Processing: {m.get('title')}")
-        profiles.append(build_profile(m, taxonomy, bedrock_client))
+    def process(movie):
+        if bedrock_client is None:
+            return build_profile(movie, taxonomy, None), False
+        profile, ok = bedrock_client.call_tracked(build_profile, movie, taxonomy, bedrock_client)
+        return profile, ok and bool(profile.get('embedding'))
+
+    def progress(done, total, movie):
+        print(f"[{done}/{total}] Done: {movie.get('title')}")
+
+    checkpoint = Checkpoint(args.checkpoint) if args.checkpoint else None
+    print(f"Processing {len(movies)} movies (concurrency={args.concurrency})...")
+    try:
+        profiles = run_pipeline(
+            movies,
+            process,
+            key=lambda m: m.get('id'),
+            concurrency=args.concurrency,
+            checkpoint=checkpoint,
+            progress=progress,
+        )
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+    if llm_cache is not None:
+        print(f"LLM cache: {llm_cache.stats()}")
 
     if args.output:
         with open(args.output, 'w', encoding='utf-8') as f:
@@ -7,6 +7,7 @@ from typing import Dict, List
 
 import numpy as np
 import movie_a_2
+import profile_cache
 
 
 # 코사인 유사도 계산
@@ -267,8 +268,8 @@ def main():
     dislikes = [t.strip() for t in args.dislikes.split(',') if t.strip()]
 
     scored = []
-    for m in movies:
-        mp = movie_a_2.build_profile(m, taxonomy)
+    profiles = profile_cache.get_profiles(movies, taxonomy)
+    for m, mp in zip(movies, profiles):
         
         # 새로운 확률 계산 함수 사용
         result = calculate_satisfaction_probability(
@@ -5,6 +5,7 @@ import json
 from typing import Dict, List, Tuple
 
 import movie_a_2
+import profile_cache
 
 
 # 주요 기여 요소 추출
@@ -196,7 +197,7 @@ def main():
     }
     
     # 영화 프로필 생성
-    movie_profile = movie_a_2.build_profile(target_movie, taxonomy)
+    movie_profile = profile_cache.get_profile(target_movie, taxonomy)
     
     # 매칭률 계산 (간단한 코사인 유사도)
     from movie_a_3 import cosine_sim, align_vector
@@ -11,6 +11,8 @@ import os
 from dotenv import load_dotenv
 import boto3
 
+from llm_cache import with_llm_cache
+
 load_dotenv()
 
 
@@ -23,7 +25,7 @@ def get_bedrock_client():
             aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
             aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY')
         )
-        return bedrock_runtime
+        return with_llm_cache(bedrock_runtime)
     except Exception as e:
         print(f"⚠️  Bedrock 클라이언트 초기화 실패: {e}")
         return None
@@ -7,6 +7,7 @@ from typing import List, Dict, Tuple
 from collections import defaultdict
 
 import movie_a_2
+import profile_cache
 
 try:
     import numpy as np
@@ -375,7 +376,7 @@ def main():
 
     # 프로필 생성
     print("🔨 영화 프로필 생성 중...")
-    profiles = [movie_a_2.build_profile(m, taxonomy) for m in movies]
+    profiles = profile_cache.get_profiles(movies, taxonomy)
 
     if args.hierarchical:
         # 계층적 클러스터링
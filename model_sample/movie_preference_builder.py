@@ -8,6 +8,7 @@
 import json
 from typing import Dict, List
 import movie_a_2
+import profile_cache
 
 
 def extract_tags_from_movie(movie_profile: Dict) -> List[str]:
@@ -63,35 +64,30 @@ def build_user_preference_from_movies(
     boost_tags = []
     penalty_tags = []
     
+    # 좋아하는/싫어하는 영화 프로필을 한 번에 생성 (캐시 파일 갱신도 한 번)
+    liked = [movie_map[movie_id] for movie_id in liked_movie_ids if movie_id in movie_map]
+    disliked = [movie_map[movie_id] for movie_id in disliked_movie_ids if movie_id in movie_map]
+    profiles = profile_cache.get_profiles(liked + disliked, taxonomy, bedrock_client)
+    
     # 좋아하는 영화에서 태그 추출
     print(f"\n📌 좋아하는 영화 분석 중...")
-    for movie_id in liked_movie_ids:
-        if movie_id in movie_map:
-            movie = movie_map[movie_id]
-            print(f"  ✓ {movie.get('title')}")
-            
-            # 영화 프로필 생성
-            profile = movie_a_2.build_profile(movie, taxonomy, bedrock_client)
-            
-            # 세부 태그 추출
-            tags = extract_tags_from_movie(profile)
-            boost_tags.extend(tags)
-            print(f"    추출된 태그: {tags[:5]}...")  # 일부만 출력
+    for movie, profile in zip(liked, profiles[:len(liked)]):
+        print(f"  ✓ {movie.get('title')}")
+        
+        # 세부 태그 추출
+        tags = extract_tags_from_movie(profile)
+        boost_tags.extend(tags)
+        print(f"    추출된 태그: {tags[:5]}...")  # 일부만 출력
     
     # 싫어하는 영화에서 태그 추출
     print(f"\n📌 싫어하는 영화 분석 중...")
-    for movie_id in disliked_movie_ids:
-        if movie_id in movie_map:
-            movie = movie_map[movie_id]
-            print(f"  ✗ {movie.get('title')}")
-            
-            # 영화 프로필 생성
-            profile = movie_a_2.build_profile(movie, taxonomy, bedrock_client)
-            
-            # 세부 태그 추출
-            tags = extract_tags_from_movie(profile)
-            penalty_tags.extend(tags)
-            print(f"    추출된 태그: {tags[:5]}...")  # 일부만 출력
+    for movie, profile in zip(disliked, profiles[len(liked):]):
+        print(f"  ✗ {movie.get('title')}")
+        
+        # 세부 태그 추출
+        tags = extract_tags_from_movie(profile)
+        penalty_tags.extend(tags)
+        print(f"    추출된 태그: {tags[:5]}...")  # 일부만 출력
     
     # 중복 제거 및 빈도 기반 필터링
     from collections import Counter
@@ -0,0 +1,232 @@
+"""
+영화 프로필 캐시 (오프라인 실험 스크립트 공용)
+build_profile 결과를 profiles.npz (태그 점수/임베딩 float32 행렬) + profiles.index.json ((생성 방식, movie id) → 행, 원문 해시)
+으로 저장해 두고, 원문(movie_text) 해시가 바뀐 영화만 다시 만든다.
+llm / stable 프로필은 따로 보관하므로 두 방식의 스크립트를 번갈아 실행해도 서로 지우지 않는다.
+LLM 호출이 실패해 stable 점수로 대신한 프로필은 저장하지 않는다 (다음 실행에서 다시 시도).
+
+사용: profiles = profile_cache.get_profiles(movies, taxonomy, bedrock_client)
+환경 변수: PROFILE_CACHE=0 (끄기), PROFILE_CACHE_PATH (npz 경로)
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+import movie_a_2
+from llm_pipeline import ResilientBedrockClient, run_pipeline
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'profiles.npz')
+SCORE_CATEGORIES = {
+    'emotion_scores': 'emotion',
+    'narrative_traits': 'story_flow',
+    'direction_mood': 'direction_mood',
+    'character_relationship': 'character_relationship',
+}
+ENDING_KEYS = ['happy', 'open', 'bittersweet']
+INDEX_VERSION = 2
+
+
+def _taxonomy_tags(taxonomy: Dict) -> Dict[str, List[str]]:
+    tags = {key: list(taxonomy.get(category, {}).get('tags', [])) for key, category in SCORE_CATEGORIES.items()}
+    tags['ending_preference'] = ENDING_KEYS
+    return tags
+
+
+def _row_key(mode: str, movie_id) -> str:
+    return f"{mode}:{movie_id}"
+
+
+def source_hash(movie: Dict, salt: str) -> str:
+    """프로필을 결정하는 입력 전체: 원문 텍스트 + salt (태그 목록, 생성 방식 llm/stable)"""
+    payload = json.dumps([movie_a_2.movie_text(movie), movie.get('title'), salt], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ProfileCache:
+    """
+    npz 는 첫 조회 때 한 번 열고, 프로필 dict 는 요청된 movie id 만 만든다.
+    점수 행렬에서 NaN 은 '프로필에 없는 태그' (LLM 이 고르지 않은 태그) 를 뜻한다.
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        self.path = path
+        self.index_path = os.path.splitext(path)[0] + '.index.json'
+        self._lock = threading.Lock()
+        self._index: Optional[Dict] = None
+        self._arrays: Optional[Dict[str, np.ndarray]] = None
+        self._profiles: Dict[str, Dict] = {}
+
+    def _load_index(self) -> Dict:
+        if self._index is None:
+            self._index = {'version': INDEX_VERSION, 'movies': {}}
+            if os.path.exists(self.index_path) and os.path.exists(self.path):
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    index = json.load(f)
+                if index.get('version') == INDEX_VERSION:
+                    self._index = index
+        return self._index
+
+    def _load_arrays(self) -> Dict[str, np.ndarray]:
+        if self._arrays is None:
+            with np.load(self.path, allow_pickle=False) as data:
+                self._arrays = {name: data[name] for name in data.files}
+        return self._arrays
+
+    def _profile_at(self, movie_id, row: int) -> Dict:
+        arrays = self._load_arrays()
+        tags = self._index['tags']
+        profile = {'movie_id': movie_id, 'title': str(arrays['titles'][row])}
+        for key in list(SCORE_CATEGORIES) + ['ending_preference']:
+            # v == v 는 NaN(없는 태그) 제외
+            profile[key] = {tag: round(v, 6) for tag, v in zip(tags[key], arrays[key][row].tolist()) if v == v}
+        length = int(arrays['embedding_len'][row])
+        profile['embedding'] = arrays['embedding'][row, :length].tolist()
+        profile['embedding_text'] = str(arrays['embedding_text'][row])
+        return profile
+
+    def get_profiles(self, movies: List[Dict], taxonomy: Dict, bedrock_client=None, concurrency: int = 8) -> List[Dict]:
+        """movies 순서대로 프로필 반환. 캐시에 없거나 원문이 바뀐 영화만 build_profile 후 파일을 갱신"""
+        tags = _taxonomy_tags(taxonomy)
+        mode = 'stable' if bedrock_client is None else 'llm'
+        with self._lock:
+            index = self._load_index()
+            if index.get('tags') != tags:
+                # taxonomy 가 바뀌면 열 배치가 달라지므로 전부 다시 만든다
+                index = self._index = {'version': INDEX_VERSION, 'tags': tags, 'movies': {}}
+                self._arrays = None
+                self._profiles = {}
+
+            salt = hashlib.sha256(json.dumps([tags, mode], ensure_ascii=False).encode('utf-8')).hexdigest()
+            stale = []
+            for m in movies:
+                h = source_hash(m, salt)
+                if index['movies'].get(_row_key(mode, m.get('id')), {}).get('hash') != h:
+                    stale.append((m, h))
+            unsaved: Dict[str, Dict] = {}
+            if stale:
+                print(f"프로필 캐시: {len(movies) - len(stale)}개 재사용, {len(stale)}개 생성")
+                built = run_pipeline(
+                    [m for m, _ in stale],
+                    self._builder(taxonomy, bedrock_client),
+                    key=lambda m: m.get('id'),
+                    concurrency=concurrency if bedrock_client is not None else 1,
+                )
+                updates = {}
+                for (m, h), (profile, ok) in zip(stale, built):
+                    key = _row_key(mode, m.get('id'))
+                    if ok:
+                        updates[key] = (profile, h)
+                    else:
+                        unsaved[key] = profile
+                if unsaved:
+                    print(f"프로필 캐시: LLM 실패 {len(unsaved)}개는 저장하지 않음")
+                if updates:
+                    self._save(updates)
+
+            profiles = []
+            for m in movies:
+                movie_id = m.get('id')
+                key = _row_key(mode, movie_id)
+                profile = unsaved.get(key) or self._profiles.get(key)
+                if profile is None:
+                    profile = self._profile_at(movie_id, index['movies'][key]['row'])
+                    self._profiles[key] = profile
+                profiles.append(profile)
+            return profiles
+
+    @staticmethod
+    def _builder(taxonomy: Dict, bedrock_client):
+        """
+        run_pipeline 작업 함수. 결과는 (profile, ok) 이고 ok 는 movie_a_2.main 과 같은 기준
+        (Bedrock 호출이 최종 실패하지 않았고 임베딩이 있음). stable 모드는 항상 ok.
+        """
+        if bedrock_client is None:
+            return lambda m: ((movie_a_2.build_profile(m, taxonomy, None), True), True)
+
+        # analyze_with_llm 등은 예외를 삼키고 fallback 하므로 실패 여부는 call_tracked 로 확인
+        if not hasattr(bedrock_client, 'call_tracked'):
+            bedrock_client = ResilientBedrockClient(bedrock_client)
+
+        def build(movie):
+            profile, ok = bedrock_client.call_tracked(movie_a_2.build_profile, movie, taxonomy, bedrock_client)
+            ok = ok and bool(profile.get('embedding'))
+            return (profile, ok), ok
+
+        return build
+
+    def _encode(self, profiles: List[Dict]) -> Dict[str, np.ndarray]:
+        tags = self._index['tags']
+        width = max((len(p.get('embedding') or []) for p in profiles), default=0)
+        arrays = {
+            'movie_ids': np.array([int(p['movie_id']) for p in profiles], dtype=np.int64),
+            'titles': np.array([str(p.get('title') or '') for p in profiles]),
+            'embedding_text': np.array([str(p.get('embedding_text') or '') for p in profiles]),
+            'embedding_len': np.array([len(p.get('embedding') or []) for p in profiles], dtype=np.int32),
+            'embedding': np.zeros((len(profiles), width), dtype=np.float32),
+        }
+        for i, p in enumerate(profiles):
+            if p.get('embedding'):
+                arrays['embedding'][i, :len(p['embedding'])] = p['embedding']
+        for key in list(SCORE_CATEGORIES) + ['ending_preference']:
+            matrix = np.full((len(profiles), len(tags[key])), np.nan, dtype=np.float32)
+            for i, p in enumerate(profiles):
+                scores = p.get(key) or {}
+                for j, tag in enumerate(tags[key]):
+                    if tag in scores:
+                        matrix[i, j] = scores[tag]
+            arrays[key] = matrix
+        return arrays
+
+    def _save(self, updates: Dict[str, tuple]) -> None:
+        """기존 행(그대로 복사) + 새로 만든 프로필로 npz/index 를 다시 쓴다 (임시 파일 → rename)"""
+        index = self._index
+        kept = [(key, entry) for key, entry in index['movies'].items() if key not in updates]
+        new = self._encode([profile for profile, _ in updates.values()])
+        if kept:
+            rows = np.array([entry['row'] for _, entry in kept], dtype=np.int64)
+            old = {name: array[rows] for name, array in self._load_arrays().items()}
+            width = max(old['embedding'].shape[1], new['embedding'].shape[1])
+            for part in (old, new):
+                pad = width - part['embedding'].shape[1]
+                if pad:
+                    part['embedding'] = np.pad(part['embedding'], ((0, 0), (0, pad)))
+            arrays = {name: np.concatenate([old[name], new[name]]) for name in new}
+        else:
+            arrays = new
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp = self.path + '.tmp.npz'
+        np.savez(tmp, **arrays)
+        os.replace(tmp, self.path)
+        hashes = [entry['hash'] for _, entry in kept] + [h for _, h in updates.values()]
+        keys = [key for key, _ in kept] + list(updates)
+        index['movies'] = {key: {'row': i, 'hash': h} for i, (key, h) in enumerate(zip(keys, hashes))}
+        with open(self.index_path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False)
+        os.replace(self.index_path + '.tmp', self.index_path)
+
+        # 이후 조회는 저장된 값(float32)에서 만들어 실행마다 같은 결과가 나오도록
+        self._arrays = arrays
+        self._profiles = {}
+
+
+_caches: Dict[str, ProfileCache] = {}
+
+
+def get_profiles(movies: List[Dict], taxonomy: Dict, bedrock_client=None) -> List[Dict]:
+    """PROFILE_CACHE=0 이면 매번 build_profile (기존 동작)"""
+    if os.getenv('PROFILE_CACHE', '1') == '0':
+        return [movie_a_2.build_profile(m, taxonomy, bedrock_client) for m in movies]
+    path = os.getenv('PROFILE_CACHE_PATH', DEFAULT_PATH)
+    if path not in _caches:
+        _caches[path] = ProfileCache(path)
+    return _caches[path].get_profiles(movies, taxonomy, bedrock_client)
+
+
+def get_profile(movie: Dict, taxonomy: Dict, bedrock_client=None) -> Dict:
+    return get_profiles([movie], taxonomy, bedrock_client)[0]
@@ -9,6 +9,7 @@ import json
 from typing import Dict, List
 
 import movie_a_2
+import profile_cache
 import movie_a_3
 import movie_a_7
 import movie_preference_builder
@@ -79,15 +80,16 @@ def test_cross_genre_recommendation(
         }
     }
     
-    # 4. 각 영화에 대해 만족 확률 계산
+    # 4. 각 영화에 대해 만족 확률 계산 (프로필은 캐시에서, 바뀐 영화만 새로 생성)
     scored_movies = []
+    profiles = {m.get('id'): p for m, p in zip(movies_data, profile_cache.get_profiles(movies_data, taxonomy, bedrock_client))}
     
     for m in movies_data:
         # 이미 좋아하는 영화는 제외
         if str(m.get('id')) in liked_movie_ids or m.get('id') in liked_movie_ids:
             continue
         
-        mp = movie_a_2.build_profile(m, taxonomy, bedrock_client)
+        mp = profiles[m.get('id')]
         
         result = movie_a_3.calculate_satisfaction_probability(
             user_profile,
@@ -6,6 +6,7 @@ A-3 (만족 확률) + A-5 (LLM 설명) 통합 시스템 테스트
 
 import json
 import movie_a_2
+import profile_cache
 import movie_a_3
 import movie_a_5
 import movie_preference_builder
@@ -43,7 +44,7 @@ def test_full_pipeline():
     # 3. 영화 프로필 빌드
     print("\n🎬 3단계: 영화 프로필 빌드")
     test_movie = movies[0]
-    movie_profile = movie_a_2.build_profile(test_movie, taxonomy)
+    movie_profile = profile_cache.get_profile(test_movie, taxonomy)
     print(f"   ✓ 테스트 영화: {test_movie['title']}")
     print(f"   ✓ 감정 점수 키: {len(movie_profile['emotion_scores'])}개")
     
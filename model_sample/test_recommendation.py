@@ -9,6 +9,7 @@ import json
 from typing import Dict, List
 
 import movie_a_2
+import profile_cache
 import movie_a_3
 import movie_preference_builder
 
@@ -60,9 +61,10 @@ def recommend_with_preference(
     # 3. 각 영화에 대해 만족 확률 계산
     scored = []
     print("📊 영화 평가 중...")
+    profiles = {m.get('id'): p for m, p in zip(movies_data, profile_cache.get_profiles(movies_data, taxonomy, bedrock_client))}
     
     for m in movies_data:
-        mp = movie_a_2.build_profile(m, taxonomy, bedrock_client)
+        mp = profiles[m.get('id')]
         
         #좋아하는/싫어하는 태그를 반영한 확률 계산
         result = movie_a_3.calculate_satisfaction_probability(
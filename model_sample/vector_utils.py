@@ -1,119 +1,301 @@
 """
-로컬 벡터 검색 유틸리티 (1000개 영화용)
-OpenSearch 대신 numpy 기반 메모리 검색
+로컬 벡터 검색 유틸리티
+OpenSearch 대신 numpy 기반 검색 (저장 파일은 mmap 으로 열어 프로세스 간 공유)
 """
 
+import json
+import os
 import pickle
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+import numpy as np
+
+FORMAT_VERSION = 1
 
 
 class LocalVectorDB:
     """
-    메모리 기반 벡터 검색 (1000개 영화 정도 충분)
-    OpenSearch 없이 numpy로 코사인 유사도 계산
+    float32 벡터 검색 (OpenSearch 없이 numpy 코사인 유사도)
+
+    save(dirpath) 로 만드는 디렉터리 형식:
+        header.json         차원, 행 수, 장르 어휘
+        vectors.npy         (N, D) float32, 행마다 L2 정규화 → load 시 mmap (프로세스 간 페이지 공유)
+        release_year.npy    (N,) float64, 없으면 NaN     ┐ 필터용 컬럼
+        genre_indptr.npy    (N+1,) / genre_ids.npy       ┘ 장르는 CSR
+        meta.jsonl          행별 메타데이터 (검색 결과로 뽑힌 행만 offset 으로 읽음)
+        meta_offsets.npy    (N+1,) int64 바이트 offset
+        append.vec / append.jsonl   load 이후 add() 한 행의 추가 로그 (compact() 로 본 파일에 합침)
     """
     def __init__(self):
-        self.vectors = []
-        self.metadata = []
         self.dimension = None
-    
+        self.path: Optional[str] = None
+        self._genre_vocab: Dict[str, int] = {}
+        # 본 파일 (load 시 mmap)
+        self._base = np.zeros((0, 0), dtype=np.float32)
+        self._base_years = np.zeros(0, dtype=np.float64)
+        self._base_genre_indptr = np.zeros(1, dtype=np.int64)
+        self._base_genre_ids = np.zeros(0, dtype=np.int32)
+        self._base_offsets = np.zeros(1, dtype=np.int64)
+        # 본 파일 이후 추가분 (메모리)
+        self._new_vectors: List[np.ndarray] = []
+        self._new_meta: List[Dict] = []
+        self._genre_rows: Dict[int, np.ndarray] = {}
+        self._genre_owner: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self._base) + len(self._new_vectors)
+
+    @staticmethod
+    def _normalize(vector) -> np.ndarray:
+        vec = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm > 0 else vec
+
     def add(self, vector: List[float], meta: Dict):
-        """벡터와 메타데이터 추가"""
+        """벡터와 메타데이터 추가 (파일에서 load 한 DB 면 추가 로그에도 기록)"""
         if self.dimension is None:
             self.dimension = len(vector)
         elif len(vector) != self.dimension:
             raise ValueError(f"Vector dimension mismatch: expected {self.dimension}, got {len(vector)}")
-        
-        self.vectors.append(vector)
-        self.metadata.append(meta)
-    
+
+        row = self._normalize(vector)
+        if self.path is not None:
+            # 벡터를 먼저 쓰고 메타 줄을 나중에 써서, 중간에 끊기면 load 때 짝이 맞는 행까지만 복구
+            with open(os.path.join(self.path, 'append.vec'), 'ab') as f:
+                f.write(row.tobytes())
+            with open(os.path.join(self.path, 'append.jsonl'), 'a', encoding='utf-8') as f:
+                f.write(json.dumps(meta, ensure_ascii=False) + '\n')
+        self._new_vectors.append(row)
+        self._new_meta.append(meta)
+
+    # ------------------------------------------------------------------
+    # 검색
+    # ------------------------------------------------------------------
+
+    def _genre_mask(self, genres: List[str]) -> np.ndarray:
+        n_base = len(self._base)
+        mask = np.zeros(len(self), dtype=bool)
+        for genre in genres:
+            gid = self._genre_vocab.get(genre)
+            if gid is None:
+                continue
+            rows = self._genre_rows.get(gid)
+            if rows is None:
+                if self._genre_owner is None:
+                    self._genre_owner = np.repeat(np.arange(n_base), np.diff(self._base_genre_indptr))
+                rows = self._genre_rows[gid] = self._genre_owner[self._base_genre_ids == gid]
+            mask[rows] = True
+        for i, meta in enumerate(self._new_meta):
+            if any(g in (meta.get('genres') or []) for g in genres):
+                mask[n_base + i] = True
+        return mask
+
+    def _years(self) -> np.ndarray:
+        if not self._new_meta:
+            return self._base_years
+        new_years = [meta.get('release_year') for meta in self._new_meta]
+        new_years = np.array([np.nan if y is None else y for y in new_years], dtype=np.float64)
+        return np.concatenate([self._base_years, new_years])
+
     def search(self, query_vector: List[float], k: int = 10, filters: Dict = None) -> List[Dict]:
         """
         코사인 유사도 기반 검색
-        
+
         Args:
             query_vector: 쿼리 벡터
             k: 상위 k개 결과
             filters: 필터 조건 (예: {'genres': ['드라마'], 'year_from': 2000})
-        
+
         Returns:
             [{'score': 0.95, 'metadata': {...}}, ...]
         """
-        if not self.vectors:
+        if len(self) == 0:
             return []
-        
-        import numpy as np
-        
-        # 벡터를 numpy 배열로 변환
-        db_vecs = np.array(self.vectors, dtype=float)
-        q_vec = np.array(query_vector, dtype=float)
-        
-        # 코사인 유사도 계산
-        # cosine_sim = dot(A, B) / (norm(A) * norm(B))
-        norms = np.linalg.norm(db_vecs, axis=1, keepdims=True)
-        norms = np.where(norms == 0, 1, norms)  # 0으로 나누기 방지
-        normalized_vecs = db_vecs / norms
-        
-        q_norm = np.linalg.norm(q_vec)
-        if q_norm == 0:
-            q_norm = 1
-        normalized_q = q_vec / q_norm
-        
-        similarities = normalized_vecs @ normalized_q
-        
-        # 필터 적용
+
+        # 행은 저장 시 정규화되어 있으므로 내적 = 코사인 유사도
+        q = self._normalize(query_vector)
+        parts = [self._base @ q] if len(self._base) else []
+        if self._new_vectors:
+            parts.append(np.stack(self._new_vectors) @ q)
+        similarities = np.concatenate(parts).astype(np.float64)
+
+        # 필터 적용 (연도가 없는 영화는 연도 필터를 통과)
         if filters:
-            mask = np.ones(len(self.metadata), dtype=bool)
-            
-            for i, meta in enumerate(self.metadata):
-                # 장르 필터
-                if 'genres' in filters and filters['genres']:
-                    movie_genres = meta.get('genres', [])
-                    if not any(g in movie_genres for g in filters['genres']):
-                        mask[i] = False
-                
-                # 연도 필터
-                year = meta.get('release_year')
-                if year is not None:
-                    if 'year_from' in filters and filters['year_from']:
-                        if year < filters['year_from']:
-                            mask[i] = False
-                    if 'year_to' in filters and filters['year_to']:
-                        if year > filters['year_to']:
-                            mask[i] = False
-            
-            # 마스크 적용
+            mask = np.ones(len(self), dtype=bool)
+            if filters.get('genres'):
+                mask &= self._genre_mask(filters['genres'])
+            if filters.get('year_from') or filters.get('year_to'):
+                years = self._years()
+                known = ~np.isnan(years)
+                if filters.get('year_from'):
+                    mask &= ~known | (years >= filters['year_from'])
+                if filters.get('year_to'):
+                    mask &= ~known | (years <= filters['year_to'])
             similarities = np.where(mask, similarities, -np.inf)
-        
+
         # 상위 k개 선택
-        top_k_idx = np.argsort(similarities)[::-1][:k]
-        
+        k = min(k, len(similarities))
+        if k <= 0:
+            return []
+        top_k_idx = np.argpartition(-similarities, k - 1)[:k]
+        top_k_idx = top_k_idx[np.argsort(-similarities[top_k_idx], kind='stable')]
+
         results = []
         for idx in top_k_idx:
             if similarities[idx] > -np.inf:  # 유효한 결과만
                 results.append({
                     'score': float(similarities[idx]),
-                    'metadata': self.metadata[idx]
+                    'metadata': self.get_metadata(int(idx))
                 })
-        
+
         return results
-    
-    def save(self, filepath: str):
-        """벡터 DB를 파일로 저장"""
-        with open(filepath, 'wb') as f:
-            pickle.dump({
-                'vectors': self.vectors,
-                'metadata': self.metadata,
-                'dimension': self.dimension
-            }, f)
-    
+
+    def get_metadata(self, idx: int) -> Dict:
+        """행 메타데이터 (본 파일 행은 meta.jsonl 에서 해당 줄만 읽음)"""
+        n_base = len(self._base)
+        if idx >= n_base:
+            return self._new_meta[idx - n_base]
+        start, end = int(self._base_offsets[idx]), int(self._base_offsets[idx + 1])
+        with open(os.path.join(self.path, 'meta.jsonl'), 'rb') as f:
+            f.seek(start)
+            return json.loads(f.read(end - start))
+
+    # ------------------------------------------------------------------
+    # 저장 / 로드
+    # ------------------------------------------------------------------
+
+    def save(self, dirpath: str):
+        """벡터 DB 를 디렉터리 형식으로 저장 (추가 로그는 본 파일에 합쳐지고 비워짐)"""
+        os.makedirs(dirpath, exist_ok=True)
+        vocab = dict(self._genre_vocab)
+        genre_ids = [self._base_genre_ids]
+        genre_indptr = [self._base_genre_indptr]
+        offsets = [self._base_offsets]
+
+        def tmp(name):
+            return os.path.join(dirpath, name + '.tmp')
+
+        with open(tmp('meta.jsonl'), 'wb') as f:
+            # 본 파일 행은 바이트 그대로 복사, 추가분만 인코딩
+            if len(self._base):
+                with open(os.path.join(self.path, 'meta.jsonl'), 'rb') as src:
+                    f.write(src.read(int(self._base_offsets[-1])))
+            size = int(self._base_offsets[-1])
+            ids, indptr, line_ends = [], [], []
+            for meta in self._new_meta:
+                for genre in meta.get('genres') or []:
+                    ids.append(vocab.setdefault(genre, len(vocab)))
+                indptr.append(len(self._base_genre_ids) + len(ids))
+                line = (json.dumps(meta, ensure_ascii=False) + '\n').encode('utf-8')
+                f.write(line)
+                size += len(line)
+                line_ends.append(size)
+        genre_ids.append(np.array(ids, dtype=np.int32))
+        genre_indptr.append(np.array(indptr, dtype=np.int64))
+        offsets.append(np.array(line_ends, dtype=np.int64))
+
+        vectors = self._base
+        if self._new_vectors:
+            vectors = np.concatenate([self._base.reshape(-1, self.dimension), np.stack(self._new_vectors)])
+        arrays = {
+            'vectors': vectors,
+            'release_year': self._years(),
+            'genre_indptr': np.concatenate(genre_indptr),
+            'genre_ids': np.concatenate(genre_ids),
+            'meta_offsets': np.concatenate(offsets),
+        }
+        for name, array in arrays.items():
+            with open(tmp(name + '.npy'), 'wb') as f:
+                np.save(f, np.ascontiguousarray(array))
+        header = {'version': FORMAT_VERSION, 'dimension': self.dimension, 'count': len(self), 'genres': list(vocab)}
+        with open(tmp('header.json'), 'w', encoding='utf-8') as f:
+            json.dump(header, f, ensure_ascii=False)
+
+        # 열려 있는 mmap 을 놓은 뒤 교체 (Windows 에서는 매핑된 파일을 덮어쓸 수 없음), header.json 은 마지막에
+        del vectors, arrays
+        self.__init__()
+        for name in ['vectors.npy', 'release_year.npy', 'genre_indptr.npy', 'genre_ids.npy', 'meta_offsets.npy',
+                     'meta.jsonl', 'header.json']:
+            os.replace(tmp(name), os.path.join(dirpath, name))
+        for name in ['append.vec', 'append.jsonl']:
+            if os.path.exists(os.path.join(dirpath, name)):
+                os.remove(os.path.join(dirpath, name))
+        self._open(dirpath)
+
+    def compact(self):
+        """추가 로그를 본 파일에 합친다"""
+        if self.path is None:
+            raise ValueError('compact() requires a DB loaded from or saved to a directory')
+        self.save(self.path)
+
+    def _open(self, dirpath: str):
+        with open(os.path.join(dirpath, 'header.json'), 'r', encoding='utf-8') as f:
+            header = json.load(f)
+        if header.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported vector DB format: {header.get('version')}")
+
+        def npy(name, mmap=False):
+            return np.load(os.path.join(dirpath, name + '.npy'), mmap_mode='r' if mmap else None)
+
+        vectors = npy('vectors', mmap=True)
+        if len(vectors) != header['count']:
+            raise ValueError(f"Vector DB is incomplete: header count {header['count']}, vectors {len(vectors)}")
+
+        self.path = dirpath
+        self.dimension = header['dimension']
+        self._genre_vocab = {genre: i for i, genre in enumerate(header['genres'])}
+        self._base = vectors
+        self._base_years = npy('release_year', mmap=True)
+        self._base_genre_indptr = npy('genre_indptr', mmap=True)
+        self._base_genre_ids = npy('genre_ids', mmap=True)
+        self._base_offsets = npy('meta_offsets', mmap=True)
+        self._new_vectors = []
+        self._new_meta = []
+        self._genre_rows = {}
+        self._genre_owner = None
+
     def load(self, filepath: str):
-        """파일에서 벡터 DB 로드"""
+        """디렉터리 형식 로드 (벡터는 mmap) + 추가 로그 재생. 예전 pickle 파일도 읽을 수 있다"""
+        if os.path.isfile(filepath):
+            self._load_pickle(filepath)
+            return
+
+        self._open(filepath)
+        vec_path = os.path.join(filepath, 'append.vec')
+        meta_path = os.path.join(filepath, 'append.jsonl')
+        if (os.path.exists(meta_path) or os.path.exists(vec_path)) and self.dimension:
+            metas, line_ends = [], []
+            if os.path.exists(meta_path):
+                with open(meta_path, 'rb') as f:
+                    end = 0
+                    for line in f:
+                        if not line.endswith(b'\n'):
+                            break
+                        try:
+                            metas.append(json.loads(line))
+                        except ValueError:
+                            break
+                        end += len(line)
+                        line_ends.append(end)
+            rows = np.fromfile(vec_path, dtype=np.float32) if os.path.exists(vec_path) else np.zeros(0, np.float32)
+            count = min(len(metas), len(rows) // self.dimension)
+            # 짝이 맞지 않는 꼬리(쓰다 끊긴 벡터/메타 줄)를 잘라 두어야 다음 add() 가 어긋나지 않는다
+            for path, size in ((vec_path, count * self.dimension * 4), (meta_path, line_ends[count - 1] if count else 0)):
+                if os.path.exists(path) and os.path.getsize(path) != size:
+                    with open(path, 'r+b') as f:
+                        f.truncate(size)
+            rows = rows[: count * self.dimension].reshape(count, self.dimension)
+            self._new_vectors = list(rows)
+            self._new_meta = metas[:count]
+
+    def _load_pickle(self, filepath: str):
+        """이전 버전(pickle) 파일 → 메모리로 읽기. save(디렉터리) 로 새 형식으로 옮길 수 있다"""
         with open(filepath, 'rb') as f:
             data = pickle.load(f)
-            self.vectors = data['vectors']
-            self.metadata = data['metadata']
-            self.dimension = data['dimension']
+        self.__init__()
+        for vector, meta in zip(data['vectors'], data['metadata']):
+            self.add(vector, meta)
+        self.dimension = data['dimension']
 
 
 def profile_to_vector(profile: Dict, e_keys: List[str], n_keys: List[str]) -> List[float]: